@@ -0,0 +1,8 @@
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # Benchmarks never open a real window
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+LIB_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "lib")
+sys.path.append(LIB_DIR)  # The simulation modules import each other as top-level names
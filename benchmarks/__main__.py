@@ -0,0 +1,62 @@
+import argparse
+import contextlib
+import json
+import platform
+import sys
+
+import numpy
+import pygame
+
+from benchmarks.suite import run_suite, BENCHMARKS
+from benchmarks.world import DEFAULT_SIZES, sizes_for
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the simulation and render hot paths; prints JSON")
+    for name, value in DEFAULT_SIZES.items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int, default=None,
+                            help=f"Override the world size for {name} (default {value} x scale)")
+    parser.add_argument("--scale", default="1", help="Comma-separated size multipliers, e.g. 1,4,16")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--only", action="append", help="Run benchmarks whose name contains this (repeatable)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write JSON here instead of stdout")
+    parser.add_argument("--list", action="store_true", help="List benchmark names and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(BENCHMARKS))
+        return
+
+    runs = []
+    for scale in (float(value) for value in args.scale.split(",")):
+        sizes = sizes_for(scale)
+        for name in DEFAULT_SIZES:
+            override = getattr(args, name)
+            if override is not None:
+                sizes[name] = override
+        with contextlib.redirect_stdout(sys.stderr):  # Keep simulation chatter out of the JSON
+            results = run_suite(sizes, args.iterations, args.warmup, args.only, args.seed)
+        runs.append({"scale": scale, "sizes": sizes, "results": results})
+        print(f"[bench] scale {scale}: {len(results)} benchmarks", file=sys.stderr)
+
+    report = {
+        "environment": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "numpy": numpy.__version__,
+            "platform": platform.platform(),
+        },
+        "iterations": args.iterations,
+        "warmup": args.warmup,
+        "runs": runs,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
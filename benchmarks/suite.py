@@ -0,0 +1,131 @@
+import time
+
+from pygame.math import Vector2
+
+from benchmarks.world import build_world, get_screen
+
+DT = 1000 / 60  # One 60 FPS frame
+
+def time_call(fn, iterations, warmup):
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    samples.sort()
+    to_us = 1e6
+    return {
+        "iterations": iterations,
+        "mean_us": sum(samples) / len(samples) * to_us,
+        "min_us": samples[0] * to_us,
+        "p50_us": samples[len(samples) // 2] * to_us,
+        "p95_us": samples[min(len(samples) - 1, int(len(samples) * 0.95))] * to_us,
+        "max_us": samples[-1] * to_us,
+    }
+
+def _courier_report(engine):
+    clock = engine.sim_clock
+    return lambda: (engine.staff_controller.report(DT, clock), engine.subcon_controller.report(DT, clock))
+
+def _queue_rows(shift):
+    # With `shift`, the head of every lane leaves and rejoins at the tail before each call, so the whole line
+    # gets new targets (the O(1) pop/enqueue are timed too); without it nothing was freed and lanes are skipped
+    def setup(engine):
+        controller = engine.staff_controller
+        if not shift:
+            return controller.update_all_queue_rows
+        lanes = [lane for lane in engine.sorting_area.box_pile.queue_manager.queues.values() if lane is not None]
+        def rotate():
+            for lane in lanes:
+                lane.enqueue(lane.pop())
+            controller.update_all_queue_rows()
+        return rotate
+    return setup
+
+def _movement(engine):
+    return lambda: engine.movement.step(DT)
+
+def _vehicle_controllers(moving):
+    # Van/CarController.update with a `moving` fraction of each fleet still driving and the rest parked. Parked
+    # vehicles go to sleep on the first update, so the timed calls should only pay for the moving ones
+    def setup(engine):
+        carpark = engine.carpark
+        for fleet in (carpark.vans, carpark.cars):
+            for i, vehicle in enumerate(fleet):
+                parked = vehicle.target_position
+                vehicle.position = parked if i >= moving * len(fleet) else parked + Vector2(0, 40)
+        clock = engine.sim_clock
+        update = lambda: (engine.van_controller.update(DT, clock), engine.car_controller.update(DT, clock))
+        update()  # Let the parked vehicles fall asleep
+        return update
+    return setup
+
+def _house_queries(engine):
+    # One nearest-vacant, radius and viewport query against City_District1's index
+    district = engine.districts.get(1)  # Created on first use
+    viewport = (320, 180, 640, 360)
+    return lambda: (district.nearest_house((640, 360), vacant_only=True),
+                    district.houses_within((640, 360), 100),
+                    district.visible_houses(viewport))
+
+def _route_plan(engine):
+    # Nearest neighbour + 2-opt tour over a typical van load, distance matrix already cached
+    district = engine.districts.get(1)  # Created on first use
+    houses = district.houses[::max(1, len(district.houses) // 25)][:25]
+    engine.planner.district_matrix(district)
+    return lambda: engine.planner.plan(district, houses)
+
+def _update_all(engine):
+    return lambda: engine.scene_manager.update_all(DT, engine.sim_clock)
+
+def _frame_headless(engine):
+    return lambda: engine.step(DT)
+
+def _frame(engine):
+    screen = get_screen()
+    def frame():
+        engine.step(DT)
+        engine.scene_manager.render(screen)
+    return frame
+
+def _render(name, full):
+    def setup(engine):
+        screen = get_screen()
+        scene = engine.scene_manager.scenes[name]
+        engine.scene_manager.switch_scene(name)
+        scene.render(screen)  # Build the static layer once
+        def render():
+            if full:
+                scene.invalidate()  # Worst case: rebuild the static layer every frame
+            scene.render(screen)
+        return render
+    return setup
+
+BENCHMARKS = {
+    "courier_report": _courier_report,
+    "update_all_queue_rows": _queue_rows(shift=True),
+    "update_all_queue_rows_nothing_freed": _queue_rows(shift=False),
+    "movement_step": _movement,
+    "vehicle_controllers": _vehicle_controllers(0.5),
+    "vehicle_controllers_all_parked": _vehicle_controllers(0.0),
+    "vehicle_controllers_all_moving": _vehicle_controllers(1.0),
+    "house_queries": _house_queries,
+    "route_plan": _route_plan,
+    "scene_manager_update_all": _update_all,
+    "frame_headless": _frame_headless,
+    "frame": _frame,
+}
+for _scene in ["SortingArea", "Carpark", "City_District1", "Statistics"]:
+    BENCHMARKS[f"render_{_scene}_incremental"] = _render(_scene, full=False)
+    BENCHMARKS[f"render_{_scene}_full"] = _render(_scene, full=True)
+
+def run_suite(sizes, iterations=200, warmup=20, only=None, seed=0):
+    results = {}
+    for name, setup in BENCHMARKS.items():
+        if only and not any(pattern in name for pattern in only):
+            continue
+        engine = build_world(seed=seed, **sizes)  # Fresh world per benchmark so they don't skew each other
+        results[name] = time_call(setup(engine), iterations, warmup)
+    return results
@@ -0,0 +1,105 @@
+
+import pygame
+from pygame.math import Vector2
+
+import benchmarks  # Puts lib/ on sys.path
+from engine import SimulationEngine
+from objects.courier import StaffCourier, SubconCourier
+from objects.house import House
+from objects.van import Van
+from objects.car import Car
+import loadimage
+from box import BoxPile  # Same module the truck uses, so lanes use the matching Directions enum
+
+SCREEN_WIDTH, SCREEN_HEIGHT = 1280, 720
+
+DEFAULT_SIZES = {
+    "couriers": 200,  # Idle couriers in the sorting area (in addition to the queued ones)
+    "vans": 40,
+    "cars": 200,
+    "houses": 500,  # Houses in City_District1
+    "queue_length": 10,  # Couriers per box-pile lane (RIGHT/UP/DOWN)
+}
+
+_screen = None
+
+def get_screen():
+    global _screen
+    if _screen is None:
+        pygame.init()
+        _screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        loadimage.preload()  # Sprites come from the atlas, so image decoding never lands inside a timed region
+    return _screen
+
+def _grid(count, left, top, right, bottom):
+    # Spread `count` points evenly over a rectangle, row by row
+    cols = max(1, int((count * (right - left) / max(1, bottom - top)) ** 0.5))
+    rows = max(1, -(-count // cols))
+    dx = (right - left) / cols
+    dy = (bottom - top) / rows
+    return [Vector2(left + (i % cols) * dx, top + (i // cols) * dy) for i in range(count)]
+
+def build_world(couriers=200, vans=40, cars=200, houses=500, queue_length=10, seed=0):
+    # Synthetic mid-morning world: half the fleet parked, half still driving in,
+    # a box pile with full lanes and a crowd of idle couriers waiting for a slot
+    get_screen()
+    engine = SimulationEngine(seed=seed)
+    carpark = engine.carpark
+    sorting_area = engine.sorting_area
+
+    for i, position in enumerate(_grid(vans, 800, 60, SCREEN_WIDTH - 50, 300)):
+        van = Van(position=position)
+        if i % 2 == 0:
+            van.position = van.target_position  # Already parked
+        carpark.vans.append(van)
+    for i, position in enumerate(_grid(cars, 50, 60, 780, 620)):
+        car = Car(position=position)
+        if i % 2 == 0:
+            car.position = car.target_position
+        carpark.cars.append(car)
+
+    for controller, fleet in ((engine.van_controller, carpark.vans), (engine.car_controller, carpark.cars)):
+        for vehicle in fleet:
+            vehicle.woken = controller.wake  # Wired up like spawn_fleet; parked ones sleep after the first update
+            controller.wake(vehicle)
+
+    pile = BoxPile(position=Vector2(178, 280), queue_size=queue_length)
+    pile.receive(*engine.parcels.add(10 ** 4, "ACycle", engine.sim_clock.elapsed))  # Never runs dry during a benchmark
+    sorting_area.box_pile = pile
+
+    vehicles = carpark.vans + carpark.cars
+    staff = []
+    for i in range(couriers + 3 * queue_length):
+        courier_class = StaffCourier if i % 2 == 0 else SubconCourier
+        courier = courier_class(f"B_{i}")
+        courier.position = courier.idle_position
+        courier.status = "IDLE"
+        if vehicles:
+            courier.assigned_vehicle = vehicles[i % len(vehicles)]
+        staff.append(courier)
+
+    # The first 3 * queue_length couriers stand in the lanes
+    queued = iter(staff)
+    for direction in pile.queue_manager.open_lanes():
+        for _ in range(queue_length):
+            courier = next(queued)
+            pile.queue_manager.add_courier_to_direction(courier, direction)
+            courier.queue_type = direction
+            courier.position = courier.target_position
+            courier.status = "QUEUING"
+    sorting_area.couriers.extend(staff)
+    for courier in staff:
+        if courier.status == "IDLE":
+            engine.dispatcher.add(courier)  # Crowd waiting for a slot
+
+    district = engine.districts.get(1)  # Created on first use
+    for position in _grid(houses, 30, 25, SCREEN_WIDTH - 30, 620):
+        house = House()
+        house.position = position
+        district.houses.append(house)
+    district.index_houses()
+    district.house_controller.initialized = True  # Don't let the spawner replace the synthetic layout
+    return engine
+
+def sizes_for(scale):
+    return {name: int(value * scale) for name, value in DEFAULT_SIZES.items()}
@@ -0,0 +1,7 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from main import main  # Allows `python -m lib --headless --days 5` from the repo root
+
+main()
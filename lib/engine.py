@@ -0,0 +1,246 @@
+import math
+import os
+import random
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# --- Import core components from simctrl.py ---
+from simctrl.simctrl import SceneManager, SimulationClock, TruckController
+from simctrl.scheduler import EventScheduler
+from simctrl.profiler import FrameProfiler
+from simctrl.metrics import MetricsAggregator
+from simctrl.route_planner import RoutePlanner
+from simctrl.dispatcher import SlotDispatcher
+from simctrl.van_ctrl import VanController
+from simctrl.car_ctrl import CarController
+from simctrl.courier_ctrl import CourierController, StaffController, SubconController
+from objects.courier import StaffCourier, SubconCourier
+from scenes import sortingarea_scene, carpark_scene, citydistrict_scene, control_panel_stats
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "objects"))
+import loadimage  # Same module instance the entities import
+import motion
+import eventlog
+import snapshot
+import replay
+from parcels import ParcelStore
+
+HEADLESS_DT = 1000 / 60  # Fixed tick length (ms) for headless runs, exactly one sim minute at speed 1
+MOTION_MODES = ("frame", "exact")
+MAX_SUBSTEPS = 256  # Cuts per tick in "exact" motion mode; past that the rest of the tick is one part
+DEFAULT_DISTRICTS = 3
+
+class SimulationEngine:
+    def __init__(self, headless=False, dispatch_policy="shortest", motion_mode="frame", district_count=DEFAULT_DISTRICTS,
+                 seed=None):
+        self.headless = headless
+        # "frame": entities move the real frame time each tick and react to arrivals on the next tick.
+        # "exact": they move on warped time, and everything inside a tick happens at its exact time (see step_exact)
+        self.motion_mode = motion_mode
+        self.random = random.Random(seed)  # The engine's own RNG (delivery destinations); pickled with snapshots
+        self.profiler = FrameProfiler()  # Rolling per-stage frame timings, shown on the Statistics scene
+        loadimage.set_headless(headless)  # Entities skip image/font loading when headless
+        self.movement = motion.MovementSystem()  # Positions/targets/speeds of every moving entity
+        motion.set_active_system(self.movement)  # Entities created from here on register with it
+
+        # Initialize scenes and controller
+        self.scene_manager = SceneManager()  # Handles switching and tracking active scenes
+        self.carpark = carpark_scene.CarparkScene()  # Instantiate the carpark scene
+        self.sorting_area = sortingarea_scene.SortingAreaScene(self.carpark)  # Sorting area with reference to carpark
+        self.sorting_area.door_to_carpark_target = self.carpark
+        self.carpark.door_to_sorting_target = self.sorting_area
+        # District scenes are created on first dispatch or when opened (see CityDistricts)
+        self.districts = citydistrict_scene.CityDistricts(district_count, self.scene_manager)
+
+        # Initialize clock, event scheduler and controllers
+        self.sim_clock = SimulationClock()  # Custom clock to simulate in-game time progression
+        self.scheduler = EventScheduler(self.sim_clock)  # Controllers register their timed events here
+        self.metrics = MetricsAggregator(self.sim_clock)  # Running KPIs the controllers report events into
+        self.parcels = ParcelStore()  # One row per parcel with its cycle, destination and timestamps
+        self.planner = RoutePlanner()  # Delivery tours, planned a few per frame
+        self.dispatcher = SlotDispatcher(self.sorting_area, dispatch_policy, self.metrics, self.random)  # Idle couriers wait here for lane slots
+        self.truck_controller = TruckController(self.sorting_area, self.scheduler, self.metrics, self.dispatcher, self.parcels)
+        self.van_controller = VanController(self.carpark, self.scheduler)
+        self.car_controller = CarController(self.carpark, self.scheduler)
+        self.staff_controller = StaffController(self.sorting_area, self.carpark, self.scene_manager, self.scheduler,
+                                                self.metrics, self.planner, self.districts, self.dispatcher, self.parcels,
+                                                self.random)
+        self.subcon_controller = SubconController(self.sorting_area, self.carpark, self.scene_manager, self.scheduler,
+                                                  self.metrics, self.planner, self.districts, self.dispatcher, self.parcels,
+                                                  self.random)
+        self.controllers = [self.truck_controller, self.van_controller, self.car_controller,
+                            self.staff_controller, self.subcon_controller]
+
+        # Register scenes
+        self.scene_manager.add_scene("Carpark", self.carpark)
+        self.scene_manager.add_scene("SortingArea", self.sorting_area)
+        self.scene_manager.add_scene("Statistics", control_panel_stats.StatisticsScene(self.profiler, self.entity_counts, self.metrics))
+        self.scene_manager.switch_scene("SortingArea")  # Start on the sorting area
+
+        CourierController.initialize_idle_grids()
+        self.idle_grids = (StaffCourier.idle_grid, SubconCourier.idle_grid)  # This engine's free idle spots (see step)
+        self.recorder = None  # TraceRecorder while a trace is being recorded
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["recorder"] = None  # A trace belongs to the run that recorded it, not to its snapshots
+        return state
+
+    def activate(self):
+        # Several engines (snapshot forks) may share one process: point the module- and class-level hooks at this one
+        # before anything of ours runs
+        motion.set_active_system(self.movement)
+        StaffCourier.idle_grid, SubconCourier.idle_grid = self.idle_grids
+        eventlog.set_clock(self.sim_clock)  # Log records carry this engine's sim time
+
+    def step(self, dt):
+        self.activate()
+        measure = self.profiler.measure  # Times each stage into the rolling windows
+        if self.motion_mode == "exact":
+            motion_dt = self.step_exact(dt)
+        else:
+            measure("scheduler", self.scheduler.advance, self.sim_clock.sim_seconds(dt))  # Advance in-game time, firing due events
+            measure("movement", self.movement.step, dt)  # Move every courier and vehicle in one vectorized pass
+            self.run_controllers(dt)
+            motion_dt = dt
+        measure("scene_update_all", self.scene_manager.update_all, dt, self.sim_clock)  # Update all scenes
+        if self.recorder is not None:
+            measure("trace", self.recorder.capture, motion_dt)
+
+    def run_controllers(self, dt, entry_dt=None):
+        # Modular simulation logic; `entry_dt` is the courier entry timer's share of the tick (default dt)
+        measure = self.profiler.measure
+        if entry_dt is None:
+            entry_dt = dt
+        measure("courier_entry", self.sorting_area.stream_pending, entry_dt)  # Shared by staff and subcons
+        measure("truck_controller", self.truck_controller.update, dt, self.sim_clock)
+        measure("van_controller", self.van_controller.update, dt, self.sim_clock)  # Parked vans go to sleep
+        measure("car_controller", self.car_controller.update, dt, self.sim_clock)
+        measure("staff_controller", self.staff_controller.report, dt, self.sim_clock)
+        measure("subcon_controller", self.subcon_controller.report, dt, self.sim_clock)  # Update all subcon staff
+        measure("dispatcher", self.dispatcher.dispatch)  # Hand freed lane slots to waiting couriers
+        # Plan a few queued delivery tours per frame; exact runs plan them all at once so that the tick length
+        # can't shift when a tour starts
+        measure("route_planner", self.planner.process, math.inf if self.motion_mode == "exact" else None)
+
+    def step_exact(self, dt):
+        # The tick is cut at every moment something happens (see next_cut). Entities move on warped time up to
+        # that moment, the clock is set to it so due events fire there, and the controllers react at that time.
+        # Outcomes then don't depend on dt. Returns the movement time covered (ms).
+        measure = self.profiler.measure
+        warp = self.sim_clock.speed_multiplier
+        remaining = dt * warp
+        for cut in range(MAX_SUBSTEPS):
+            part, event_at = self.next_cut(remaining) if cut < MAX_SUBSTEPS - 1 else (remaining, None)
+            measure("movement", self.movement.step, part)
+            # Entry spacing follows warped time like movement, and the part passes before its event fires (a
+            # courier spawned at the cut must not have waited through it)
+            measure("courier_entry", self.sorting_area.stream_pending, part)
+            if event_at is not None:
+                measure("scheduler", self.scheduler.advance_to, event_at)  # Land exactly on the event
+            else:
+                measure("scheduler", self.scheduler.advance, part * SimulationClock.SIM_SECONDS_PER_MS)
+            self.run_controllers(part / warp, 0)
+            self.settle()
+            remaining -= part
+            if remaining <= 0:
+                break
+        return dt * warp
+
+    def settle(self):
+        # Controllers react to a change one step at a time (arrive, then pick up, then set off...). Let them
+        # react again without time passing until nothing changes, so a chain doesn't wait for the next cut.
+        for _ in range(MAX_SUBSTEPS):
+            state = self.reaction_state()
+            self.run_controllers(0)
+            if self.reaction_state() == state:
+                break
+
+    def reaction_state(self):
+        # Cheap fingerprint of what the controllers can change: motion segments, courier states, the wait-list
+        movement = self.movement
+        return (int(movement.segments[:movement.size].sum()), len(self.dispatcher), len(self.sorting_area.couriers),
+                tuple(courier.status for courier in self.sorting_area.couriers))
+
+    def next_cut(self, limit):
+        # Movement ms (at most `limit`) until the next arrival, timed event, courier entry, pickup or delivery stop,
+        # plus the event's scheduler time when a timed event comes first
+        clock = self.sim_clock
+        per_ms = SimulationClock.SIM_SECONDS_PER_MS  # Sim seconds per ms of movement time
+        part, event_at = limit, None
+        next_at = self.scheduler.next_time()
+        if next_at is not None and (next_at - clock.elapsed) / per_ms < part:
+            part, event_at = max(0.0, (next_at - clock.elapsed) / per_ms), next_at
+        waits = []
+        arrival = self.movement.next_arrival()
+        if arrival is not None:
+            waits.append(arrival - self.movement.now)
+        entry = self.sorting_area.entry_due_in()
+        if entry is not None:
+            waits.append(entry)
+        for controller in (self.staff_controller, self.subcon_controller):
+            pickup = controller.next_pickup_in()
+            if pickup is not None:
+                waits.append(pickup)
+            stop = controller.next_delivery_in()
+            if stop is not None:
+                waits.append(stop / per_ms)
+        for wait in waits:
+            if wait < part:
+                part, event_at = max(0.0, wait), None
+        return part, event_at
+
+    def start_recording(self):
+        self.recorder = replay.TraceRecorder(self)  # Save with self.recorder.save(path)
+        return self.recorder
+
+    def snapshot(self):
+        return snapshot.take_snapshot(self)  # Compressed bytes; see SimulationEngine.restore
+
+    @staticmethod
+    def restore(data):
+        return snapshot.restore_snapshot(data)
+
+    def fork(self, count=1, seed=None):
+        return snapshot.fork(self.snapshot(), count, seed)  # Independent copies to try what-ifs on
+
+    def entity_counts(self):
+        return {
+            "couriers": len(self.sorting_area.couriers),
+            "vans": len(self.carpark.vans),
+            "cars": len(self.carpark.cars),
+            "moving": int(self.movement.moving[:self.movement.size].sum()),
+            "boxes in pile": self.sorting_area.box_pile.count if self.sorting_area.box_pile else 0,
+            "scheduled events": len(self.scheduler),
+            "parcels": len(self.parcels),
+            "districts open": len(self.districts.scenes),
+        }
+
+    def is_idle(self):
+        return all(controller.is_idle() for controller in self.controllers)  # Nothing moving anywhere
+
+    def skip_idle(self, until=None):
+        # Jump the clock straight to the next timed event (or `until`, whichever is sooner)
+        next_at = self.scheduler.next_time()
+        if next_at is None:
+            return False
+        if until is not None:
+            next_at = min(next_at, until)
+        if next_at <= self.sim_clock.elapsed:
+            return False
+        self.activate()  # Events fired here spawn entities too
+        self.scheduler.advance_to(next_at)
+        return True
+
+    def run_headless(self, days, dt=HEADLESS_DT):
+        # Step at an uncapped rate until the requested number of sim days has passed,
+        # skipping overnight stretches where nothing is moving
+        ticks = 0
+        end = (self.sim_clock.day_index + days) * SimulationClock.SECONDS_PER_DAY
+        while self.sim_clock.elapsed < end:
+            if self.is_idle() and self.skip_idle(until=end):
+                continue
+            remaining = (end - self.sim_clock.elapsed) / self.sim_clock.sim_seconds(1)  # Real ms left to `end`
+            self.step(min(dt, remaining))  # The last tick stops exactly at `end`
+            ticks += 1
+        return ticks
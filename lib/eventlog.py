@@ -0,0 +1,122 @@
+import atexit
+import json
+import threading
+import time
+from collections import deque
+
+# Structured event log for the simulation's diagnostic chatter. Disabled by default: a call below the
+# threshold is one comparison and returns, and message formatting only happens on the flush thread.
+DEBUG, INFO, WARNING, ERROR = 10, 20, 30, 40
+OFF = 100
+LEVELS = {"debug": DEBUG, "info": INFO, "warning": WARNING, "error": ERROR, "off": OFF}
+LEVEL_NAMES = {value: name.upper() for name, value in LEVELS.items()}
+
+RING_CAPACITY = 65536  # Records held in memory between flushes; the oldest are dropped when full
+FLUSH_INTERVAL = 0.5  # Seconds between background flushes
+
+threshold = OFF  # Records below this level are discarded at the call site
+categories = None  # Set of enabled categories, or None for all
+clock = None  # SimulationClock whose elapsed seconds are stamped on each record
+
+_ring = deque(maxlen=RING_CAPACITY)
+_appended = 0  # Records accepted since configure(); minus those written = dropped or pending
+_written = 0
+_file = None
+_thread = None
+_stop = threading.Event()
+_lock = threading.Lock()  # Serialises flushes between the background thread and close()
+
+def enabled(level, category=None):
+    # Cheap guard for call sites that would do extra work just to build a record
+    return level >= threshold and (categories is None or category in categories)
+
+def log(level, category, message, **fields):
+    # `message` is a format string filled from `fields` when written, e.g. log(INFO, "truck", "Unloaded {boxes}", boxes=n)
+    global _appended
+    if level < threshold or (categories is not None and category not in categories):
+        return
+    _ring.append((time.time(), clock.elapsed if clock is not None else None, level, category, message, fields))
+    _appended += 1
+
+def debug(category, message, **fields):
+    if DEBUG >= threshold:
+        log(DEBUG, category, message, **fields)
+
+def info(category, message, **fields):
+    if INFO >= threshold:
+        log(INFO, category, message, **fields)
+
+def warning(category, message, **fields):
+    if WARNING >= threshold:
+        log(WARNING, category, message, **fields)
+
+def set_clock(sim_clock):
+    global clock
+    clock = sim_clock
+
+def configure(path, level="info", enabled_categories=None, flush_interval=FLUSH_INTERVAL):
+    # Start logging to `path` (JSON lines, appended) at `level`; `enabled_categories` limits which categories are kept
+    global threshold, categories, _file, _thread, _appended, _written
+    close()
+    _file = open(path, "a", encoding="utf-8")
+    _ring.clear()
+    _appended = _written = 0
+    categories = set(enabled_categories) if enabled_categories else None
+    threshold = LEVELS[level] if isinstance(level, str) else level
+    _stop.clear()
+    _thread = threading.Thread(target=_flush_loop, args=(flush_interval,), name="eventlog-flush", daemon=True)
+    _thread.start()
+
+def _flush_loop(interval):
+    while not _stop.wait(interval):
+        flush()
+
+def _format(record):
+    wall, sim_seconds, level, category, message, fields = record
+    try:
+        text = message.format(**fields) if fields else message
+    except (KeyError, IndexError, ValueError):
+        text = message
+    entry = {"t": round(wall, 6), "sim": sim_seconds, "level": LEVEL_NAMES.get(level, level),
+             "category": category, "message": text}
+    if fields:
+        entry["fields"] = {key: value if isinstance(value, (int, float, str, bool)) or value is None else str(value)
+                           for key, value in fields.items()}
+    return json.dumps(entry, ensure_ascii=False)
+
+def flush():
+    # Write out everything buffered so far; called by the background thread and by close()
+    global _written
+    with _lock:
+        if _file is None:
+            return 0
+        lines = []
+        while _ring:
+            try:
+                lines.append(_format(_ring.popleft()))
+            except IndexError:
+                break
+        if lines:
+            _file.write("\n".join(lines) + "\n")
+            _file.flush()
+            _written += len(lines)
+        return len(lines)
+
+def dropped():
+    # Records lost because the ring filled up before a flush
+    return max(0, _appended - _written - len(_ring))
+
+def close():
+    # Stop the flush thread, write what is left and disable logging again
+    global threshold, _file, _thread
+    threshold = OFF
+    if _thread is not None:
+        _stop.set()
+        _thread.join()
+        _thread = None
+    flush()
+    if _file is not None:
+        _file.close()
+        _file = None
+
+atexit.register(close)
@@ -1,3 +1,6 @@
+import argparse
+import json
+import time
 import pygame
 import random
 import math
@@ -6,32 +9,21 @@ from collections import deque
 from enum import Enum
 import pygame_gui
 
-# --- Import core components from simctrl.py ---
-from simctrl.simctrl import SceneManager, SimulationClock, TruckController
-from simctrl.van_ctrl import VanController
-from simctrl.car_ctrl import CarController
-from simctrl.courier_ctrl import CourierController, StaffController,SubconController
-from scenes import sortingarea_scene, carpark_scene, citydistrict_scene, control_panel_stats
-
-# Initialize scenes and controller
-scene_manager = SceneManager()  # Create the global scene manager that handles switching and tracking active scenes
-carpark = carpark_scene.CarparkScene()  # Instantiate the carpark scene
-sorting_area_scene = sortingarea_scene.SortingAreaScene(carpark)  # Instantiate sorting area scene with reference to carpark
-# Initialize controllers
-truck_controller = TruckController(sorting_area_scene)
-van_controller = VanController(carpark)
-car_controller = CarController(carpark)
-staff_controller = StaffController(sorting_area_scene, carpark, scene_manager)
-subcon_controller = SubconController(sorting_area_scene, carpark, scene_manager)
-
-# Initialize Pygame and simulation window
-pygame.init()  # Initialize all imported Pygame modules
-screen = pygame.display.set_mode((1280, 720))  # Create a window of size 1280x720
-clock = pygame.time.Clock()  # Track time per frame for consistent simulation speed
-sim_clock = SimulationClock()  # Custom clock to simulate in-game time progression
+from engine import SimulationEngine, HEADLESS_DT, MOTION_MODES, DEFAULT_DISTRICTS
+from simctrl.dispatcher import POLICIES
+import montecarlo
+import snapshot
+import loadimage
+import eventlog
+import replay
+from fonts import get_font, render_text
+
 # Screen and simulation constants
 SCREEN_WIDTH, SCREEN_HEIGHT = 1280, 720  # Dimensions used throughout the GUI
+UI_RECT = pygame.Rect(0, 630, SCREEN_WIDTH, 60)  # Scene button bar, pushed to the display every frame
 FPS = 60  # Frame rate cap
+DISTRICTS_PER_PAGE = 3  # District buttons in the scene bar; the arrows (or PageUp/PageDown) page through the rest
+DISTRICT_KEYS = (pygame.K_3, pygame.K_4, pygame.K_5)  # Open the districts on the current page
 VAN_CAPACITY = 50  # Not used here directly, probably for delivery logic
 CAR_CAPACITY = 50  # Ditto
 CYCLE_TIMES = {  # Box delivery cycle timing (hours)
@@ -44,28 +36,6 @@ WORKDAY_END = 22  # End hour of simulation day
 SPRITE_PATH = "assets/sprites/"  # Base path for sprite images
 HOUSE_GRID = [(x, y) for x in range(0, 900, 30) for y in range(0, 900, 30)]  # Grid of delivery points for houses
 
-# Register scenes
-scene_manager.add_scene("Carpark", carpark)  # Add the carpark scene to the manager
-scene_manager.add_scene("SortingArea", sorting_area_scene)  # Add sorting area scene
-scene_manager.add_scene("City_District1", citydistrict_scene.CityDistrictScene(1))  # Add city district 1
-scene_manager.add_scene("City_District2", citydistrict_scene.CityDistrictScene(2))  # Add city district 2
-scene_manager.add_scene("City_District3", citydistrict_scene.CityDistrictScene(3))  # Add city district 3
-scene_manager.add_scene("Statistics", control_panel_stats.StatisticsScene())  # Add statistics scene
-scene_manager.switch_scene("SortingArea")  # Start on the Carpark scene
-sorting_area_scene.door_to_carpark_target = carpark
-carpark.door_to_sorting_target = sorting_area_scene
-
-# UI Manager and scene buttons
-ui_manager = pygame_gui.UIManager((SCREEN_WIDTH, SCREEN_HEIGHT))  # Setup GUI manager for handling buttons
-
-# Create UI buttons to allow switching scenes with mouse clicks
-button_sorting = pygame_gui.elements.UIButton(pygame.Rect((20, 640), (180, 40)), 'Sorting Area', ui_manager)
-button_carpark = pygame_gui.elements.UIButton(pygame.Rect((220, 640), (180, 40)), 'Carpark', ui_manager)
-button_city1 = pygame_gui.elements.UIButton(pygame.Rect((420, 640), (180, 40)), 'City District 1', ui_manager)
-button_city2 = pygame_gui.elements.UIButton(pygame.Rect((620, 640), (180, 40)), 'City District 2', ui_manager)
-button_city3 = pygame_gui.elements.UIButton(pygame.Rect((820, 640), (180, 40)), 'City District 3', ui_manager)
-button_stats = pygame_gui.elements.UIButton(pygame.Rect((1020, 640), (180, 40)), 'Statistics', ui_manager)
-
 # Simulation flags
 isNPI = False  # Toggle for Non-Performance Indicator mode (could affect behavior)
 isSurge = False  # Toggle for surge traffic or load conditions
@@ -76,71 +46,361 @@ all_couriers = []  # Could be used for stats or persistence
 all_vehicles = []  # Same
 all_boxes = []  # Same
 undelivered_boxes = deque()  # A FIFO queue of undelivered boxes (for routing)
-stat_tracker = {}  # Dictionary to store simulation stats
-
-CourierController.initialize_idle_grids()
-# Main game loop
-running = True  # Flag to keep the game loop alive
-while running:
-    dt = clock.tick(FPS)  # Cap FPS and retrieve time since last frame (in ms)
-    for event in pygame.event.get():  # Get all queued events (keyboard, mouse, etc.)
-        if event.type == pygame.QUIT:
-            running = False  # Quit the loop if the window is closed
-
-        if event.type == pygame.KEYDOWN:  # Keyboard-based scene switching
-            if event.key == pygame.K_1:
-                scene_manager.switch_scene("SortingArea")
-            elif event.key == pygame.K_2:
-                scene_manager.switch_scene("Carpark")
-            elif event.key == pygame.K_3:
-                scene_manager.switch_scene("City_District1")
-            elif event.key == pygame.K_4:
-                scene_manager.switch_scene("City_District2")
-            elif event.key == pygame.K_5:
-                scene_manager.switch_scene("City_District3")
-            elif event.key == pygame.K_6:
-                scene_manager.switch_scene("Statistics")
-
-        ui_manager.process_events(event)  # Let GUI respond to this event
-
-        if event.type == pygame_gui.UI_BUTTON_PRESSED:  # Scene switch buttons
-            if event.ui_element == button_sorting:
-                scene_manager.switch_scene("SortingArea")
-            elif event.ui_element == button_carpark:
-                scene_manager.switch_scene("Carpark")
-            elif event.ui_element == button_city1:
-                scene_manager.switch_scene("City_District1")
-            elif event.ui_element == button_city2:
-                scene_manager.switch_scene("City_District2")
-            elif event.ui_element == button_city3:
-                scene_manager.switch_scene("City_District3")
-            elif event.ui_element == button_stats:
-                scene_manager.switch_scene("Statistics")
-
-        scene_manager.handle_event(event)  # Forward the event to the active scene
-
-    # Run simulation
-    sim_clock.update(dt)  # Advance in-game time
-    # Modular simulation logic
-    truck_controller.update(dt, sim_clock)
-    van_controller.update(dt, sim_clock)
-    car_controller.update(dt, sim_clock)
-    staff_controller.report(dt, sim_clock)
-    subcon_controller.report(dt, sim_clock)  # Update all subcon staff
-    scene_manager.update_all(dt, sim_clock)  # Update all scenes
-    ui_manager.update(dt / 1000.0)  # Update UI (needs seconds, not ms)
-
-    # Draw scene
-    scene_manager.render(screen)  # Draw active scene content
-
-    # Display simulation time and current scene overlay
-    font = pygame.font.SysFont("Arial", 24)
-    time_text = font.render(sim_clock.get_time_str(), True, (255, 255, 255))  # Render current sim time
-    scene_text = font.render(f"Scene: {scene_manager.current_scene}", True, (255, 255, 255))  # Active scene name
-    screen.blit(time_text, (20, 20))  # Show time top-left
-    screen.blit(scene_text, (20, 50))  # Show scene name below
-
-    ui_manager.draw_ui(screen)  # Draw UI elements
-    pygame.display.flip()  # Refresh the screen with all updates
-
-pygame.quit()  # Shut down Pygame cleanly when the loop ends
+stat_tracker = None  # MetricsAggregator of the running engine (set by run_headless/run_windowed)
+
+
+def start_metrics(engine, metrics_csv=None, metrics_interval=15):
+    global stat_tracker
+    stat_tracker = engine.metrics
+    if metrics_csv:
+        engine.metrics.export_csv(engine.scheduler, metrics_csv, metrics_interval * 60)  # Interval in sim minutes
+
+
+class DistrictPager:
+    # Scene-bar buttons for the city districts, a page at a time, so the bar stays the same for any district count
+    def __init__(self, ui_manager, district_ids, open_district, left=360):
+        self.district_ids = list(district_ids)
+        self.open_district = open_district  # district_id -> scene name; may create the district on the spot
+        self.page = 0
+        self.button_prev = pygame_gui.elements.UIButton(pygame.Rect((left, 640), (40, 40)), '<', ui_manager)
+        self.buttons = [pygame_gui.elements.UIButton(pygame.Rect((left + 50 + slot * 160, 640), (150, 40)), '', ui_manager)
+                        for slot in range(DISTRICTS_PER_PAGE)]
+        self.button_next = pygame_gui.elements.UIButton(pygame.Rect((left + 50 + DISTRICTS_PER_PAGE * 160, 640), (40, 40)),
+                                                        '>', ui_manager)
+        self.show_page(0)
+
+    def pages(self):
+        return max(1, -(-len(self.district_ids) // DISTRICTS_PER_PAGE))
+
+    def show_page(self, page):
+        self.page = page % self.pages()
+        for slot, button in enumerate(self.buttons):
+            district_id = self.slot_district(slot)
+            if district_id is None:
+                button.hide()  # Last page isn't full
+            else:
+                button.set_text(f"City District {district_id}")
+                button.show()
+        for button in (self.button_prev, self.button_next):
+            if self.pages() > 1:
+                button.enable()
+            else:
+                button.disable()
+
+    def slot_district(self, slot):
+        index = self.page * DISTRICTS_PER_PAGE + slot
+        return self.district_ids[index] if index < len(self.district_ids) else None
+
+    def open_slot(self, slot):
+        # Scene name of the district in `slot` on the current page, or None for an empty slot
+        district_id = self.slot_district(slot)
+        return self.open_district(district_id) if district_id is not None else None
+
+    def handle_key(self, key):
+        # Returns the scene to switch to, if any
+        if key in DISTRICT_KEYS:
+            return self.open_slot(DISTRICT_KEYS.index(key))
+        if key == pygame.K_PAGEDOWN:
+            self.show_page(self.page + 1)
+        elif key == pygame.K_PAGEUP:
+            self.show_page(self.page - 1)
+        return None
+
+    def handle_button(self, element):
+        # Returns the scene to switch to, if any
+        if element == self.button_prev:
+            self.show_page(self.page - 1)
+        elif element == self.button_next:
+            self.show_page(self.page + 1)
+        elif element in self.buttons:
+            return self.open_slot(self.buttons.index(element))
+        return None
+
+
+def run_headless(days, dt=HEADLESS_DT, metrics_csv=None, metrics_interval=15, load_snapshot=None, save_snapshot=None,
+                 dispatch_policy="shortest", parcels_out=None, record_trace=None, motion_mode="frame",
+                 district_count=DEFAULT_DISTRICTS):
+    if load_snapshot:
+        engine = snapshot.load_snapshot(load_snapshot)  # Continue from a checkpoint instead of Monday 06:00
+        print(f"[Headless] Restored snapshot {load_snapshot} at {engine.sim_clock.get_time_str()}")
+    else:
+        engine = SimulationEngine(headless=True, dispatch_policy=dispatch_policy, motion_mode=motion_mode,
+                                  district_count=district_count)  # No display, images or fonts
+    start_metrics(engine, metrics_csv, metrics_interval)
+    if record_trace:
+        engine.start_recording()
+    started = time.perf_counter()
+    ticks = engine.run_headless(days, dt)
+    elapsed = time.perf_counter() - started
+    print(f"[Headless] Simulated {days} day(s) in {ticks} ticks, {elapsed:.2f}s wall time (now {engine.sim_clock.get_time_str()})")
+    for line in engine.metrics.summary_lines():
+        print(f"[Metrics] {line}")
+    engine.metrics.write_snapshot()  # Final row covering the tail of the run
+    summary = engine.parcels.summary()
+    print(f"[Parcels] {summary['delivered']}/{summary['parcels']} delivered")
+    for stage in ("arrived_to_picked", "picked_to_loaded", "loaded_to_delivered", "arrived_to_delivered"):
+        if stage in summary:
+            stat = summary[stage]
+            print(f"[Parcels] {stage:<22} p50 {stat['p50'] / 60:8.1f} min  p90 {stat['p90'] / 60:8.1f} min  p99 {stat['p99'] / 60:8.1f} min")
+    if parcels_out:
+        engine.parcels.save(parcels_out)  # Structured array, one row per parcel id
+    if record_trace:
+        size = engine.recorder.save(record_trace)
+        print(f"[Headless] Saved trace of {engine.recorder.ticks} ticks to {record_trace} ({size} bytes)")
+    if save_snapshot:
+        size = snapshot.save_snapshot(engine, save_snapshot)
+        print(f"[Headless] Saved snapshot to {save_snapshot} ({size} bytes)")
+    return engine
+
+
+def run_monte_carlo(runs, days, seed=0, dt=HEADLESS_DT, workers=None, output=None, dispatch_policy="shortest",
+                    motion_mode="frame", district_count=DEFAULT_DISTRICTS):
+    started = time.perf_counter()
+    report = montecarlo.run_batch(runs, days, seed, dt, workers, dispatch_policy, motion_mode, district_count)
+    elapsed = time.perf_counter() - started
+    print(f"[MonteCarlo] {runs} run(s) x {days} day(s) in {elapsed:.2f}s wall time")
+    print(f"{'kpi':<24}{'mean':>12}{'95% ci low':>12}{'95% ci high':>12}{'min':>12}{'max':>12}")
+    for kpi, stat in report["kpis"].items():
+        print(f"{kpi:<24}{stat['mean']:>12.2f}{stat['ci95_low']:>12.2f}{stat['ci95_high']:>12.2f}{stat['min']:>12.2f}{stat['max']:>12.2f}")
+    if output:
+        with open(output, "w") as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
+def run_windowed(metrics_csv=None, metrics_interval=15, dispatch_policy="shortest", asset_cache=None, record_trace=None,
+                 motion_mode="frame", district_count=DEFAULT_DISTRICTS):
+    engine = SimulationEngine(dispatch_policy=dispatch_policy, motion_mode=motion_mode, district_count=district_count)
+    start_metrics(engine, metrics_csv, metrics_interval)
+    if record_trace:
+        engine.start_recording()
+    scene_manager = engine.scene_manager
+    sim_clock = engine.sim_clock
+    profiler = engine.profiler
+
+    # Initialize Pygame and simulation window
+    pygame.init()  # Initialize all imported Pygame modules
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))  # Create a window of size 1280x720
+    loadimage.preload(asset_cache)  # Decode and pack every sprite now instead of on first draw
+    clock = pygame.time.Clock()  # Track time per frame for consistent simulation speed
+
+    # UI Manager and scene buttons
+    ui_manager = pygame_gui.UIManager((SCREEN_WIDTH, SCREEN_HEIGHT))  # Setup GUI manager for handling buttons
+
+    # Create UI buttons to allow switching scenes with mouse clicks
+    button_sorting = pygame_gui.elements.UIButton(pygame.Rect((20, 640), (160, 40)), 'Sorting Area', ui_manager)
+    button_carpark = pygame_gui.elements.UIButton(pygame.Rect((190, 640), (160, 40)), 'Carpark', ui_manager)
+    districts = engine.districts
+    district_pager = DistrictPager(ui_manager, range(1, len(districts) + 1),
+                                   lambda district_id: districts.get(district_id).name)  # Opening one creates it
+    button_stats = pygame_gui.elements.UIButton(pygame.Rect((1020, 640), (180, 40)), 'Statistics', ui_manager)
+
+    overlay_font = get_font("Arial", 24)
+    overlay_rects = []  # Where the time/scene text was drawn last frame
+    overlay_time_str = None
+    time_text = None
+
+    # Main game loop
+    running = True  # Flag to keep the game loop alive
+    while running:
+        dt = clock.tick(FPS)  # Cap FPS and retrieve time since last frame (in ms)
+        stage_start = time.perf_counter()
+        for event in pygame.event.get():  # Get all queued events (keyboard, mouse, etc.)
+            if event.type == pygame.QUIT:
+                running = False  # Quit the loop if the window is closed
+
+            if event.type == pygame.KEYDOWN:  # Keyboard-based scene switching
+                if event.key == pygame.K_1:
+                    scene_manager.switch_scene("SortingArea")
+                elif event.key == pygame.K_2:
+                    scene_manager.switch_scene("Carpark")
+                elif event.key in DISTRICT_KEYS or event.key in (pygame.K_PAGEUP, pygame.K_PAGEDOWN):
+                    name = district_pager.handle_key(event.key)
+                    if name:
+                        scene_manager.switch_scene(name)
+                elif event.key == pygame.K_6:
+                    scene_manager.switch_scene("Statistics")
+                elif event.key == pygame.K_EQUALS:  # Time warp up
+                    sim_clock.set_speed(sim_clock.speed_multiplier * 10)
+                elif event.key == pygame.K_MINUS:  # Time warp down
+                    sim_clock.set_speed(sim_clock.speed_multiplier // 10)
+                elif event.key == pygame.K_F9:  # Start/stop a cProfile capture
+                    profiler.toggle_capture()
+
+            ui_manager.process_events(event)  # Let GUI respond to this event
+
+            if event.type == pygame_gui.UI_BUTTON_PRESSED:  # Scene switch buttons
+                if event.ui_element == button_sorting:
+                    scene_manager.switch_scene("SortingArea")
+                elif event.ui_element == button_carpark:
+                    scene_manager.switch_scene("Carpark")
+                elif event.ui_element == button_stats:
+                    scene_manager.switch_scene("Statistics")
+                else:
+                    name = district_pager.handle_button(event.ui_element)
+                    if name:
+                        scene_manager.switch_scene(name)
+
+            scene_manager.handle_event(event)  # Forward the event to the active scene
+        profiler.record("events", (time.perf_counter() - stage_start) * 1000.0)
+
+        # Run simulation
+        engine.step(dt)  # Advance clock, controllers and scenes (timed per stage inside)
+        profiler.measure("ui_update", ui_manager.update, dt / 1000.0)  # Update UI (needs seconds, not ms)
+
+        # Draw scene
+        stage_start = time.perf_counter()
+        for rect in overlay_rects:
+            scene_manager.restore(screen, rect)  # Clear last frame's overlay text before sprites are drawn over it
+        dirty = scene_manager.render(screen)  # Draw active scene content; None means the full screen changed
+
+        # Display simulation time and current scene overlay
+        time_str = f"{sim_clock.get_time_str()}  x{sim_clock.speed_multiplier}"
+        if time_str != overlay_time_str:  # Only re-rasterize when the minute (or warp) changes
+            overlay_time_str = time_str
+            time_text = overlay_font.render(time_str, True, (255, 255, 255))  # Render current sim time
+        scene_text = render_text(f"Scene: {scene_manager.current_scene}", 24)  # Active scene name
+        new_overlay_rects = [
+            screen.blit(time_text, (20, 20)),  # Show time top-left
+            screen.blit(scene_text, (20, 50)),  # Show scene name below
+        ]
+
+        profiler.record("render", (time.perf_counter() - stage_start) * 1000.0)
+        profiler.measure("draw_ui", ui_manager.draw_ui, screen)  # Draw UI elements
+        if dirty is None:
+            pygame.display.flip()  # Refresh the screen with all updates
+        else:
+            pygame.display.update(dirty + overlay_rects + new_overlay_rects + [UI_RECT])  # Only what changed
+        overlay_rects = new_overlay_rects
+
+    if record_trace:
+        engine.recorder.save(record_trace)
+    pygame.quit()  # Shut down Pygame cleanly when the loop ends
+
+
+def run_replay(path, asset_cache=None):
+    # Play back a recorded trace: no controllers run, scenes are redrawn from the recorded state.
+    # 1-5 switch scenes (PageUp/PageDown page through the districts), space pauses, +/- change playback speed,
+    # left/right seek an hour, home restarts.
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    loadimage.preload(asset_cache)
+    player = replay.TracePlayer(replay.load_trace(path))
+    scene_manager = player.scene_manager
+    scene_keys = {pygame.K_1: "SortingArea", pygame.K_2: "Carpark"}
+    ui_manager = pygame_gui.UIManager((SCREEN_WIDTH, SCREEN_HEIGHT))
+    districts = player.districts  # Only the districts that were laid out during the recorded run
+    district_pager = DistrictPager(ui_manager, sorted(districts), lambda district_id: districts[district_id].name)
+    clock = pygame.time.Clock()
+    overlay_font = get_font("Arial", 24)
+    overlay_rects = []
+    speed = 1.0  # Recorded ticks per displayed frame
+    carry = 0.0
+    paused = False
+
+    running = True
+    while running:
+        clock.tick(FPS)
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key in scene_keys:
+                    scene_manager.switch_scene(scene_keys[event.key])
+                elif event.key in DISTRICT_KEYS or event.key in (pygame.K_PAGEUP, pygame.K_PAGEDOWN):
+                    name = district_pager.handle_key(event.key)
+                    if name:
+                        scene_manager.switch_scene(name)
+                elif event.key == pygame.K_SPACE:
+                    paused = not paused
+                elif event.key == pygame.K_EQUALS:
+                    speed = min(speed * 2, 4096.0)
+                elif event.key == pygame.K_MINUS:
+                    speed = max(speed / 2, 0.125)
+                elif event.key == pygame.K_RIGHT:
+                    player.seek_time(player.sim_elapsed + 3600)
+                elif event.key == pygame.K_LEFT:
+                    player.seek_time(player.sim_elapsed - 3600)
+                elif event.key == pygame.K_HOME:
+                    player.seek(0)
+            ui_manager.process_events(event)
+            if event.type == pygame_gui.UI_BUTTON_PRESSED:
+                name = district_pager.handle_button(event.ui_element)
+                if name:
+                    scene_manager.switch_scene(name)
+            scene_manager.handle_event(event)
+
+        if not paused:
+            carry += speed
+            steps, carry = int(carry), carry - int(carry)
+            if steps:
+                player.advance(steps)
+
+        for rect in overlay_rects:
+            scene_manager.restore(screen, rect)
+        dirty = scene_manager.render(screen)
+        status = "paused" if paused else f"x{speed:g}"
+        text = overlay_font.render(f"Replay {player.time_str()}  {status}  tick {player.tick}/{len(player) - 1}", True, (255, 255, 255))
+        new_overlay_rects = [screen.blit(text, (20, 20))]
+        ui_manager.update(1.0 / FPS)
+        ui_manager.draw_ui(screen)  # District page buttons
+        if dirty is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(dirty + overlay_rects + new_overlay_rects + [UI_RECT])
+        overlay_rects = new_overlay_rects
+
+    pygame.quit()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sorting/delivery simulation")
+    parser.add_argument("--headless", action="store_true", help="Run without a display at an uncapped rate")
+    parser.add_argument("--days", type=int, default=5, help="Number of sim days to run in headless mode")
+    parser.add_argument("--dt", type=float, default=HEADLESS_DT, help="Tick length in ms for headless mode")
+    parser.add_argument("--metrics-csv", help="Append a KPI snapshot row to this CSV file periodically")
+    parser.add_argument("--metrics-interval", type=int, default=15, help="Sim minutes between KPI snapshots")
+    parser.add_argument("--dispatch-policy", choices=list(POLICIES), default="shortest",
+                        help="How idle couriers are assigned to box-pile lanes")
+    parser.add_argument("--motion", choices=MOTION_MODES, default="frame",
+                        help="exact: entities move on warped time and ticks are cut at every arrival and event (for large --dt or time warp)")
+    parser.add_argument("--districts", type=int, default=DEFAULT_DISTRICTS,
+                        help="Number of city districts; each is only laid out once a vehicle is sent there or it is opened")
+    parser.add_argument("--parcels-out", help="Headless: save the per-parcel table (.npy) at the end of the run")
+    parser.add_argument("--load-snapshot", help="Headless: start from this snapshot file")
+    parser.add_argument("--save-snapshot", help="Headless: write a snapshot of the final state to this file")
+    parser.add_argument("--asset-cache", help="Windowed: keep the packed sprite atlas in this directory between runs")
+    parser.add_argument("--log-file", help="Write the structured event log (JSON lines) to this file; ignored with --runs")
+    parser.add_argument("--log-level", choices=[name for name in eventlog.LEVELS if name != "off"], default="info",
+                        help="Lowest event level written to --log-file")
+    parser.add_argument("--log-category", action="append",
+                        help="Only log this category (repeatable): spawn, truck, queue, courier")
+    parser.add_argument("--record-trace", help="Record a replayable trace of the run to this file (.npz)")
+    parser.add_argument("--replay", help="Play back a trace recorded with --record-trace instead of simulating")
+    parser.add_argument("--runs", type=int, help="Run this many seeded headless simulations in parallel and merge their KPIs")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the first Monte-Carlo run (run i uses seed + i)")
+    parser.add_argument("--workers", type=int, help="Worker processes for --runs (default: all cores)")
+    parser.add_argument("--output", help="Write the merged Monte-Carlo report to this JSON file")
+    args = parser.parse_args(argv)
+    if args.districts < 0:
+        parser.error("--districts must be 0 or more")
+
+    if args.log_file and not args.runs:  # Worker processes of a Monte-Carlo batch don't log
+        eventlog.configure(args.log_file, args.log_level, args.log_category)
+
+    if args.replay:
+        run_replay(args.replay, args.asset_cache)
+    elif args.runs:
+        run_monte_carlo(args.runs, args.days, args.seed, args.dt, args.workers, args.output, args.dispatch_policy,
+                        args.motion, args.districts)
+    elif args.headless:
+        run_headless(args.days, args.dt, args.metrics_csv, args.metrics_interval,
+                     args.load_snapshot, args.save_snapshot, args.dispatch_policy, args.parcels_out, args.record_trace,
+                     args.motion, args.districts)
+    else:
+        run_windowed(args.metrics_csv, args.metrics_interval, args.dispatch_policy, args.asset_cache, args.record_trace, args.motion,
+                     args.districts)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import math
+import os
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # Workers never open a window
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from engine import SimulationEngine, HEADLESS_DT, DEFAULT_DISTRICTS
+
+# Two-sided 95% Student-t critical values by degrees of freedom
+T_95 = {1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365, 8: 2.306, 9: 2.262, 10: 2.228,
+        11: 2.201, 12: 2.179, 13: 2.160, 14: 2.145, 15: 2.131, 16: 2.120, 17: 2.110, 18: 2.101, 19: 2.093, 20: 2.086,
+        21: 2.080, 22: 2.074, 23: 2.069, 24: 2.064, 25: 2.060, 26: 2.056, 27: 2.052, 28: 2.048, 29: 2.045, 30: 2.042,
+        40: 2.021, 50: 2.009, 60: 2.000, 80: 1.990, 100: 1.984, 120: 1.980}
+
+def t_critical(df):
+    # Value at the largest tabulated df <= df: the critical value falls with df, so an untabulated df gets a
+    # slightly wider (conservative) interval, never a narrower one
+    return T_95[max(limit for limit in T_95 if limit <= df)]
+
+def run_replication(seed, days, dt=HEADLESS_DT, dispatch_policy="shortest", motion_mode="frame",
+                    district_count=DEFAULT_DISTRICTS):
+    # One headless simulation; runs in a worker process and returns its final KPI snapshot
+    engine = SimulationEngine(headless=True, dispatch_policy=dispatch_policy, motion_mode=motion_mode,
+                              district_count=district_count, seed=seed)  # Entity events go to the (disabled) event log
+    started = time.perf_counter()
+    engine.run_headless(days, dt)
+    snapshot = engine.metrics.snapshot()
+    parcels = engine.parcels.summary()
+    snapshot["parcels_delivered"] = parcels["delivered"]
+    for stage, stats in parcels.items():
+        if isinstance(stats, dict):  # Lead times depend on where the seeded RNG sends each parcel
+            snapshot[f"{stage}_mean_s"] = round(stats["mean"], 3)
+            snapshot[f"{stage}_p90_s"] = round(stats["p90"], 3)
+    snapshot["seed"] = seed
+    snapshot["wall_seconds"] = round(time.perf_counter() - started, 3)
+    return snapshot
+
+def merge_snapshots(snapshots):
+    # Per-KPI mean, standard deviation, 95% confidence interval of the mean, min and max across runs
+    merged = {}
+    for key in snapshots[0]:
+        if key in ("seed", "sim_time", "sim_seconds"):
+            continue
+        values = [row[key] for row in snapshots if isinstance(row.get(key), (int, float))]
+        if not values:
+            continue
+        mean = statistics.fmean(values)
+        stdev = statistics.stdev(values) if len(values) > 1 else 0.0
+        half_width = t_critical(len(values) - 1) * stdev / math.sqrt(len(values)) if len(values) > 1 else 0.0
+        merged[key] = {
+            "n": len(values),
+            "mean": mean,
+            "stdev": stdev,
+            "ci95_low": mean - half_width,
+            "ci95_high": mean + half_width,
+            "min": min(values),
+            "max": max(values),
+        }
+    return merged
+
+def run_batch(runs, days, base_seed=0, dt=HEADLESS_DT, workers=None, dispatch_policy="shortest", motion_mode="frame",
+              district_count=DEFAULT_DISTRICTS):
+    # Fan `runs` seeded replications out over all cores; results come back in seed order
+    seeds = [base_seed + i for i in range(runs)]
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=min(workers, runs)) as pool:
+        snapshots = list(pool.map(run_replication, seeds, [days] * runs, [dt] * runs, [dispatch_policy] * runs,
+                                  [motion_mode] * runs, [district_count] * runs))
+    return {
+        "runs": runs,
+        "days": days,
+        "dispatch_policy": dispatch_policy,
+        "motion_mode": motion_mode,
+        "districts": district_count,
+        "seeds": seeds,
+        "kpis": merge_snapshots(snapshots),
+        "replications": snapshots,
+    }
@@ -5,31 +5,37 @@ from pygame.math import Vector2  # Import Vector2 for 2D vector math
 import pygame
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 import queue_manager
+from fonts import render_text  # Shared label cache
+from parcels import ParcelRanges  # Ids into the engine's ParcelStore
+
+QUEUE_DIRECTIONS = [queue_manager.Directions.RIGHT, queue_manager.Directions.UP, queue_manager.Directions.DOWN]
 
 class BoxPile:
-    def __init__(self, position):
+    def __init__(self, position, queue_size=10):
         self.position = Vector2(position)  # Central position of the pile
-        self.count = 0  # Number of boxes currently in the pile
-        self.font = pygame.font.SysFont("Arial", 20)  # Font for rendering the counter
-        self.queue_manager = queue_manager.QueueManager(position, max_size=10)
+        self.parcels = ParcelRanges()  # Parcels in the pile, oldest first
+        self.queue_manager = queue_manager.QueueManager(position, max_size=queue_size)
+        for direction in QUEUE_DIRECTIONS:
+            self.queue_manager.generate_queue(direction)  # Couriers line up on these lanes
 
-    def set_count(self, count):
-        self.count = max(0, count)  # Set pile count, ensuring non-negative
+    @property
+    def count(self):
+        return self.parcels.count  # Number of boxes currently in the pile
 
-    def increment(self, count=1):
-        self.count += count  # Increase pile count
+    def receive(self, start, stop):
+        self.parcels.extend(start, stop)  # A truckload of consecutive parcel ids
 
-    def decrement(self):
-        self.count = max(0, self.count - 1)  # Decrease pile count, clamping at zero
+    def take(self, count=1):
+        return self.parcels.take(count)  # Oldest parcels first; list of (start, stop) runs
 
     def is_empty(self):
         return self.count == 0  # Returns True if no boxes are left
 
-    def render(self, screen):
-        if self.count > 0:
-            box_img = load_image("box.png")  # Load box icon
-            screen.blit(box_img, (self.position.x, self.position.y))  # Draw single icon
-
-            # Draw counter above the box
-            label = self.font.render(str(self.count), True, (255, 255, 255))
-            screen.blit(label, (self.position.x + 20, self.position.y - 15))
\ No newline at end of file
+    def draw_commands(self):
+        # (surface, position) pairs; the scene draws them all in one Surface.blits call
+        if self.count <= 0:
+            return []
+        box_img = load_image("box.png")  # Load box icon
+        label = render_text(str(self.count), 20)  # Counter above the box
+        return [(box_img, (self.position.x, self.position.y)),
+                (label, (self.position.x + 20, self.position.y - 15))]
@@ -1,34 +1,43 @@
 from pygame.math import Vector2
 from loadimage import load_image  # Import image loading function
+from motion import Movable  # Positions live in the shared MovementSystem
+from fonts import render_text  # Shared label cache
+from parcels import ParcelRanges  # Ids into the engine's ParcelStore
 import pygame
 
 SCREEN_WIDTH, SCREEN_HEIGHT = 1280, 720  # Dimensions used throughout the GUI
 
-class Car:
+class Car(Movable):
     def __init__(self, position):
-        self.position = Vector2(SCREEN_WIDTH + 100, position.y)  # Start off-screen right
+        # Start off-screen right and drive to the in-scene location at 120 px/s
+        self.attach_motion(Vector2(SCREEN_WIDTH + 100, position.y), Vector2(position), 120)
         self.occupied = False  # Whether a courier has claimed this car
         self.driver = None  # Reference to the assigned courier
         self.image = load_image("car.png", (12, 9))  # Load and scale the car image
-        self.target_position = Vector2(position)  # The in-scene location the van should drive to
-        self.speed = 120  # Movement speed in pixels per second
-        self.box_load = 0  # Start with zero boxes loaded
-        self.font = pygame.font.SysFont("Arial", 16)
+        self.parcels = ParcelRanges()  # Start with zero boxes loaded
 
-    def update(self, dt):
-        direction = self.target_position - self.position  # Get vector to target
-        if direction.length() > 1:  # If far enough from destination, move
-            direction.normalize_ip()  # Normalize to unit direction vector
-            self.position += direction * self.speed * (dt / 1000.0)  # Move based on speed and time delta
+    @property
+    def box_load(self):
+        return self.parcels.count
 
-    def loaded_box(self):
-        self.box_load += 1
+    def load(self, runs):
+        self.parcels.extend_all(runs)
+        if self.changed:
+            self.changed(self)  # Label changed
+        if self.woken:
+            self.woken(self)
 
-    def unload_box(self):
-        self.box_load = max(0, self.box_load - 1)
+    def unload_box(self, parcel_id):
+        self.parcels.remove(parcel_id)
+        if self.changed:
+            self.changed(self)
+        if self.woken:
+            self.woken(self)
 
-    def render(self, screen):
-        screen.blit(self.image, self.position)  # Draw car at its current position
+    def draw_commands(self):
+        # (surface, position) pairs; the scene draws them all in one Surface.blits call
+        position = self.position
+        commands = [(self.image, position)]  # Car at its current position
         if self.box_load > 0:
-            label = self.font.render(str(self.box_load), True, (255, 255, 255))
-            screen.blit(label, (self.position.x + 10, self.position.y - 20))  # Position above the vehicle
+            commands.append((render_text(str(self.box_load)), (position.x + 10, position.y - 20)))  # Label above the vehicle
+        return commands
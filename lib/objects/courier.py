@@ -4,91 +4,65 @@ import os
 import sys
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from loadimage import load_image  # Import image loading function
-import random
 from box import BoxPile
 from queue_manager import Directions
+from motion import Movable  # Positions live in the shared MovementSystem
+from fonts import render_text  # Shared label cache
+from parcels import ParcelRanges  # Ids into the engine's ParcelStore
+import eventlog
 
 SCREEN_WIDTH, SCREEN_HEIGHT = 1280, 720
 
-class Courier:
+class Courier(Movable):
     def __init__(self, id, position, image_path, idle_position):
         self.id = id
         self.status = "REPORTING"
-        self.position = position
         self.idle_position = idle_position
-        self.target_position = idle_position  # Will change when moving
+        self.attach_motion(position, idle_position, 300)  # Walk to the idle spot first; target changes when moving
         self.grid_assigned = False
-        self.carrying = 0
+        self.parcels = ParcelRanges()  # Parcels in hand between the pile and the vehicle
         self.shift = None
-        self.speed = 300
         self.queue_type = None
+        self.queue_index = None  # Position in the lane, 0 = front
         self.assigned_vehicle = None
-        self.slot_request_timer = 0  # Timer to control how often slot is requested
-        self.slot_request_interval = 100  # milliseconds (1 second)
-        self.font = pygame.font.SysFont("Arial", 16)
+        self.district = None  # CityDistrictScene being delivered to
+        self.route = None  # Planned Route while DELIVERING
+        self.route_distance = 0.0  # Px driven along the route so far
+        self.route_stop = 0  # Next house on the route
+        self.delivery_ids = None  # Parcel ids in the vehicle, aligned with the houses given to the planner
         self.image = load_image(image_path, (18, 18))
 
-    def request_slot(self, box_pile: BoxPile | None):
+    def request_slot(self, box_pile: BoxPile | None, direction_choice: Directions):
+        # Join the tail of the lane the SlotDispatcher picked
         if box_pile is None:
             return False  # Safety check
 
-        available_queues = [
-            direction
-            for direction in Directions
-            for queue in [box_pile.queue_manager.get_queue(direction=direction)]
-            if queue is not None
-        ]
-
-        if not available_queues:
-            return False  # All end slots are full
-
-        # Randomly select one of the queues with an open highest-index slot
-        direction_choice = random.choice(available_queues)
         # already moves the courier for us
-        box_pile.queue_manager.add_courier_to_direction(self, direction_choice)
+        if not box_pile.queue_manager.add_courier_to_direction(self, direction_choice):
+            return False
 
         self.queue_type = direction_choice
         self.status = "MOVE_TO_QUEUE"
-        print(f"[Queue Assign] {self.id} → R{i}")
+        eventlog.debug("queue", "{courier} -> {lane}{slot}", courier=self.id, lane=direction_choice.name, slot=self.queue_index)
         return True
 
-    def pickup_box(self, box_pile: BoxPile | None):
-        if not box_pile.is_empty():
-            self.carrying += 1
-            box_pile.decrement()
-
-            # Clear courier from the correct occupied list, if he's first in line.
-            # if he took a box when not first in line something is wrong
-            box_pile.queue_manager.remove_courier_from_direction(self, direction_choice=self.queue_type)
-
-    def deliver_box(self):
-        if self.assigned_vehicle and self.carrying > 0:
-            self.assigned_vehicle.loaded_box()
-            self.carrying = 0
-            self.status = "IDLE"
-            self.target_position = self.idle_position  # Return to idle spot
-            print(f"{self.id} loaded a box to vehicle")
+    @property
+    def carrying(self):
+        return self.parcels.count
 
-    def update(self, dt):
-        if self.status in ["REPORTING", "MOVE_TO_QUEUE", "MOVE_TO_VEHICLE"]:
-            direction = self.target_position - self.position
-            if direction.length() < 2:
-                self.position = self.target_position
-                if self.status == "REPORTING":
-                    self.status = "IDLE"
-                elif self.status == "MOVE_TO_QUEUE":
-                    self.status = "QUEUING"
-                elif self.status == "MOVE_TO_VEHICLE":
-                    self.deliver_box()
-            else:
-                direction.normalize_ip()
-                self.position += direction * self.speed * (dt / 1000.0)
+    def pickup_box(self, box_pile: BoxPile | None, count=1):
+        # Take up to `count` parcels from the pile; returns the (start, stop) runs picked up
+        taken = box_pile.take(count)
+        self.parcels.extend_all(taken)
+        return taken
 
-    def render(self, screen):
-        screen.blit(self.image, self.position)
+    def draw_commands(self):
+        # (surface, position) pairs; the scene draws them all in one Surface.blits call
+        position = self.position
+        commands = [(self.image, position)]
         if self.carrying:
-            label = self.font.render(str(self.carrying), True, (255, 255, 255))
-            screen.blit(label, (self.position.x + 8, self.position.y - 18))
+            commands.append((render_text(str(self.carrying)), (position.x + 8, position.y - 18)))
+        return commands
 
 # --- Grid generator functions ---
 def generate_staff_idle_grid():
@@ -114,7 +88,7 @@ class StaffCourier(Courier):
             idle_pos = StaffCourier.idle_grid.pop(0)
         else:
             idle_pos = Vector2(1000, 100)  # Fallback position
-        print(f"[Spawn] Assigned idle position {idle_pos} to StaffCourier {id}")
+        eventlog.debug("spawn", "Assigned idle position ({x:.0f}, {y:.0f}) to StaffCourier {courier}", x=idle_pos.x, y=idle_pos.y, courier=id)
         super().__init__(id=id, position=entry_point, image_path="courier_staff.png", idle_position=idle_pos)
         self.type = "Courier_Staff"
 
@@ -127,6 +101,6 @@ class SubconCourier(Courier):
             idle_pos = SubconCourier.idle_grid.pop(0)
         else:
             idle_pos = Vector2(1000, 600)  # Fallback idle position
-        print(f"[Spawn] Assigned idle position {idle_pos} to StaffCourier {id}")
+        eventlog.debug("spawn", "Assigned idle position ({x:.0f}, {y:.0f}) to SubconCourier {courier}", x=idle_pos.x, y=idle_pos.y, courier=id)
         super().__init__(id=id, position=entry_point, image_path="courier_subcon.png", idle_position=idle_pos)
         self.type = "Courier_Subcon"
@@ -0,0 +1,34 @@
+from collections import OrderedDict
+import pygame
+import loadimage  # Shares the headless switch with image loading
+
+FONT_CACHE = {}  # One Font object per (name, size) for the whole program
+LABEL_CACHE = OrderedDict()  # LRU of rendered text surfaces keyed by (font key, text, colour)
+LABEL_CACHE_SIZE = 1024  # Enough for every distinct count label plus scene captions
+
+def get_font(name="Arial", size=16):
+    if loadimage.HEADLESS:
+        return None  # Skip font init entirely when nothing is rendered
+    key = (name, size)
+    font = FONT_CACHE.get(key)
+    if font is None:
+        if not pygame.font.get_init():
+            pygame.font.init()
+        font = FONT_CACHE[key] = pygame.font.SysFont(name, size)
+    return font
+
+def render_text(text, size=16, colour=(255, 255, 255), name="Arial"):
+    key = ((name, size), text, colour)
+    label = LABEL_CACHE.get(key)
+    if label is not None:
+        LABEL_CACHE.move_to_end(key)  # Mark as recently used
+        return label
+
+    font = get_font(name, size)
+    if font is None:
+        return None
+    label = font.render(text, True, colour)
+    LABEL_CACHE[key] = label
+    if len(LABEL_CACHE) > LABEL_CACHE_SIZE:
+        LABEL_CACHE.popitem(last=False)  # Evict the least recently used label
+    return label
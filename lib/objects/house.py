@@ -1,19 +1,35 @@
 from pygame.math import Vector2
 from loadimage import load_image
+from fonts import render_text  # Shared label cache
 import pygame  # Importing pygame for rendering and font handling
 SCREEN_WIDTH, SCREEN_HEIGHT = 1280, 720  # Dimensions used throughout the GUI
 
 class House:
+    changed = None  # Optional callback(house) fired when `occupied` flips (scene cache invalidation)
+
     def __init__(self, scene_name="Neighborhood"):
         self.position = None  # Will be set later
+        self.house_id = -1  # Index in the district's house list, set by CityDistrictScene.index_houses
         self.scene = scene_name
         self.image = load_image("house.png", (18, 18))
-        self.font = pygame.font.SysFont("Arial", 16)
-        self.occupied = False  # Renamed for clarity (optional)
+        self._occupied = False  # Renamed for clarity (optional)
+
+    @property
+    def occupied(self):
+        return self._occupied
+
+    @occupied.setter
+    def occupied(self, value):
+        if value != self._occupied:
+            self._occupied = value
+            if self.changed:
+                self.changed(self)
 
-    def render(self, screen):
-        if self.position is not None:
-            screen.blit(self.image, self.position)
-            if self.occupied:
-                label = self.font.render("Occupied", True, (255, 255, 255))
-                screen.blit(label, (self.position.x + 5, self.position.y - 20))
\ No newline at end of file
+    def draw_commands(self):
+        # (surface, position) pairs; the scene draws them all in one Surface.blits call
+        if self.position is None:
+            return []
+        commands = [(self.image, self.position)]
+        if self.occupied:
+            commands.append((render_text("Occupied"), (self.position.x + 5, self.position.y - 20)))
+        return commands
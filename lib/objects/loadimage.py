@@ -1,17 +1,110 @@
+import json
 import os
 import pygame
 
+IMAGES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "images")
 IMAGE_CACHE = {}  # Cache to store loaded and scaled images
+HEADLESS = False  # When True, no images or fonts are loaded (used by the headless engine)
+
+SPRITES = [  # Every (image, size) the entities ask for; preloaded into one atlas at startup
+    ("courier_staff.png", (18, 18)),
+    ("courier_subcon.png", (18, 18)),
+    ("van.png", (18, 12)),
+    ("car.png", (12, 9)),
+    ("house.png", (18, 18)),
+    ("truck.png", (96, 48)),
+    ("box.png", (32, 32)),
+]
+ATLAS_VERSION = 1
+ATLAS_PADDING = 1  # Transparent gap between sprites so scaled edges never bleed into neighbours
+atlas = None  # Surface all preloaded sprites live on; IMAGE_CACHE entries are subsurfaces of it
+
+def set_headless(enabled=True):
+    global HEADLESS
+    HEADLESS = enabled  # Toggle asset loading for display-less runs
+
 def load_image(name, size=(32, 32)):
-    path = os.path.join("..", "images", name)  # Resolve relative path to image
+    if HEADLESS:
+        return None  # Nothing is ever drawn in headless mode
 
     if (name, size) in IMAGE_CACHE:
-        return IMAGE_CACHE[(name, size)]  # Return cached version if already loaded
+        return IMAGE_CACHE[(name, size)]  # Return cached version if already loaded (or preloaded)
 
     if pygame.display.get_surface() is None:
         raise RuntimeError(f"Cannot load '{name}' before display is initialized.")  # Prevent loading before display
 
-    raw_image = pygame.image.load(path).convert_alpha()  # Load image and preserve alpha channel
-    scaled = pygame.transform.scale(raw_image, size)  # Resize image to desired size
+    scaled = _load_scaled(name, size)  # Not in the atlas: load on first use as before
     IMAGE_CACHE[(name, size)] = scaled  # Store scaled image in cache
-    return scaled  # Return image
\ No newline at end of file
+    return scaled  # Return image
+
+def _load_scaled(name, size):
+    raw_image = pygame.image.load(os.path.join(IMAGES_DIR, name)).convert_alpha()  # Load image and preserve alpha channel
+    return pygame.transform.scale(raw_image, size)  # Resize image to desired size
+
+def _pack(sizes, width=256):
+    # Shelf packing: left to right in rows, tallest sprites first; returns rects in input order and the atlas size
+    order = sorted(range(len(sizes)), key=lambda i: -sizes[i][1])
+    rects = [None] * len(sizes)
+    x = y = shelf = 0
+    for i in order:
+        w, h = sizes[i]
+        if x + w > width and x > 0:
+            x, y, shelf = 0, y + shelf + ATLAS_PADDING, 0
+        rects[i] = pygame.Rect(x, y, w, h)
+        x += w + ATLAS_PADDING
+        shelf = max(shelf, h)
+    return rects, (max(width, max(w for w, _ in sizes)), y + shelf)
+
+def _sources_signature():
+    # Size and mtime of every source image, so a cached atlas is rebuilt when any of them changes
+    signature = {}
+    for name, _ in SPRITES:
+        stat = os.stat(os.path.join(IMAGES_DIR, name))
+        signature[name] = [stat.st_size, int(stat.st_mtime)]
+    return signature
+
+def _load_cached_atlas(cache_dir):
+    manifest_path = os.path.join(cache_dir, "atlas.json")
+    image_path = os.path.join(cache_dir, "atlas.png")
+    if not (os.path.exists(manifest_path) and os.path.exists(image_path)):
+        return None
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    expected = [[name, list(size)] for name, size in SPRITES]
+    if (manifest.get("version") != ATLAS_VERSION or manifest.get("sprites") != expected
+            or manifest.get("sources") != _sources_signature()):
+        return None  # Stale: sprite list or source images changed
+    surface = pygame.image.load(image_path).convert_alpha()
+    return surface, [pygame.Rect(rect) for rect in manifest["rects"]]
+
+def _save_cached_atlas(cache_dir, surface, rects):
+    os.makedirs(cache_dir, exist_ok=True)
+    pygame.image.save(surface, os.path.join(cache_dir, "atlas.png"))
+    with open(os.path.join(cache_dir, "atlas.json"), "w") as f:
+        json.dump({
+            "version": ATLAS_VERSION,
+            "sprites": [[name, list(size)] for name, size in SPRITES],
+            "sources": _sources_signature(),
+            "rects": [list(rect) for rect in rects],
+        }, f)
+
+def preload(cache_dir=None):
+    # Decode, scale and pack every sprite into one atlas before the first frame; with `cache_dir`
+    # the packed atlas is reused from disk on later startups. Needs the display to be set up.
+    global atlas
+    if HEADLESS:
+        return None
+    cached = _load_cached_atlas(cache_dir) if cache_dir else None
+    if cached is not None:
+        atlas, rects = cached
+    else:
+        rects, atlas_size = _pack([size for _, size in SPRITES])
+        atlas = pygame.Surface(atlas_size, pygame.SRCALPHA).convert_alpha()
+        atlas.fill((0, 0, 0, 0))
+        for (name, size), rect in zip(SPRITES, rects):
+            atlas.blit(_load_scaled(name, size), rect, special_flags=pygame.BLEND_RGBA_MAX)  # Exact copy onto the cleared atlas
+        if cache_dir:
+            _save_cached_atlas(cache_dir, atlas, rects)
+    for key, rect in zip(SPRITES, rects):
+        IMAGE_CACHE[key] = atlas.subsurface(rect)  # Shares pixels with the atlas
+    return atlas
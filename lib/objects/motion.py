@@ -0,0 +1,211 @@
+import heapq
+import weakref
+import numpy as np
+from pygame.math import Vector2
+
+ARRIVAL_RADIUS = 1.0  # Entities closer than this to their target snap onto it
+TIME_EPSILON = 1e-6  # Ms; arrivals this close ahead of the clock are due (round-off when stepping right up to one)
+
+class MovementSystem:
+    # Struct-of-arrays store for everything that walks or drives; entities only keep an index.
+    # Movement is analytic: an entity left `positions` (its anchor) at `starts` and reaches `targets` at
+    # `arrivals`, both in ms on this system's clock. Nothing is integrated per tick; positions are interpolated
+    # only when asked for, and step() just pops the arrivals that have come due off a heap.
+    def __init__(self, capacity=256):
+        self.positions = np.zeros((capacity, 2), dtype=np.float64)  # Segment start, or where the entity rests
+        self.targets = np.zeros((capacity, 2), dtype=np.float64)
+        self.speeds = np.zeros(capacity, dtype=np.float64)  # Pixels per second
+        self.starts = np.zeros(capacity, dtype=np.float64)  # Clock time the current segment began
+        self.arrivals = np.zeros(capacity, dtype=np.float64)  # Clock time the target is reached (inf at speed 0)
+        self.segments = np.zeros(capacity, dtype=np.int64)  # Bumped on every new segment; stale heap entries are skipped
+        self.moving = np.zeros(capacity, dtype=bool)  # Still travelling towards target
+        self.in_use = np.zeros(capacity, dtype=bool)
+        self.touched = np.zeros(capacity, dtype=bool)  # Moved by hand or retargeted since the trace recorder last looked
+        self.now = 0.0  # Movement time so far (ms)
+        self.size = 0  # High-water mark of used slots
+        self._free = []  # Released slots available for reuse
+        self._arrivals = []  # Heap of (arrival time, segment, index)
+
+    def _grow(self):
+        capacity = len(self.speeds) * 2
+        for name in ("positions", "targets", "speeds", "starts", "arrivals", "segments", "moving", "in_use",
+                     "touched"):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def register(self, position, target, speed):
+        if self._free:
+            index = self._free.pop()
+        else:
+            if self.size == len(self.speeds):
+                self._grow()
+            index = self.size
+            self.size += 1
+        self.in_use[index] = True
+        self.positions[index] = (position[0], position[1])
+        self.targets[index] = (target[0], target[1])
+        self.speeds[index] = speed
+        self.starts[index] = self.now
+        self._plan(index)
+        self.touched[index] = True
+        return index
+
+    def release(self, index):
+        self.in_use[index] = False
+        self.moving[index] = False
+        self.segments[index] += 1  # Drops its pending arrival
+        self._free.append(index)
+
+    def position_of(self, index):
+        # Current position of one entity, interpolated along its segment
+        if not self.moving[index]:
+            return self.positions[index]
+        start, arrival = self.starts[index], self.arrivals[index]
+        fraction = min(1.0, (self.now - start) / (arrival - start)) if arrival > start else 1.0
+        return self.positions[index] + (self.targets[index] - self.positions[index]) * fraction
+
+    def current_positions(self, indices):
+        # position_of() for many entities at once
+        indices = np.asarray(indices, dtype=np.intp)
+        start, arrival = self.starts[indices], self.arrivals[indices]
+        span = arrival - start
+        fraction = np.ones(indices.size)
+        np.divide(self.now - start, span, out=fraction, where=span > 0)
+        fraction = np.where(self.moving[indices], np.clip(fraction, 0.0, 1.0), 0.0)
+        anchors = self.positions[indices]
+        return anchors + (self.targets[indices] - anchors) * fraction[:, None]
+
+    def _anchor(self, index):
+        # Start a new segment from wherever the entity is right now
+        self.positions[index] = self.position_of(index)
+        self.starts[index] = self.now
+
+    def _plan(self, index):
+        # Work out when the current segment ends and queue its arrival
+        self.segments[index] += 1
+        dx, dy = self.targets[index] - self.positions[index]
+        if dx == 0.0 and dy == 0.0:
+            self.moving[index] = False
+            self.arrivals[index] = self.starts[index]
+            return
+        self.moving[index] = True
+        dist = np.hypot(dx, dy)
+        speed = self.speeds[index]
+        if dist <= ARRIVAL_RADIUS:
+            arrival = self.now  # Snaps on the next step, as if it had covered the last pixel
+        elif speed > 0:
+            arrival = self.starts[index] + dist / speed * 1000.0
+        else:
+            arrival = np.inf  # Parked with a target; arrives once it gets a speed
+        self.arrivals[index] = arrival
+        if arrival != np.inf:
+            heapq.heappush(self._arrivals, (arrival, int(self.segments[index]), index))
+
+    def set_position(self, index, position):
+        self.positions[index] = (position[0], position[1])
+        self.starts[index] = self.now
+        self._plan(index)
+        self.touched[index] = True
+
+    def set_target(self, index, target):
+        self._anchor(index)
+        self.targets[index] = (target[0], target[1])
+        self._plan(index)
+        self.touched[index] = True
+
+    def set_speed(self, index, speed):
+        self._anchor(index)
+        self.speeds[index] = speed
+        self._plan(index)
+        self.touched[index] = True
+
+    def step(self, dt):
+        # Advance the clock by dt ms; returns the indices that arrived, snapped onto their targets.
+        # Cost depends on the number of arrivals, not on how many entities are under way.
+        self.now += dt
+        return self._pop_arrivals()
+
+    def next_arrival(self):
+        # Clock time of the earliest pending arrival, or None
+        heap = self._arrivals
+        while heap and heap[0][1] != self.segments[heap[0][2]]:
+            heapq.heappop(heap)  # Retargeted or released since it was queued
+        return heap[0][0] if heap else None
+
+    def _pop_arrivals(self):
+        arrived = []
+        heap = self._arrivals
+        while heap and heap[0][0] <= self.now + TIME_EPSILON:
+            arrival, segment, index = heapq.heappop(heap)
+            if segment != self.segments[index]:
+                continue  # Retargeted or released since this arrival was queued
+            self.positions[index] = self.targets[index]
+            self.starts[index] = arrival
+            self.moving[index] = False
+            arrived.append(index)
+        return np.array(arrived, dtype=np.intp)
+
+_active_system = MovementSystem()
+
+def active_system():
+    return _active_system  # System new entities register with
+
+def set_active_system(system):
+    global _active_system
+    _active_system = system
+
+class Movable:
+    # Mixin that maps position/target_position/speed onto a MovementSystem slot
+    motion = None
+    motion_index = None
+    changed = None  # Optional callback(entity) fired when the entity is moved by hand or retargeted
+    woken = None  # Optional callback(entity) for the same, used by controllers that let parked entities sleep
+
+    def attach_motion(self, position, target, speed):
+        self.motion = active_system()
+        self.motion_index = self.motion.register(position, target, speed)
+        weakref.finalize(self, self.motion.release, self.motion_index)  # Free the slot with the entity
+
+    def __setstate__(self, state):
+        # Unpickled from a snapshot: the slot lives in the restored MovementSystem, re-arm its release
+        self.__dict__.update(state)
+        if self.motion is not None:
+            weakref.finalize(self, self.motion.release, self.motion_index)
+
+    @property
+    def position(self):
+        return Vector2(*self.motion.position_of(self.motion_index))
+
+    @position.setter
+    def position(self, value):
+        self.motion.set_position(self.motion_index, value)
+        if self.changed:
+            self.changed(self)
+        if self.woken:
+            self.woken(self)
+
+    @property
+    def target_position(self):
+        return Vector2(*self.motion.targets[self.motion_index])
+
+    @target_position.setter
+    def target_position(self, value):
+        self.motion.set_target(self.motion_index, value)
+        if self.changed:
+            self.changed(self)
+        if self.woken:
+            self.woken(self)
+
+    @property
+    def speed(self):
+        return float(self.motion.speeds[self.motion_index])
+
+    @speed.setter
+    def speed(self, value):
+        self.motion.set_speed(self.motion_index, value)
+
+    @property
+    def moving(self):
+        return bool(self.motion.moving[self.motion_index])
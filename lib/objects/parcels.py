@@ -0,0 +1,153 @@
+import numpy as np
+
+CYCLES = ["ACycle", "BCycle", "NCycle"]  # Stored as an index into this list
+NOT_YET = np.nan  # Timestamp of a step the parcel hasn't reached
+
+PARCEL_DTYPE = np.dtype([
+    ("cycle", np.int8),  # Truck cycle the parcel arrived with (index into CYCLES, -1 unknown)
+    ("district", np.int16),  # Destination district id, -1 until dispatched
+    ("house", np.int32),  # Destination house (index in the district's house list), -1 until dispatched
+    ("arrived", np.float64),  # Sim seconds the truck unloaded it onto the pile
+    ("picked", np.float64),  # Courier picked it up from the pile
+    ("loaded", np.float64),  # Courier put it into a vehicle
+    ("delivered", np.float64),  # Dropped at the destination house
+])
+STAMPS = ("arrived", "picked", "loaded", "delivered")
+
+class ParcelStore:
+    # One structured-array row per parcel; a parcel's id is its row. Piles, couriers and vehicles
+    # only hold id ranges into this store, so a week of parcels costs ~40 bytes each.
+    def __init__(self, capacity=1024):
+        self.rows = np.empty(capacity, dtype=PARCEL_DTYPE)
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def __getstate__(self):
+        return {"rows": self.rows[:self.size].copy(), "size": self.size}  # Drop unused capacity from snapshots
+
+    def add(self, count, cycle=None, now=NOT_YET):
+        # New parcels get consecutive ids; returns their (start, stop) range
+        start, stop = self.size, self.size + count
+        if stop > len(self.rows):
+            grown = np.empty(max(stop, len(self.rows) * 2), dtype=PARCEL_DTYPE)
+            grown[:self.size] = self.rows[:self.size]
+            self.rows = grown
+        new = self.rows[start:stop]
+        new["cycle"] = CYCLES.index(cycle) if cycle in CYCLES else -1
+        new["district"] = -1
+        new["house"] = -1
+        for stamp in STAMPS:
+            new[stamp] = NOT_YET
+        new["arrived"] = now
+        self.size = stop
+        return start, stop
+
+    def stamp(self, field, ranges, now):
+        # Set one timestamp on every parcel in `ranges` (a ParcelRanges or list of (start, stop))
+        for start, stop in ranges:
+            self.rows[field][start:stop] = now
+
+    def assign(self, ids, district, houses):
+        self.rows["district"][ids] = district
+        self.rows["house"][ids] = houses
+
+    def deliver(self, parcel_id, now):
+        self.rows["delivered"][parcel_id] = now
+
+    def lead_times(self, start="arrived", end="delivered"):
+        # Seconds between two steps for every parcel that has reached both
+        used = self.rows[:self.size]
+        spans = used[end] - used[start]
+        return spans[~np.isnan(spans)]
+
+    def summary(self):
+        # Per-stage lead-time percentiles over all parcels so far, in sim seconds
+        result = {"parcels": self.size,
+                  "delivered": int(np.count_nonzero(~np.isnan(self.rows["delivered"][:self.size])))}
+        for start, end in zip(STAMPS, STAMPS[1:]):
+            spans = self.lead_times(start, end)
+            if spans.size:
+                p50, p90, p99 = np.percentile(spans, (50, 90, 99))
+                result[f"{start}_to_{end}"] = {"count": int(spans.size), "mean": float(spans.mean()),
+                                               "p50": float(p50), "p90": float(p90), "p99": float(p99)}
+        spans = self.lead_times()
+        if spans.size:
+            p50, p90, p99 = np.percentile(spans, (50, 90, 99))
+            result["arrived_to_delivered"] = {"count": int(spans.size), "mean": float(spans.mean()),
+                                              "p50": float(p50), "p90": float(p90), "p99": float(p99)}
+        return result
+
+    def save(self, path):
+        np.save(path, self.rows[:self.size])  # Row index = parcel id
+
+class ParcelRanges:
+    # Ordered set of parcel ids held by a pile, courier or vehicle, as (start, stop) runs.
+    # Piles only ever take from the front and append at the back, so there are usually one or two runs.
+    __slots__ = ("runs", "count")
+
+    def __init__(self):
+        self.runs = []  # [start, stop) pairs, in the order the parcels were received
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return iter(self.runs)
+
+    def __getstate__(self):
+        return self.runs, self.count
+
+    def __setstate__(self, state):
+        self.runs, self.count = state
+
+    def extend(self, start, stop):
+        if stop <= start:
+            return
+        if self.runs and self.runs[-1][1] == start:
+            self.runs[-1] = (self.runs[-1][0], stop)  # Contiguous with the last run
+        else:
+            self.runs.append((start, stop))
+        self.count += stop - start
+
+    def extend_all(self, ranges):
+        for start, stop in ranges:
+            self.extend(start, stop)
+
+    def take(self, count):
+        # Remove up to `count` parcels from the front; returns them as a list of runs
+        taken = []
+        while count > 0 and self.runs:
+            start, stop = self.runs[0]
+            step = min(count, stop - start)
+            taken.append((start, start + step))
+            if start + step == stop:
+                self.runs.pop(0)
+            else:
+                self.runs[0] = (start + step, stop)
+            count -= step
+            self.count -= step
+        return taken
+
+    def remove(self, parcel_id):
+        # Remove one specific parcel (delivery order differs from load order); splits its run
+        for i, (start, stop) in enumerate(self.runs):
+            if start <= parcel_id < stop:
+                pieces = [(a, b) for a, b in ((start, parcel_id), (parcel_id + 1, stop)) if b > a]
+                self.runs[i:i + 1] = pieces
+                self.count -= 1
+                return True
+        return False
+
+    def clear(self):
+        taken = self.runs
+        self.runs = []
+        self.count = 0
+        return taken
+
+    def ids(self):
+        if not self.runs:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([np.arange(start, stop) for start, stop in self.runs])
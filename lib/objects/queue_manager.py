@@ -1,7 +1,8 @@
 import warnings
 from enum import Enum
 from pygame.math import Vector2
-from queue import Queue, Empty, Full
+
+import eventlog
 
 
 class Directions(Enum):
@@ -12,18 +13,87 @@ class Directions(Enum):
     DOWN = Vector2(0, 1)
 
 
-def add_courier_to_queue(queue: Queue, courier):
-    try:
-        queue.put_nowait(courier)
-    except Full:
-        print("queue is full")
+class LaneSlots:
+    # Fixed-capacity ring of couriers for one lane. Single-threaded, so no locking;
+    # index 0 is the head of the line (the slot next to the pile).
+    __slots__ = ("slots", "positions", "head", "count", "freed")
+
+    def __init__(self, positions):
+        self.positions = positions  # World position of each slot, head first
+        self.slots = [None] * len(positions)
+        self.head = 0  # Ring index of the courier at the front
+        self.count = 0
+        self.freed = None  # Lowest line index vacated since the last advance()
+
+    def __len__(self):
+        return self.count
 
+    def __iter__(self):
+        capacity = len(self.slots)
+        for i in range(self.count):
+            yield self.slots[(self.head + i) % capacity]
 
-def remove_first_from_queue(queue: Queue):
-    try:
-        return queue.get_nowait()
-    except Empty:
-        print("queue is empty")
+    @property
+    def maxsize(self):
+        return len(self.slots)
+
+    def is_full(self):
+        return self.count == len(self.slots)
+
+    def peek(self):
+        return self.slots[self.head] if self.count else None
+
+    def enqueue(self, courier):
+        if self.is_full():
+            return None
+        index = self.count
+        self.slots[(self.head + index) % len(self.slots)] = courier
+        self.count += 1
+        courier.queue_index = index
+        courier.target_position = self.positions[index]  # Walk straight to the tail slot
+        return index
+
+    def pop(self):
+        if not self.count:
+            return None
+        courier = self.slots[self.head]
+        self.slots[self.head] = None
+        self.head = (self.head + 1) % len(self.slots)
+        self.count -= 1
+        courier.queue_index = None
+        self.freed = 0  # Everyone behind the old head moves up one slot
+        return courier
+
+    def remove(self, courier):
+        # Take a courier out from anywhere in the line; everyone behind closes the gap
+        capacity = len(self.slots)
+        for index in range(self.count):
+            if self.slots[(self.head + index) % capacity] is courier:
+                break
+        else:
+            return None
+        if index == 0:
+            return self.pop()
+        for i in range(index, self.count - 1):
+            self.slots[(self.head + i) % capacity] = self.slots[(self.head + i + 1) % capacity]
+        self.slots[(self.head + self.count - 1) % capacity] = None
+        self.count -= 1
+        courier.queue_index = None
+        self.freed = index if self.freed is None else min(self.freed, index)
+        return courier
+
+    def advance(self):
+        # Give couriers behind the freed slot their new index/target; nobody in front is touched
+        if self.freed is None:
+            return 0
+        capacity = len(self.slots)
+        for i in range(self.freed, self.count):
+            courier = self.slots[(self.head + i) % capacity]
+            courier.queue_index = i
+            courier.target_position = self.positions[i]
+        moved = self.count - self.freed
+        self.freed = None
+        return moved
 
 
 class QueueManager:
@@ -32,12 +102,12 @@ class QueueManager:
         self.maxsize = max_size
         self.spacing = spacing
 
-        self.queues = {direction: Queue(maxsize=0) for direction in Directions}
+        self.queues = {direction: None for direction in Directions}  # No lane until generated
         self.queue_positions = {direction: [] for direction in Directions}
 
     def generate_queue(self, direction: Directions | None):
-        self.queues[direction] = Queue(maxsize=self.maxsize)
         self.queue_positions[direction] = self.generate_positions(direction)
+        self.queues[direction] = LaneSlots(self.queue_positions[direction])
 
     def generate_positions(self, direction):
         offset = direction.value * self.spacing
@@ -47,61 +117,42 @@ class QueueManager:
         ]
 
     def get_queue(self, direction: Directions):
-        if self.queues[direction].maxsize == 0:
-            print(f"there is no queue for {direction}, try generating one!")
+        if self.queues[direction] is None:
+            eventlog.debug("queue", "No lane for {direction}", direction=direction.name)
             return None
         return self.queues[direction]
 
+    def open_lanes(self):
+        # Directions whose lane exists and still has a free tail slot
+        return [direction for direction, lane in self.queues.items() if lane is not None and not lane.is_full()]
+
     def add_courier_to_direction(self, courier, direction: Directions):
-        try:
-            queue = self.get_queue(direction)
-            if queue is not None:
-                queue.put_nowait(courier)
-
-            with queue.mutex:
-                try:
-                    index = list(queue.queue).index(courier)
-                    courier.target_position = self.queue_positions[direction][index]
-                except ValueError:
-                    warnings.warn("this courier didn't get added to the queue... shouldn't happen")
-                    return
-        except Full:
-            print("queue is full")
+        queue = self.get_queue(direction)
+        if queue is None:
+            return False
+        if queue.enqueue(courier) is None:
+            eventlog.debug("queue", "Lane {direction} is full", direction=direction.name)
+            return False
+        return True
 
     def remove_first_from_direction(self, direction: Directions):
-        try:
-            queue = self.get_queue(direction)
-            if queue is not None:
-                queue.get_nowait()
-
-            with queue.mutex:
-                try:
-                    for i, courier in enumerate(queue.queue):
-                        if courier:
-                            courier.target_position = self.queue_positions[direction][i]
-                except ValueError:
-                    warnings.warn("this courier didn't get removed")
-
-        except Empty:
-            print("no one is in this queue!")
+        queue = self.get_queue(direction)
+        if queue is None or not len(queue):
+            eventlog.debug("queue", "Lane {direction} is empty", direction=direction.name)
             return None
+        return queue.pop()
 
     def remove_courier_from_direction(self, courier, direction: Directions):
-        try:
-            queue = self.get_queue(direction)
-            if not queue:
-                return
-
-            with queue.mutex:
-                try:
-                    index = list(queue.queue).index(courier)
-                    if index == 0:
-                        self.remove_first_from_direction(direction)
-                    else:
-                        print("cannot remove courier not first in line")
-                except ValueError:
-                    warnings.warn("this courier didn't get removed")
-
-        except Empty:
-            print("queue is empty")
-            return
\ No newline at end of file
+        queue = self.get_queue(direction)
+        if queue is None:
+            return None
+        if queue.peek() is courier:
+            return self.remove_first_from_direction(direction)
+        removed = queue.remove(courier)  # Leaving from further back (e.g. dispatched mid-queue)
+        if removed is None:
+            warnings.warn("this courier didn't get removed")
+        return removed
+
+    def advance_all(self):
+        # Apply pending shifts on every lane; lanes with nothing freed cost O(1)
+        return sum(lane.advance() for lane in self.queues.values() if lane is not None)
@@ -0,0 +1,109 @@
+import math
+
+class SpatialHash:
+    # Uniform grid over the plane: each cell keeps the items whose position falls inside it,
+    # so proximity queries only look at a handful of cells instead of every item
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.cells = {}  # (cx, cy) -> list of items
+        self.positions = {}  # item -> (x, y) it was inserted at
+        self.bounds = None  # (min_cx, min_cy, max_cx, max_cy) of occupied cells, limits nearest() rings
+
+    def __len__(self):
+        return len(self.positions)
+
+    def cell_of(self, x, y):
+        return int(math.floor(x / self.cell_size)), int(math.floor(y / self.cell_size))
+
+    def insert(self, item, position):
+        x, y = float(position[0]), float(position[1])
+        if item in self.positions:
+            self.remove(item)
+        cell = self.cell_of(x, y)
+        self.cells.setdefault(cell, []).append(item)
+        self.positions[item] = (x, y)
+        if self.bounds is None:
+            self.bounds = (cell[0], cell[1], cell[0], cell[1])
+        else:
+            min_cx, min_cy, max_cx, max_cy = self.bounds
+            self.bounds = (min(min_cx, cell[0]), min(min_cy, cell[1]), max(max_cx, cell[0]), max(max_cy, cell[1]))
+
+    def remove(self, item):
+        x, y = self.positions.pop(item)
+        cell = self.cell_of(x, y)
+        bucket = self.cells[cell]
+        bucket.remove(item)
+        if not bucket:
+            del self.cells[cell]  # Bounds stay as they are; they only have to be an upper limit
+
+    def clear(self):
+        self.cells.clear()
+        self.positions.clear()
+        self.bounds = None
+
+    def in_rect(self, rect):
+        # Items inside an axis-aligned rectangle (left, top, width, height), e.g. the viewport
+        left, top, width, height = rect
+        right, bottom = left + width, top + height
+        min_cx, min_cy = self.cell_of(left, top)
+        max_cx, max_cy = self.cell_of(right, bottom)
+        result = []
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                for item in self.cells.get((cx, cy), ()):
+                    x, y = self.positions[item]
+                    if left <= x < right and top <= y < bottom:
+                        result.append(item)
+        return result
+
+    def within_radius(self, point, radius):
+        # Items no further than `radius` from `point`
+        px, py = point[0], point[1]
+        min_cx, min_cy = self.cell_of(px - radius, py - radius)
+        max_cx, max_cy = self.cell_of(px + radius, py + radius)
+        limit = radius * radius
+        result = []
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                for item in self.cells.get((cx, cy), ()):
+                    x, y = self.positions[item]
+                    if (x - px) ** 2 + (y - py) ** 2 <= limit:
+                        result.append(item)
+        return result
+
+    def nearest(self, point, predicate=None, max_radius=None):
+        # Closest item to `point` (optionally the closest one passing `predicate`), or None.
+        # Searches square rings of cells outwards and stops once no unseen cell can be closer.
+        if self.bounds is None:
+            return None
+        px, py = point[0], point[1]
+        ox, oy = self.cell_of(px, py)
+        min_cx, min_cy, max_cx, max_cy = self.bounds
+        max_ring = max(abs(ox - min_cx), abs(ox - max_cx), abs(oy - min_cy), abs(oy - max_cy))
+        if max_radius is not None:
+            max_ring = min(max_ring, int(math.ceil(max_radius / self.cell_size)))
+        best, best_dist = None, math.inf if max_radius is None else max_radius * max_radius
+        for ring in range(max_ring + 1):
+            # Every cell in this ring is at least (ring - 1) cells away from the point
+            reach = (ring - 1) * self.cell_size
+            if ring > 0 and reach > 0 and reach * reach > best_dist:
+                break
+            for cx, cy in self._ring(ox, oy, ring):
+                for item in self.cells.get((cx, cy), ()):
+                    x, y = self.positions[item]
+                    dist = (x - px) ** 2 + (y - py) ** 2
+                    if dist <= best_dist and (predicate is None or predicate(item)):
+                        best, best_dist = item, dist
+        return best
+
+    @staticmethod
+    def _ring(ox, oy, ring):
+        if ring == 0:
+            yield ox, oy
+            return
+        for cx in range(ox - ring, ox + ring + 1):
+            yield cx, oy - ring
+            yield cx, oy + ring
+        for cy in range(oy - ring + 1, oy + ring):
+            yield ox - ring, cy
+            yield ox + ring, cy
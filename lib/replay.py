@@ -0,0 +1,400 @@
+import os
+import sys
+
+import numpy as np
+from pygame.math import Vector2
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "objects"))
+import loadimage
+from motion import MovementSystem
+from parcels import ParcelRanges
+from objects.courier import Courier
+from objects.van import Van
+from objects.car import Car
+from objects.truck import Truck
+from objects.box import BoxPile
+from objects.house import House
+from simctrl.simctrl import SceneManager, SimulationClock
+from scenes import sortingarea_scene, carpark_scene, citydistrict_scene
+
+TRACE_VERSION = 2  # 2: courier statuses
+KEYFRAME_INTERVAL = 600  # Ticks between full-state records; seeking replays at most this many ticks of deltas
+
+# Which scene list a member belongs to
+COURIERS, VANS, CARS, TRUCK = range(4)
+STAFF, SUBCON = 0, 1  # Courier sprite kinds
+
+MOTION_DTYPE = np.dtype([("tick", np.int32), ("slot", np.int32), ("x", np.float32), ("y", np.float32),
+                         ("tx", np.float32), ("ty", np.float32), ("speed", np.float32)])
+MEMBERS_DTYPE = np.dtype([("tick", np.int32), ("role", np.int8), ("offset", np.int32), ("count", np.int32)])
+ENTRY_DTYPE = np.dtype([("slot", np.int32), ("kind", np.int8)])
+LABEL_DTYPE = np.dtype([("tick", np.int32), ("slot", np.int32), ("value", np.int16)])
+STATUS_DTYPE = np.dtype([("tick", np.int32), ("slot", np.int32), ("status", np.int16)])  # Index into status_names
+PILE_DTYPE = np.dtype([("tick", np.int32), ("x", np.float32), ("y", np.float32), ("count", np.int32)])  # count -1 = no pile
+LAYOUT_DTYPE = np.dtype([("tick", np.int32), ("district", np.int16), ("offset", np.int32), ("count", np.int32)])
+
+class TraceRecorder:
+    # Appends what changed on screen each tick: motion segments (position, target, speed) of entities that were
+    # moved or retargeted, which entities each scene shows, their count labels, courier statuses, the box pile and
+    # district layouts.
+    # Moving entities travel in straight lines at constant speed, so nothing is stored while they are under way.
+    def __init__(self, engine, keyframe_interval=KEYFRAME_INTERVAL):
+        self.engine = engine
+        self.keyframe_interval = keyframe_interval
+        self.dt = []  # Ms the MovementSystem advanced by each tick
+        self.elapsed = []  # Sim seconds at the end of each tick
+        self.motion = []  # MOTION_DTYPE chunks
+        self.members, self.entries = [], []
+        self.labels = []
+        self.statuses = []  # STATUS_DTYPE rows
+        self.status_names = []  # Courier status strings in order of first appearance
+        self.pile = []
+        self.layouts, self.houses, self.occupied = [], [], []
+        self.last_members = {}
+        self.last_labels = {}
+        self.last_status = {}
+        self.status_codes = {}  # Status string -> index into status_names
+        self.last_pile = None
+        self.layout_versions = {}
+        self.entry_count = 0
+        self.house_count = 0
+        engine.movement.touched[:] = False
+
+    @property
+    def ticks(self):
+        return len(self.dt)
+
+    def capture(self, dt):
+        # Call once at the end of every engine tick
+        engine = self.engine
+        tick = len(self.dt)
+        keyframe = tick % self.keyframe_interval == 0
+        self.dt.append(dt)
+        self.elapsed.append(engine.sim_clock.elapsed)
+
+        movement = engine.movement
+        size = movement.size
+        slots = np.flatnonzero(movement.in_use[:size] if keyframe else movement.touched[:size] & movement.in_use[:size])
+        movement.touched[:size] = False
+        if slots.size:
+            chunk = np.empty(slots.size, dtype=MOTION_DTYPE)
+            chunk["tick"] = tick
+            chunk["slot"] = slots
+            positions = movement.current_positions(slots)
+            chunk["x"], chunk["y"] = positions[:, 0], positions[:, 1]
+            chunk["tx"], chunk["ty"] = movement.targets[slots, 0], movement.targets[slots, 1]
+            chunk["speed"] = movement.speeds[slots]
+            self.motion.append(chunk)
+
+        sorting, carpark = engine.sorting_area, engine.carpark
+        truck = sorting.truck
+        roles = (
+            (COURIERS, sorting.couriers),
+            (VANS, carpark.vans),
+            (CARS, carpark.cars),
+            (TRUCK, [truck] if truck is not None and not truck.despawned else []),
+        )
+        for role, entities in roles:
+            entries = tuple((entity.motion_index, SUBCON if getattr(entity, "type", None) == "Courier_Subcon" else STAFF)
+                            for entity in entities)
+            if keyframe or entries != self.last_members.get(role):
+                self.last_members[role] = entries
+                self.members.append((tick, role, self.entry_count, len(entries)))
+                self.entries.extend(entries)
+                self.entry_count += len(entries)
+            for entity in entities:
+                value = self._label(role, entity)
+                slot = entity.motion_index
+                if keyframe or self.last_labels.get(slot) != value:
+                    self.last_labels[slot] = value
+                    self.labels.append((tick, slot, value))
+                if role == COURIERS:
+                    status = self._status_code(entity.status)
+                    if keyframe or self.last_status.get(slot) != status:
+                        self.last_status[slot] = status
+                        self.statuses.append((tick, slot, status))
+
+        pile = sorting.box_pile
+        state = (pile.position.x, pile.position.y, pile.count) if pile is not None else None
+        if keyframe or state != self.last_pile:
+            self.last_pile = state
+            self.pile.append((tick,) + (state if state is not None else (0.0, 0.0, -1)))
+
+        for district in engine.districts:
+            if self.layout_versions.get(district.district_id) != district.layout_version:
+                self.layout_versions[district.district_id] = district.layout_version
+                self.layouts.append((tick, district.district_id, self.house_count, len(district.houses)))
+                for house in district.houses:
+                    position = house.position
+                    self.houses.append((position.x, position.y) if position is not None else (np.nan, np.nan))
+                    self.occupied.append(house.occupied)
+                self.house_count += len(district.houses)
+
+    def _status_code(self, status):
+        code = self.status_codes.get(status)
+        if code is None:
+            code = self.status_codes[status] = len(self.status_names)
+            self.status_names.append(status)
+        return code
+
+    @staticmethod
+    def _label(role, entity):
+        if role == COURIERS:
+            return entity.carrying
+        if role == TRUCK:
+            return int(entity.arrived and not entity.departing)  # Box drawn on the docked truck
+        return entity.box_load
+
+    def arrays(self):
+        return {
+            "version": np.array(TRACE_VERSION),
+            "keyframe_interval": np.array(self.keyframe_interval),
+            "dt": np.array(self.dt, dtype=np.float32),
+            "elapsed": np.array(self.elapsed, dtype=np.float64),
+            "motion": np.concatenate(self.motion) if self.motion else np.empty(0, dtype=MOTION_DTYPE),
+            "members": np.array(self.members, dtype=MEMBERS_DTYPE),
+            "entries": np.array(self.entries, dtype=ENTRY_DTYPE),
+            "labels": np.array(self.labels, dtype=LABEL_DTYPE),
+            "statuses": np.array(self.statuses, dtype=STATUS_DTYPE),
+            "status_names": np.array(self.status_names, dtype=str),
+            "pile": np.array(self.pile, dtype=PILE_DTYPE),
+            "layouts": np.array(self.layouts, dtype=LAYOUT_DTYPE),
+            "houses": np.array(self.houses, dtype=np.float32).reshape(-1, 2),
+            "occupied": np.array(self.occupied, dtype=bool),
+        }
+
+    def save(self, path):
+        # Compressed .npz; returns the file size in bytes
+        with open(path, "wb") as f:
+            np.savez_compressed(f, **self.arrays())
+            return f.tell()
+
+def load_trace(path):
+    with np.load(path) as data:
+        trace = {name: data[name] for name in data.files}
+    if int(trace["version"]) != TRACE_VERSION:
+        raise ValueError(f"Unsupported trace version {int(trace['version'])}")
+    return trace
+
+class TracePlayer:
+    # Redraws a recorded run through the real scenes without any controllers: entities are stand-ins of the
+    # original classes whose positions are interpolated from the recorded motion segments
+    def __init__(self, trace):
+        self.trace = trace
+        self.keyframe_interval = int(trace["keyframe_interval"])
+        self.end_ms = np.cumsum(trace["dt"], dtype=np.float64)  # Movement time at the end of each tick
+        self.elapsed = trace["elapsed"]
+        self.tick = -1
+
+        slots = int(trace["motion"]["slot"].max()) + 1 if len(trace["motion"]) else 1
+        self.movement = MovementSystem(capacity=slots)
+        self.movement.size = slots
+        self.movement.in_use[:] = True
+        self.seg_tick = np.zeros(slots, dtype=np.int64)
+        self.seg_start = np.zeros((slots, 2))
+        self.seg_target = np.zeros((slots, 2))
+        self.seg_speed = np.zeros(slots)
+        self.labels = {}
+        self.statuses = {}  # Slot -> index into status_names
+        self.status_names = trace["status_names"].tolist()
+        self.proxies = {}  # (role, slot, kind) -> stand-in entity
+        self.layout_rows = {}  # District id -> index of the layout record currently shown
+
+        self.carpark = carpark_scene.CarparkScene()
+        self.sorting_area = sortingarea_scene.SortingAreaScene(self.carpark)
+        self.districts = {}
+        self.scene_manager = SceneManager()
+        self.scene_manager.add_scene("SortingArea", self.sorting_area)
+        self.scene_manager.add_scene("Carpark", self.carpark)
+        for district_id in sorted(set(trace["layouts"]["district"].tolist())):
+            district = citydistrict_scene.CityDistrictScene(district_id)
+            self.districts[district_id] = district
+            self.scene_manager.add_scene(district.name, district)
+        self.clock = SimulationClock()  # Only used to format the replayed time
+        self.seek(0)
+
+    def __len__(self):
+        return len(self.elapsed)
+
+    @property
+    def sim_elapsed(self):
+        return float(self.elapsed[self.tick])
+
+    def time_str(self):
+        self.clock.elapsed = self.sim_elapsed
+        return self.clock.get_time_str()
+
+    def seek(self, tick):
+        # Jump to any tick: restore the keyframe at or before it, then apply the deltas up to it
+        tick = max(0, min(int(tick), len(self) - 1))
+        keyframe = tick - tick % self.keyframe_interval
+        self.labels.clear()
+        self.statuses.clear()
+        self._apply(keyframe, tick)
+        self.tick = tick
+        self._update_positions()
+
+    def seek_time(self, sim_seconds):
+        self.seek(np.searchsorted(self.elapsed, sim_seconds, side="left"))
+
+    def advance(self, ticks=1):
+        # Play forward; long jumps go through the nearest keyframe instead of every delta on the way
+        target = min(self.tick + int(ticks), len(self) - 1)
+        if target <= self.tick:
+            return False
+        if target - self.tick > self.keyframe_interval:
+            self.seek(target)
+        else:
+            self._apply(self.tick + 1, target)
+            self.tick = target
+            self._update_positions()
+        return True
+
+    def render(self, screen):
+        return self.scene_manager.render(screen)
+
+    @staticmethod
+    def _span(records, first, last):
+        ticks = records["tick"]
+        return records[np.searchsorted(ticks, first, side="left"):np.searchsorted(ticks, last, side="right")]
+
+    def _apply(self, first, last):
+        trace = self.trace
+        motion = self._span(trace["motion"], first, last)
+        if len(motion):
+            # Only the newest segment per slot matters
+            reversed_slots = motion["slot"][::-1]
+            _, newest = np.unique(reversed_slots, return_index=True)
+            rows = motion[len(motion) - 1 - newest]
+            slots = rows["slot"]
+            self.seg_tick[slots] = rows["tick"]
+            self.seg_start[slots, 0], self.seg_start[slots, 1] = rows["x"], rows["y"]
+            self.seg_target[slots, 0], self.seg_target[slots, 1] = rows["tx"], rows["ty"]
+            self.seg_speed[slots] = rows["speed"]
+            self.carpark.invalidate()  # A parked vehicle may have been moved
+
+        labels = self._span(trace["labels"], first, last)
+        if len(labels):
+            self.labels.update(zip(labels["slot"].tolist(), labels["value"].tolist()))
+        statuses = self._span(trace["statuses"], first, last)
+        if len(statuses):
+            self.statuses.update(zip(statuses["slot"].tolist(), statuses["status"].tolist()))
+
+        members = self._span(trace["members"], first, last)
+        latest = {}
+        for row in members:
+            latest[int(row["role"])] = row
+        for role, row in latest.items():
+            entries = trace["entries"][row["offset"]:row["offset"] + row["count"]]
+            self._set_members(role, [self._proxy(role, int(slot), int(kind)) for slot, kind in entries.tolist()])
+
+        pile = self._span(trace["pile"], first, last)
+        if len(pile):
+            row = pile[-1]
+            if row["count"] < 0:
+                self.sorting_area.box_pile = None
+            else:
+                box_pile = self.sorting_area.box_pile or self._new(BoxPile)
+                box_pile.position = Vector2(float(row["x"]), float(row["y"]))
+                box_pile.parcels.count = int(row["count"])
+                self.sorting_area.box_pile = box_pile
+
+        self._apply_labels()
+        self._apply_layouts(last)
+
+    def _apply_labels(self):
+        for vehicle in self.carpark.vans + self.carpark.cars:
+            value = self.labels.get(vehicle.motion_index, 0)
+            if vehicle.parcels.count != value:
+                vehicle.parcels.count = value
+                self.carpark.invalidate()  # Parked vehicles live in the static layer
+        for courier in self.sorting_area.couriers:
+            courier.parcels.count = self.labels.get(courier.motion_index, 0)
+            status = self.statuses.get(courier.motion_index)
+            courier.status = self.status_names[status] if status is not None else None
+        truck = self.sorting_area.truck
+        if truck is not None:
+            truck.arrived = bool(self.labels.get(truck.motion_index, 0))
+            truck.departing = False
+
+    def _apply_layouts(self, tick):
+        layouts = self.trace["layouts"]
+        for district_id, district in self.districts.items():
+            rows = np.flatnonzero((layouts["district"] == district_id) & (layouts["tick"] <= tick))
+            row = int(rows[-1]) if rows.size else None
+            if row == self.layout_rows.get(district_id):
+                continue
+            self.layout_rows[district_id] = row
+            district.houses = []
+            if row is not None:
+                start, count = int(layouts[row]["offset"]), int(layouts[row]["count"])
+                for (x, y), occupied in zip(self.trace["houses"][start:start + count].tolist(),
+                                            self.trace["occupied"][start:start + count].tolist()):
+                    house = self._new(House)
+                    house.position = None if np.isnan(x) else Vector2(x, y)
+                    house.image = loadimage.load_image("house.png", (18, 18))
+                    house._occupied = occupied
+                    district.houses.append(house)
+            district.index_houses()
+
+    def _set_members(self, role, proxies):
+        if role == COURIERS:
+            self.sorting_area.couriers = proxies
+        elif role == VANS:
+            self.carpark.vans = proxies
+            self.carpark.invalidate()
+        elif role == CARS:
+            self.carpark.cars = proxies
+            self.carpark.invalidate()
+        else:
+            self.sorting_area.truck = proxies[0] if proxies else None
+
+    @staticmethod
+    def _new(cls):
+        # Stand-in of an entity class: skips __init__ (no spawning, registration or timers), keeps draw_commands
+        entity = cls.__new__(cls)
+        entity.parcels = ParcelRanges()
+        return entity
+
+    def _proxy(self, role, slot, kind):
+        key = (role, slot, kind)
+        entity = self.proxies.get(key)
+        if entity is None:
+            if role == COURIERS:
+                entity = self._new(Courier)
+                entity.type = "Courier_Subcon" if kind == SUBCON else "Courier_Staff"
+                entity.image = loadimage.load_image("courier_subcon.png" if kind == SUBCON else "courier_staff.png", (18, 18))
+            elif role == VANS:
+                entity = self._new(Van)
+                entity.image = loadimage.load_image("van.png", (18, 12))
+            elif role == CARS:
+                entity = self._new(Car)
+                entity.image = loadimage.load_image("car.png", (12, 9))
+            else:
+                entity = self._new(Truck)
+                entity.image = loadimage.load_image("truck.png", (96, 48))
+                entity.arrived = entity.departing = False
+            entity.motion = self.movement
+            entity.motion_index = slot
+            self.proxies[key] = entity
+        return entity
+
+    def _update_positions(self):
+        # Load the recorded segments into the MovementSystem; the stand-ins interpolate from there when drawn
+        movement = self.movement
+        was_moving = movement.moving.copy()
+        movement.now = self.end_ms[self.tick]
+        movement.positions[:] = self.seg_start
+        movement.targets[:] = self.seg_target
+        movement.starts[:] = self.end_ms[self.seg_tick]
+        delta = self.seg_target - self.seg_start
+        dist = np.hypot(delta[:, 0], delta[:, 1])
+        duration = np.full_like(dist, np.inf)
+        np.divide(dist * 1000.0, self.seg_speed, out=duration, where=self.seg_speed > 0)
+        duration[dist == 0] = 0.0
+        movement.arrivals[:] = movement.starts + duration
+        movement.moving[:] = movement.arrivals > movement.now
+        arrived = ~movement.moving
+        movement.positions[arrived] = movement.targets[arrived]
+        if (was_moving != movement.moving).any():
+            self.carpark.invalidate()  # A vehicle parked or set off
@@ -3,8 +3,57 @@ import sys
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+import pygame
+
 SCREEN_WIDTH, SCREEN_HEIGHT = 1280, 720
+MAX_DIRTY_RECTS = 120  # Above this many sprite rects a full redraw is cheaper than per-rect restores
 class BaseScene:
+    update_policy = "every_frame"  # "every_frame", "fixed_hz" or "dormant" (see SceneManager.update_all)
+    update_hz = 0  # Update rate for the "fixed_hz" policy
+    static_layer = None  # Pre-composited background plus everything that isn't moving
+    static_dirty = True  # Rebuild static_layer on the next render
+    sprite_rects = ()  # Screen rects the dynamic pass drew last frame (erased before redrawing)
+
     def handle_event(self, event): pass  # Placeholder: to be overridden in derived scenes
     def update(self, dt, clock): pass  # Placeholder: updates scene logic each frame
-    def render(self, screen): pass  # Placeholder: draws scene visuals each frame
\ No newline at end of file
+    def draw_static(self, surface): pass  # Placeholder: draws the cached background layer
+    def draw_dynamic(self, screen): return []  # Placeholder: draws moving things, returns the rects touched
+
+    def __getstate__(self):
+        # Snapshots leave out the render caches; the static layer is rebuilt on the next render
+        state = self.__dict__.copy()
+        state.pop("static_layer", None)
+        state.pop("sprite_rects", None)
+        state["static_dirty"] = True
+        return state
+
+    def invalidate(self, *args):
+        self.static_dirty = True  # Something in the static layer changed (accepts callback args)
+
+    def render(self, screen):
+        # Draws the scene; returns the changed screen rects, or None if the whole screen was redrawn
+        if self.static_dirty or self.static_layer is None or self.static_layer.get_size() != screen.get_size():
+            if self.static_layer is None or self.static_layer.get_size() != screen.get_size():
+                self.static_layer = pygame.Surface(screen.get_size())
+            self.static_dirty = False
+            self.draw_static(self.static_layer)
+            screen.blit(self.static_layer, (0, 0))
+            self.sprite_rects = self.draw_dynamic(screen)
+            return None
+
+        if len(self.sprite_rects) > MAX_DIRTY_RECTS:
+            # Crowded scene: one full-layer blit beats hundreds of small restores
+            screen.blit(self.static_layer, (0, 0))
+            self.sprite_rects = self.draw_dynamic(screen)
+            return None
+
+        for rect in self.sprite_rects:
+            self.restore(screen, rect)  # Erase last frame's sprites from the static layer
+        rects = self.draw_dynamic(screen)
+        dirty = list(self.sprite_rects) + rects
+        self.sprite_rects = rects
+        return dirty
+
+    def restore(self, screen, rect):
+        if self.static_layer is not None:
+            screen.blit(self.static_layer, rect, rect)  # Copy the cached background back under `rect`
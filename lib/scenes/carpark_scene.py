@@ -4,6 +4,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from base_scene import BaseScene
 import pygame
+from fonts import render_text  # Shared label cache
 
 SCREEN_WIDTH, SCREEN_HEIGHT = 1280, 720
 class CarparkScene(BaseScene):  # Inherits from BaseScene
@@ -14,6 +15,7 @@ class CarparkScene(BaseScene):  # Inherits from BaseScene
         self.vans = []  # List to store van objects
         self.cars = []  # List to store car objects
         self.spawned_today = False  # Tracks if today's vehicles have been spawned
+        self.movers = []  # Vehicles drawn every frame; parked ones live in the static layer
 
     def receive_courier(self, courier):
         courier.status = "Entering"
@@ -22,22 +24,29 @@ class CarparkScene(BaseScene):  # Inherits from BaseScene
         courier.grid_assigned = False
         self.vans.append(courier)  # Or: self.couriers.append() if you track separately
 
-    def update(self, dt, sim_clock):
-        # Update vehicle positions and states
-        for van in self.vans:
-            van.update(dt)
-        for car in self.cars:
-            car.update(dt)
+    def render(self, screen):
+        if any(not vehicle.moving for vehicle in self.movers):
+            self.invalidate()  # Someone parked since the layer was built
+        return super().render(screen)
 
-    def render(self, screen):  # Draws everything on this scene
-        screen.fill(self.bg_color)  # Fill background with carpark color
-        pygame.draw.rect(screen, (0, 0, 0), self.door_to_sorting_rect)  # Black portal to SortingArea
-        door_font = pygame.font.SysFont("Arial", 20)
-        door_label = door_font.render("TO SORTING", True, (255, 255, 255))
-        screen.blit(door_label, (self.door_to_sorting_rect.x - 40, self.door_to_sorting_rect.y - 24))
+    def draw_static(self, surface):  # Background, door and every parked vehicle
+        surface.fill(self.bg_color)  # Fill background with carpark color
+        pygame.draw.rect(surface, (0, 0, 0), self.door_to_sorting_rect)  # Black portal to SortingArea
+        door_label = render_text("TO SORTING", 20)
+        surface.blit(door_label, (self.door_to_sorting_rect.x - 40, self.door_to_sorting_rect.y - 24))
 
-        for van in self.vans:  # Draw each van
-            van.render(screen)
+        self.movers = []
+        commands = []
+        for vehicle in self.vans + self.cars:
+            vehicle.changed = self.invalidate  # Leaving or loading a box changes the layer
+            if vehicle.moving:
+                self.movers.append(vehicle)
+            else:
+                commands += vehicle.draw_commands()
+        surface.blits(commands, doreturn=False)  # Every parked vehicle in one call
 
-        for car in self.cars:  # Draw each car
-            car.render(screen)
\ No newline at end of file
+    def draw_dynamic(self, screen):  # Only vehicles still driving
+        commands = []
+        for vehicle in self.movers:
+            commands += vehicle.draw_commands()
+        return screen.blits(commands)
@@ -2,20 +2,98 @@ from base_scene import BaseScene
 import pygame
 from objects.house import House  # Importing House class for house objects
 from simctrl.simctrl import HouseController  # Importing HouseController for managing houses
+from objects.spatial import SpatialHash  # Grid index for house proximity queries
 
 SCREEN_WIDTH, SCREEN_HEIGHT = 1280, 720
+HOUSE_SIZE = 18  # House sprite is 18x18, drawn with its top-left at house.position
+INDEX_CELL_SIZE = 64  # A few houses per cell at the spawner's spacing
 class CityDistrictScene(BaseScene):  # Inherits from BaseScene
+    update_policy = "dormant"  # Nothing happens here until it's viewed or a vehicle is dispatched in
     def __init__(self, district_id):  # Accepts unique district identifier (e.g. 1, 2, 3)
         self.bg_color = (80, 60, 60)  # Background color (dark reddish-brown)
         self.name = f"City_District{district_id}"  # Generate name like "City_District1"
         self.district_id = district_id  # Store the district ID for potential logic use
         self.houses = [] 
+        self.house_index = SpatialHash(INDEX_CELL_SIZE)  # Houses by position; rebuilt by index_houses()
+        self.layout_version = 0  # Bumped whenever houses are re-laid out (route planner cache key)
+        self.selected_house = None  # Last house clicked on
         self.house_controller = HouseController(self)
 
+    def index_houses(self):
+        # Call after (re)laying out self.houses
+        self.house_index.clear()
+        self.layout_version += 1
+        for house_id, house in enumerate(self.houses):
+            house.house_id = house_id  # Parcel destinations refer to houses by this index
+            if house.position is not None:
+                self.house_index.insert(house, house.position)
+        self.invalidate()
+
+    def nearest_house(self, point, vacant_only=False):
+        predicate = (lambda house: not house.occupied) if vacant_only else None
+        return self.house_index.nearest(point, predicate)
+
+    def houses_within(self, point, radius):
+        return self.house_index.within_radius(point, radius)
+
+    def visible_houses(self, rect):
+        # Houses whose sprite overlaps `rect`; positions are top-left corners, so widen by a sprite
+        left, top, width, height = rect
+        return self.house_index.in_rect((left - HOUSE_SIZE, top - HOUSE_SIZE, width + HOUSE_SIZE, height + HOUSE_SIZE))
+
+    def house_at(self, point):
+        # Hit-test: the house whose sprite contains `point`, if any
+        for house in self.house_index.within_radius((point[0] - HOUSE_SIZE / 2, point[1] - HOUSE_SIZE / 2), HOUSE_SIZE):
+            if pygame.Rect(house.position.x, house.position.y, HOUSE_SIZE, HOUSE_SIZE).collidepoint(point):
+                return house
+        return None
+
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            self.selected_house = self.house_at(event.pos)
+
     def update(self, dt, clock):
         self.house_controller.update(dt, clock)
 
-    def render(self, screen):  # Draw the scene visuals
-        screen.fill(self.bg_color)  # Fill with the district's color
-        for house in self.houses:
-            house.render(screen)
+    def draw_static(self, surface):  # Houses never move, so the whole district is one cached layer
+        surface.fill(self.bg_color)  # Fill with the district's color
+        commands = []
+        for house in self.visible_houses(surface.get_rect()):  # Cull houses outside the layer
+            house.changed = self.invalidate  # Occupancy flips rebuild the layer
+            commands += house.draw_commands()
+        surface.blits(commands, doreturn=False)  # All houses in one call
+
+    def draw_dynamic(self, screen):
+        if self.selected_house is None:
+            return []
+        position = self.selected_house.position
+        return [pygame.draw.rect(screen, (255, 220, 0), (position.x - 2, position.y - 2, HOUSE_SIZE + 4, HOUSE_SIZE + 4), 2)]
+
+class CityDistricts:
+    # The city's district scenes, indexed 0..count-1 like a list (district ids are 1..count). A district's scene,
+    # houses and state only come into existence the first time it is indexed: when a vehicle is dispatched
+    # there or an operator opens it. Iterating yields only the districts created so far.
+    def __init__(self, count, scene_manager=None):
+        self.count = count
+        self.scene_manager = scene_manager  # New districts are registered here as scenes
+        self.scenes = {}  # district_id -> CityDistrictScene, in order of creation
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        return self.get(index + 1)
+
+    def get(self, district_id):
+        scene = self.scenes.get(district_id)
+        if scene is None:
+            scene = CityDistrictScene(district_id)
+            self.scenes[district_id] = scene
+            if self.scene_manager is not None:
+                self.scene_manager.add_scene(scene.name, scene)
+        return scene
+
+    def __iter__(self):
+        return iter(list(self.scenes.values()))
@@ -1,14 +1,54 @@
 from base_scene import BaseScene
 import pygame
+from fonts import render_text, get_font  # Shared label cache
 
 SCREEN_WIDTH, SCREEN_HEIGHT = 1280, 720
 class StatisticsScene(BaseScene):  # Inherits from BaseScene to follow the same scene interface
-    def __init__(self):
+    update_policy = "fixed_hz"  # Readouts only need refreshing a few times a second
+    update_hz = 4
+    def __init__(self, profiler=None, counts=None, metrics=None):
         self.bg_color = (20, 20, 20)  # Very dark background (almost black) for contrast
         self.name = "Statistics"  # Scene name used for rendering and identification
+        self.profiler = profiler  # FrameProfiler with per-stage timings
+        self.counts = counts  # Callable returning {label: entity count}
+        self.metrics = metrics  # MetricsAggregator with the running KPIs
+        self.lines = []  # Rendered readout surfaces, refreshed in update()
 
-    def render(self, screen):  # Draw method for this scene
-        screen.fill(self.bg_color)  # Fill the entire screen with the background color
-        font = pygame.font.SysFont("Arial", 48)  # Create a font object for drawing text
-        label = font.render(self.name, True, (255, 255, 255))  # Render the scene name in white
-        screen.blit(label, (50, 50))  # Draw the label at position (50, 50) on screen
\ No newline at end of file
+    def __getstate__(self):
+        state = super().__getstate__()
+        state["lines"] = []  # Rendered text is refreshed on the next update
+        return state
+
+    def update(self, dt, clock):
+        font = get_font("Consolas", 18)
+        if font is None:
+            return  # Headless: nothing to show
+        text = [f"{'stage':<20}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}"]
+        if self.profiler:
+            for stage, stat in self.profiler.stats().items():
+                text.append(f"{stage:<20}{stat['p50']:>10.2f}{stat['p95']:>10.2f}{stat['max']:>10.2f}")
+            text.append("")
+            text.append(f"cProfile capture: {'ON' if self.profiler.capturing else 'off'} (F9 to toggle)")
+        if self.counts:
+            text.append("")
+            text += [f"{label:<20}{value:>10}" for label, value in self.counts().items()]
+        if self.metrics:
+            text.append("")
+            text += self.metrics.summary_lines()
+        # Readouts change every refresh, so render them directly rather than through the label cache
+        self.lines = [font.render(line, True, (220, 220, 220)) for line in text]
+
+    def draw_static(self, surface):  # Draw method for this scene
+        surface.fill(self.bg_color)  # Fill the entire screen with the background color
+        label = render_text(self.name, 48)  # Render the scene name in white (cached after the first frame)
+        surface.blit(label, (50, 50))  # Draw the label at position (50, 50) on screen
+
+    def draw_dynamic(self, screen):
+        if not self.lines:
+            return []
+        # Clear the whole readout block so shorter lines don't leave old digits behind
+        width = max(line.get_width() for line in self.lines)
+        block = pygame.Rect(50, 120, width, 22 * len(self.lines))
+        self.restore(screen, block)
+        screen.blits([(line, (50, 120 + 22 * i)) for i, line in enumerate(self.lines)], doreturn=False)
+        return [block]
@@ -6,6 +6,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from base_scene import BaseScene
 import pygame
 from pygame.math import Vector2
+from fonts import render_text  # Shared label cache
 
 SCREEN_WIDTH, SCREEN_HEIGHT = 1280, 720
 class SortingAreaScene(BaseScene):
@@ -14,7 +15,6 @@ class SortingAreaScene(BaseScene):
         self.bg_color = (60, 70, 90)  # Background color for the canvas
         self.name = "SortingArea"  # Scene identifier
         self.couriers = []  # List of couriers in this scene
-        self.boxes = []  # List of boxes currently in the sorting area
         self.truck = None
         self.box_pile = None
         self.spawned_today = False  # Tracks whether couriers have been spawned today
@@ -53,6 +53,23 @@ class SortingAreaScene(BaseScene):
 
 
 
+    def stream_pending(self, dt):
+        # Let waiting couriers in one per interval. Staff and subcons share this queue, so the engine advances it
+        # once per tick rather than each courier controller doing so
+        self.courier_spawn_timer += dt
+        # A long tick can cover several spawn intervals; let every courier due within it in
+        while self.pending_couriers and self.courier_spawn_timer >= self.courier_spawn_interval:
+            self.couriers.append(self.pending_couriers.pop(0))
+            self.courier_spawn_timer -= self.courier_spawn_interval
+        if not self.pending_couriers:
+            self.courier_spawn_timer = min(self.courier_spawn_timer, self.courier_spawn_interval)  # Next arrival enters at once
+
+    def entry_due_in(self):
+        # Timer ms until stream_pending lets the next waiting courier in, or None if nobody is waiting
+        if not self.pending_couriers:
+            return None
+        return max(0.0, self.courier_spawn_interval - self.courier_spawn_timer)
+
     def receive_courier(self, courier):
         courier.status = "Entering"
         courier.position = pygame.Vector2(SCREEN_WIDTH - 100, SCREEN_HEIGHT // 2)  # Spawn from right edge
@@ -60,20 +77,21 @@ class SortingAreaScene(BaseScene):
         courier.grid_assigned = False
         self.couriers.append(courier)
 
-    def render(self, screen):
-        screen.fill(self.bg_color)  # Fill background
+    def draw_static(self, surface):
+        surface.fill(self.bg_color)  # Fill background
         # Draw door rectangle
-        pygame.draw.rect(screen, (0, 0, 0), self.door_to_carpark_rect)  # Black portal
+        pygame.draw.rect(surface, (0, 0, 0), self.door_to_carpark_rect)  # Black portal
 
         # Label for the door
-        door_font = pygame.font.SysFont("Arial", 20)
-        door_label = door_font.render("TO CARPARK", True, (0, 0, 0))
-        screen.blit(door_label, (self.door_to_carpark_rect.x - 20, self.door_to_carpark_rect.y - 24))
+        door_label = render_text("TO CARPARK", 20, (0, 0, 0))
+        surface.blit(door_label, (self.door_to_carpark_rect.x - 20, self.door_to_carpark_rect.y - 24))
 
+    def draw_dynamic(self, screen):
+        commands = []
         for c in self.couriers:
-            c.render(screen)  # Draw each courier
+            commands += c.draw_commands()  # Each courier and its label
         if self.truck:
-            self.truck.render(screen)
+            commands += self.truck.draw_commands()
         if self.box_pile:
-            self.box_pile.render(screen)
-        
\ No newline at end of file
+            commands += self.box_pile.draw_commands()
+        return screen.blits(commands)  # One call for the whole frame
@@ -7,28 +7,43 @@ from spawner import spawn_vans, spawn_cars, spawn_staff, spawn_subcon, spawn_tru
 from pygame.math import Vector2
 from objects.box import BoxPile  # Import BoxPile class from box module
 class CarController:
-    def __init__(self, carpark):
+    def __init__(self, carpark, scheduler):
         self.carpark = carpark
         self.spawned = False
-        self.last_day = None  # Track day to allow reset
+        self.last_day = None  # Day of the most recent reset
+        self.active = set()  # Cars driving or just loaded; parked ones sleep until retargeted or loaded again
 
-    def update(self, dt, sim_clock):
-        hour = sim_clock.hour
-        minute = sim_clock.minute
-        day = sim_clock.day
-
-        # --- Daily reset at 06:00 ---
-        if hour == 6 and minute == 0 and day != self.last_day:
-            self.spawned = False
-            self.carpark.spawned_today = False
-            self.last_day = day
-
-        # --- Spawn on Monday 06:01 ---
-        if day == "Monday" and hour == 6 and minute == 1 and not self.spawned:
+        # --- Timed events: daily reset at 06:00, fleet spawn on Monday 06:01 ---
+        scheduler.schedule_daily(6, 0, self.reset_day, name="car_reset")
+        scheduler.schedule_daily(6, 1, self.spawn_fleet, name="car_spawn", days=["Monday"])
+
+    def reset_day(self, sim_clock):
+        self.spawned = False
+        self.carpark.spawned_today = False
+        self.last_day = sim_clock.day
+
+    def spawn_fleet(self, sim_clock):
+        if not self.spawned:
             spawn_cars(self.carpark.cars)
+            self.active = set()  # The previous fleet was replaced
+            for car in self.carpark.cars:
+                car.woken = self.wake
+                self.wake(car)  # Driving in to its bay
             self.spawned = True
             self.carpark.spawned_today = True
 
-        # --- Animate car movement ---
-        for car in self.carpark.cars:
-            car.update(dt)
\ No newline at end of file
+    def wake(self, car):
+        self.active.add(car)
+
+    def update(self, dt, sim_clock):
+        # The MovementSystem moves the cars; here cars that have parked go to sleep, so the cost
+        # follows the cars in motion rather than the fleet size
+        if not self.active:
+            return
+        parked = [car for car in self.active if not car.moving]
+        if parked:
+            self.active.difference_update(parked)
+            self.carpark.invalidate()  # Parked cars are drawn in the static layer
+
+    def is_idle(self):
+        return not any(car.moving for car in self.active)
@@ -1,4 +1,5 @@
 import os
+import random
 import sys
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
@@ -6,13 +7,29 @@ from spawner import spawn_vans, spawn_cars, spawn_staff, spawn_subcon, spawn_tru
 from pygame.math import Vector2
 from spawner import spawn_staff, spawn_subcon
 from objects.courier import StaffCourier, SubconCourier
-from objects.queue_manager import Directions
+import eventlog
 
 SCREEN_WIDTH, SCREEN_HEIGHT = 1280, 720
+DISPATCH_HOUR = 16  # Loaded vehicles head out to the districts after the last truck of the day
+DELIVERY_SPEED = 0.5  # District px per sim second along a delivery route (~40 sim minutes across a district)
+PICKUP_RADIUS = 5  # Px; the courier at the head of a lane starts picking up this close to its slot
+DELIVERY_RADIUS = 120  # Px around a tour's first house to draw its other houses from (~35 houses); widened as needed
+ROUTE_EPSILON = 1e-6  # Px; a stop this close ahead counts as reached (round-off when stepping right up to it)
 
 class CourierController:
-    def __init__(self, sorting_area, carpark, courier_type, scene_manager):
+    def __init__(self, sorting_area, carpark, courier_type, scene_manager, scheduler, metrics=None,
+                 planner=None, districts=None, dispatcher=None, parcels=None, rng=None):
         self.sorting_area = sorting_area
+        self.random = rng or random.Random()  # The engine's RNG, so runs and snapshot forks are reproducible
+        self.parcels = parcels  # ParcelStore that gets the pickup/load/delivery timestamps
+        self.metrics = metrics  # MetricsAggregator fed with queue/pickup/load events, or None
+        self.dispatcher = dispatcher  # SlotDispatcher that hands idle couriers lane slots
+        self.planner = planner  # RoutePlanner that turns loaded boxes into delivery tours, or None
+        self.districts = districts or []  # CityDistrictScenes deliveries are spread over
+        self.next_district = 0  # Round-robin over districts
+        self.dispatched = False  # Past today's dispatch time; loaded couriers leave as soon as they're free
+        self.frame_sim_seconds = 0.0  # Sim time covered by the current report() call (delivery runs on sim time)
+        self.now = 0.0  # Sim clock at the current report() call, for parcel timestamps
         self.carpark = carpark
         self.courier_type = courier_type  # "Courier_Staff" or "Courier_Subcon"
         self.spawned = False
@@ -20,6 +37,13 @@ class CourierController:
         self.queue_index = None
         self.queue_type = None
         self.scene_manager = scene_manager  # Add this line
+        self.sim_clock = scheduler.clock  # Passed to the district scenes woken by a dispatch
+
+        # --- Timed events: daily reset at 06:00, couriers report at 07:00 ---
+        scheduler.schedule_daily(6, 0, self.on_day_start, name=f"{courier_type}_reset")
+        scheduler.schedule_daily(7, 0, self.on_report_time, name=f"{courier_type}_spawn")
+        if planner:
+            scheduler.schedule_daily(DISPATCH_HOUR, 0, self.on_dispatch, name=f"{courier_type}_dispatch")
 
         # State definitions
         self.states = {
@@ -46,28 +70,132 @@ class CourierController:
 
     def reset_daily_state(self, day):
         self.spawned = False
+        self.dispatched = False
         self.sorting_area.spawned_today = False
         self.last_day = day
 
     def spawn(self, day):
         raise NotImplementedError("This method must be implemented by subclasses.")
 
-    def stream_pending(self, dt):
-        self.sorting_area.courier_spawn_timer += dt
-        if self.sorting_area.pending_couriers and self.sorting_area.courier_spawn_timer >= self.sorting_area.courier_spawn_interval:
-            next_courier = self.sorting_area.pending_couriers.pop(0)
-            self.sorting_area.couriers.append(next_courier)
-            self.sorting_area.courier_spawn_timer = 0
+    def next_pickup_in(self):
+        # Movement ms until a courier walking up to the head of a lane comes within PICKUP_RADIUS, or None
+        soonest = None
+        for courier in self.sorting_area.couriers:
+            if courier.type != self.courier_type or courier.status != "QUEUING" or courier.queue_index != 0:
+                continue
+            if not courier.moving or courier.speed <= 0:
+                continue
+            distance = (courier.position - courier.target_position).length() - PICKUP_RADIUS + ROUTE_EPSILON
+            wait = max(0.0, distance) / courier.speed * 1000.0
+            if soonest is None or wait < soonest:
+                soonest = wait
+        return soonest
+
+    def next_delivery_in(self):
+        # Sim seconds until one of this controller's couriers reaches its next house (or the depot), or None
+        soonest = None
+        for courier in self.sorting_area.couriers:
+            if courier.type != self.courier_type or courier.status != "DELIVERING" or courier.route is None:
+                continue
+            route = courier.route
+            goal = route.stops[courier.route_stop] if courier.route_stop < len(route.stops) else route.length
+            wait = max(0.0, goal - courier.route_distance) / DELIVERY_SPEED
+            if soonest is None or wait < soonest:
+                soonest = wait
+        return soonest
+
+    def on_day_start(self, sim_clock):
+        self.reset_daily_state(sim_clock.day)
+
+    def on_report_time(self, sim_clock):
+        if not self.spawned:
+            self.spawn(sim_clock.day)
+            self.spawned = True
 
-    def report(self, dt, sim_clock):
-        hour, minute, day = sim_clock.hour, sim_clock.minute, sim_clock.day
+    def on_dispatch(self, sim_clock):
+        self.dispatched = True
+        pile = self.sorting_area.box_pile
+        for courier in self.sorting_area.couriers:
+            if courier.type != self.courier_type or courier.status not in ("IDLE", "MOVE_TO_QUEUE", "QUEUING"):
+                continue  # Couriers still walking boxes to their vehicle dispatch when they get there
+            self.dispatcher.remove(courier)
+            if courier.queue_type is not None and pile:
+                pile.queue_manager.remove_courier_from_direction(courier, courier.queue_type)  # Give up the lane
+                courier.queue_type = None
+                if self.metrics:
+                    self.metrics.courier_dequeued(courier)
+                self.dispatcher.notify()
+            if courier.carrying and courier.assigned_vehicle:
+                self.load_vehicle(courier, sim_clock.elapsed)
+            self.dispatch(courier)
+
+    def load_vehicle(self, courier, now):
+        # Move everything the courier carries into their vehicle
+        count = courier.carrying
+        runs = courier.parcels.clear()
+        courier.assigned_vehicle.load(runs)
+        if self.parcels:
+            self.parcels.stamp("loaded", runs, now)
+        if self.metrics and count:
+            self.metrics.vehicle_loaded(courier.assigned_vehicle, count)
+        eventlog.debug("courier", "{courier} loaded {boxes} boxes into their {vehicle}", courier=courier.id, boxes=count,
+                       vehicle=type(courier.assigned_vehicle).__name__)
+
+    def dispatch(self, courier):
+        # Send the courier's vehicle out with a planned tour of one district; couriers with nothing to deliver clock off
+        vehicle = courier.assigned_vehicle
+        if not self.districts or vehicle is None or vehicle.box_load == 0:
+            self.clock_off(courier)
+            return
+        district = self.districts[self.next_district % len(self.districts)]
+        self.next_district += 1
+        self.scene_manager.wake(district.name, self.sim_clock)  # Lays out the district's houses on first use
+        houses = self.delivery_houses(district, vehicle.box_load)
+        courier.delivery_ids = vehicle.parcels.ids()  # Parcel i goes to houses[i]
+        if self.parcels:
+            self.parcels.assign(courier.delivery_ids, district.district_id, [house.house_id for house in houses])
+        courier.district = district
+        courier.route_distance = 0.0
+        courier.route_stop = 0
+        courier.status = "DELIVERING"
+        self.planner.request(courier, district, houses)
+        eventlog.debug("courier", "{courier} dispatched to {district} with {boxes} boxes", courier=courier.id,
+                       district=district.name, boxes=vehicle.box_load)
+
+    def delivery_houses(self, district, count):
+        # One house per box from a single neighbourhood: the house nearest a random point, then houses around it
+        # from the district's spatial index, widening the radius until there are enough (or the whole district)
+        point = (self.random.uniform(0, SCREEN_WIDTH), self.random.uniform(0, SCREEN_HEIGHT))
+        first = district.nearest_house(point)
+        if first is None:
+            return self.random.choices(district.houses, k=count)
+        radius = DELIVERY_RADIUS
+        nearby = district.houses_within(first.position, radius)
+        while len(nearby) < count and len(nearby) < len(district.house_index):
+            radius *= 2
+            nearby = district.houses_within(first.position, radius)
+        if count <= len(nearby):
+            return self.random.sample(nearby, count)
+        return self.random.choices(nearby, k=count)  # More boxes than houses; some get two
+
+    def is_idle(self):
+        # True when nothing this controller owns will change until the next timed event
+        if self.sorting_area.pending_couriers:
+            return False
+        pile = self.sorting_area.box_pile
+        has_boxes = pile is not None and not pile.is_empty()
+        for courier in self.sorting_area.couriers:
+            if courier.type != self.courier_type or courier.status == "OFF_WORK":
+                continue
+            if courier.status not in ("IDLE", "QUEUING") or has_boxes:
+                return False
+            if courier.position != courier.target_position:
+                return False
+        return True
 
-        if hour == 6 and minute == 0 and day != self.last_day:
-            self.reset_daily_state(day)
-        if hour == 7 and not self.spawned:
-            self.spawn(day)
-            self.spawned = True
-        self.stream_pending(dt)
+    def report(self, dt, sim_clock):
+        self.frame_sim_seconds = sim_clock.sim_seconds(dt)
+        self.now = sim_clock.elapsed
 
         for courier in self.sorting_area.couriers:
             if courier.type == self.courier_type:
@@ -82,15 +210,10 @@ class CourierController:
 
     def _reporting(self, courier, dt):
         if self._move_towards(courier, courier.idle_position, dt):
-            courier.status = "IDLE"
+            self.dispatcher.add(courier)  # IDLE until the dispatcher has a slot for them
 
     def _idle(self, courier, dt):
-        courier.slot_request_timer += dt  # Accumulate time
-
-        if courier.slot_request_timer >= courier.slot_request_interval:
-            success = courier.request_slot(self.sorting_area.box_pile)
-            if success:
-                courier.slot_request_timer = 0  # Reset timer only on success
+        pass  # On the dispatcher's wait-list; it moves the courier to MOVE_TO_QUEUE
 
     def _move_to_queue(self, courier, dt):
         # Move toward assigned queue slot
@@ -99,86 +222,86 @@ class CourierController:
 
     def _queuing(self, courier, dt):
         pile = self.sorting_area.box_pile
-        if courier.queue_type == "R":
-            occupied, slots = pile.right_occupied, pile.right_queue_slots
-        elif courier.queue_type == "T":
-            occupied, slots = pile.top_occupied, pile.top_queue_slots
-        elif courier.queue_type == "B":
-            occupied, slots = pile.bottom_occupied, pile.bottom_queue_slots
-        else:
+        if pile is None or courier.queue_type is None:
             return
 
         # Check if courier is at front of their queue and in position
-        if courier.queue_index == 0 and (courier.position - courier.target_position).length() < 5:
+        if courier.queue_index == 0 and (courier.position - courier.target_position).length() < PICKUP_RADIUS:
             # Attempt to pick up until they have 5 or the pile is empty
-            while courier.carrying < 5 and not pile.is_empty():
-                courier.pickup_box(pile)
-
-            # If courier is full, leave the queue
+            picked = courier.carrying
+            taken = courier.pickup_box(pile, 5 - courier.carrying)
+            picked = courier.carrying - picked
+            if picked:
+                if self.parcels:
+                    self.parcels.stamp("picked", taken, self.now)
+                if self.metrics:
+                    self.metrics.box_picked_up(picked)
+
+            # If courier is full, leave the queue; the couriers behind shift up in update_all_queue_rows
             if courier.carrying >= 5:
-                courier.status = "SORTING"
-                occupied[0] = None
-                courier.queue_index = None
+                pile.queue_manager.remove_courier_from_direction(courier, courier.queue_type)
+                self.dispatcher.notify()  # The tail slot of this lane is free again
+                if self.metrics:
+                    self.metrics.courier_dequeued(courier)
                 courier.queue_type = None
-                self.update_all_queue_rows()
-                while courier.carrying > 0:
-                    courier.move_to_carpark(current_scene=self.sorting_area, scene_manager=self.scene_manager, dt=dt)
+                courier.status = "SORTING"
 
     def _sorting(self, courier, dt):
         if courier.assigned_vehicle:
-            courier.target_position = courier.assigned_vehicle.target_position
-            if self._move_towards(courier, courier.target_position, dt):
-                courier.assigned_vehicle.load_box()
-                courier.carrying = 0
-                courier.status = "IDLE"
+            if self._move_towards(courier, courier.assigned_vehicle.target_position, dt):
+                self.load_vehicle(courier, self.now)
+                if self.dispatched:
+                    self.dispatch(courier)  # Dispatch time has passed; head straight out
+                else:
+                    self.dispatcher.add(courier)  # Back on the wait-list for another load
 
     def _delivering(self, courier, dt):
-        pass
+        route = courier.route
+        if route is None:
+            return  # Still queued in the route planner
+        courier.route_distance += DELIVERY_SPEED * self.frame_sim_seconds
+        while courier.route_stop < len(route.stops) and route.stops[courier.route_stop] <= courier.route_distance + ROUTE_EPSILON:
+            parcel_id = int(courier.delivery_ids[route.order[courier.route_stop]])  # Parcel for this stop's house
+            courier.assigned_vehicle.unload_box(parcel_id)
+            if self.parcels:
+                self.parcels.deliver(parcel_id, self.now)
+            if self.metrics:
+                self.metrics.box_delivered(route.houses[courier.route_stop])
+            courier.route_stop += 1
+        if courier.route_distance + ROUTE_EPSILON >= route.length:
+            courier.route = None  # Back at the depot; done for the day
+            courier.district = None
+            courier.delivery_ids = None
+            self.clock_off(courier)
+
+    def clock_off(self, courier):
+        # Hand the vehicle back so tomorrow's couriers can be assigned to it
+        vehicle = courier.assigned_vehicle
+        if vehicle is not None:
+            vehicle.occupied = False
+            vehicle.driver = None
+            courier.assigned_vehicle = None
+        courier.status = "OFF_WORK"
+        eventlog.debug("courier", "{courier} clocked off", courier=courier.id)
 
     def update_all_queue_rows(self):
         pile = self.sorting_area.box_pile
         if not pile:
             return
-        for direction in [Directions.RIGHT, Directions.UP, Directions.DOWN]:
-            queue = pile.queue_manager.get_queue(direction)
-            slots = pile.queue_manager.queue_positions[direction]
-
-            if queue is None:
-                continue  # Skip if queue hasn't been generated
-
-            with queue.mutex:  # To safely iterate over Queue contents
-                queue_list = list(queue.queue)
-
-            for i in range(1, len(queue_list)):
-                courier = queue_list[i]
-                if courier and queue_list[i - 1] is None:
-                    # Move courier forward in the queue
-                    queue_list[i] = None
-                    queue_list[i - 1] = courier
-                    courier.queue_index = i - 1
-                    courier.target_position = slots[i - 1]
-                    print(f"[Global Queue Shift] {courier.id} → {direction.name}{i - 1}")
-
-        # Reassign modified queue
-        with queue.mutex:
-            queue.queue.clear()
-            for item in queue_list:
-                if item is not None:
-                    queue.queue.append(item)
-
+        # Lanes stay compact on their own; only couriers behind a freed slot get new targets
+        pile.queue_manager.advance_all()
 
     def _move_towards(self, courier, target, dt):
-        direction = target - courier.position
-        if direction.length() < 2:
-            courier.position = target
-            return True
-        direction.normalize_ip()
-        courier.position += direction * courier.speed * (dt / 1000.0)
-        return False
+        # The shared MovementSystem does the stepping; here we only retarget and check arrival
+        if courier.target_position != target:
+            courier.target_position = target
+        return not courier.moving
 
 class StaffController(CourierController):
-    def __init__(self, sorting_area, carpark, scene_manager):
-        super().__init__(sorting_area, carpark, courier_type="Courier_Staff", scene_manager=scene_manager)
+    def __init__(self, sorting_area, carpark, scene_manager, scheduler, metrics=None, planner=None, districts=None,
+                 dispatcher=None, parcels=None, rng=None):
+        super().__init__(sorting_area, carpark, courier_type="Courier_Staff", scene_manager=scene_manager, scheduler=scheduler,
+                         metrics=metrics, planner=planner, districts=districts, dispatcher=dispatcher, parcels=parcels, rng=rng)
 
     def spawn(self, day):
         staff = spawn_staff(day, self.carpark.vans)
@@ -187,8 +310,10 @@ class StaffController(CourierController):
         self.sorting_area.pending_couriers += staff
 
 class SubconController(CourierController):
-    def __init__(self, sorting_area, carpark, scene_manager):
-        super().__init__(sorting_area, carpark, courier_type="Courier_Subcon", scene_manager=scene_manager)
+    def __init__(self, sorting_area, carpark, scene_manager, scheduler, metrics=None, planner=None, districts=None,
+                 dispatcher=None, parcels=None, rng=None):
+        super().__init__(sorting_area, carpark, courier_type="Courier_Subcon", scene_manager=scene_manager, scheduler=scheduler,
+                         metrics=metrics, planner=planner, districts=districts, dispatcher=dispatcher, parcels=parcels, rng=rng)
 
     def spawn(self, day):
         subcons = spawn_subcon(day, self.carpark.cars)
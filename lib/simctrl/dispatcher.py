@@ -0,0 +1,81 @@
+import random
+from collections import deque
+
+def _best_lane(dispatcher, lanes, key):
+    # Lane with the lowest key; ties are broken with the engine's RNG, so seeded runs differ from each other
+    best = min(key(item) for item in lanes)
+    tied = [item for item in lanes if key(item) == best]
+    return (tied[0] if len(tied) == 1 else dispatcher.random.choice(tied))[0]
+
+def _shortest_lane(dispatcher, courier, lanes):
+    return _best_lane(dispatcher, lanes, lambda item: len(item[1]))
+
+def _nearest_lane(dispatcher, courier, lanes):
+    position = courier.position
+    return _best_lane(dispatcher, lanes, lambda item: position.distance_squared_to(item[1].positions[len(item[1])]))
+
+def _round_robin(dispatcher, courier, lanes):
+    dispatcher.turn += 1
+    return lanes[dispatcher.turn % len(lanes)][0]
+
+POLICIES = {
+    "shortest": _shortest_lane,  # Fill the emptiest lane first
+    "nearest": _nearest_lane,  # Lane whose free tail slot is closest to the courier
+    "round_robin": _round_robin,
+}
+
+class SlotDispatcher:
+    # Idle couriers wait here instead of polling the pile; they are handed lane slots only
+    # when something changes (a courier joins the wait-list, a slot frees, the pile gets boxes)
+    def __init__(self, sorting_area, policy="shortest", metrics=None, rng=None):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown dispatch policy '{policy}', expected one of {', '.join(POLICIES)}")
+        self.sorting_area = sorting_area
+        self.policy = policy  # Key into POLICIES (kept as a name so snapshots stay picklable)
+        self.metrics = metrics  # MetricsAggregator notified when a courier joins a lane, or None
+        self.random = rng or random.Random()  # The engine's RNG, for tie-breaks
+        self.waiting = deque()  # Idle couriers in arrival order
+        self.members = set()  # Same couriers, for O(1) membership checks
+        self.turn = 0  # Round-robin cursor
+        self.pending = False  # Something changed since the last dispatch()
+
+    def __len__(self):
+        return len(self.waiting)
+
+    def add(self, courier):
+        courier.status = "IDLE"
+        if courier not in self.members:
+            self.waiting.append(courier)
+            self.members.add(courier)
+            self.pending = True
+
+    def remove(self, courier):
+        if courier in self.members:
+            self.members.discard(courier)
+            self.waiting.remove(courier)
+
+    def notify(self):
+        self.pending = True  # A lane slot freed or boxes arrived
+
+    def dispatch(self):
+        # Fill open lane slots from the wait-list; free when nothing changed since last time
+        if not self.pending:
+            return 0
+        self.pending = False
+        pile = self.sorting_area.box_pile
+        if pile is None or not self.waiting:
+            return 0
+        choose = POLICIES[self.policy]
+        queue_manager = pile.queue_manager
+        assigned = 0
+        while self.waiting:
+            lanes = [(direction, queue_manager.queues[direction]) for direction in queue_manager.open_lanes()]
+            if not lanes:
+                break  # Everyone else waits for the next freed slot
+            courier = self.waiting.popleft()
+            self.members.discard(courier)
+            courier.request_slot(pile, choose(self, courier, lanes))
+            if self.metrics:
+                self.metrics.courier_queued(courier)
+            assigned += 1
+        return assigned
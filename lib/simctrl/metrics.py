@@ -0,0 +1,233 @@
+import csv
+import os
+from collections import deque
+
+class P2Quantile:
+    # Streaming quantile estimate with the P² algorithm (Jain & Chlamtac, 1985):
+    # five markers whose heights follow the target quantile, O(1) memory per quantile
+    def __init__(self, p):
+        self.p = p
+        self.count = 0
+        self.heights = []  # Marker heights; the first five samples until the markers are seeded
+        self.positions = [1, 2, 3, 4, 5]  # Actual marker positions
+        self.desired = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]  # Desired marker positions
+        self.increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def add(self, x):
+        self.count += 1
+        q = self.heights
+        if self.count <= 5:
+            q.append(x)
+            if self.count == 5:
+                q.sort()
+            return
+
+        # Find the cell x falls into, stretching the outer markers if needed
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+        n = self.positions
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        # Nudge the three middle markers towards their desired positions
+        for i in range(1, 4):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                height = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+                if not q[i - 1] < height < q[i + 1]:
+                    height = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])  # Parabola overshot; go linear
+                q[i] = height
+                n[i] += d
+
+    def value(self):
+        if self.count == 0:
+            return None
+        if self.count < 5:
+            ordered = sorted(self.heights)
+            return ordered[min(len(ordered) - 1, int(len(ordered) * self.p))]
+        return self.heights[2]
+
+class StreamingStats:
+    # Count/mean/min/max plus P² quantiles of a stream of samples, without keeping the samples
+    QUANTILES = (0.5, 0.9, 0.99)
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.min = None
+        self.max = None
+        self.quantiles = {p: P2Quantile(p) for p in self.QUANTILES}
+
+    def add(self, x, weight=1):
+        for _ in range(weight):  # Weight = identical samples, e.g. several boxes picked up at once
+            self.count += 1
+            self.mean += (x - self.mean) / self.count
+            for estimator in self.quantiles.values():
+                estimator.add(x)
+        self.min = x if self.min is None else min(self.min, x)
+        self.max = x if self.max is None else max(self.max, x)
+
+    def quantile(self, p):
+        # Each P² estimator runs on its own, so on skewed data a lower quantile can overtake a higher one;
+        # report the running maximum over the lower quantiles, within the observed range
+        value = self.quantiles[p].value()
+        if value is None:
+            return None
+        for q, estimator in self.quantiles.items():
+            if q < p:
+                value = max(value, estimator.value())
+        return min(max(value, self.min), self.max)
+
+class TimeWeighted:
+    # Running time-weighted average of a piecewise-constant value (queue length, pile size)
+    def __init__(self, start):
+        self.start = start
+        self.value = 0
+        self.last = start  # When `value` last changed
+        self.area = 0.0  # Integral of value over [start, last]
+        self.max = 0
+
+    def set(self, value, now):
+        self.area += self.value * (now - self.last)
+        self.last = now
+        self.value = value
+        self.max = max(self.max, value)
+
+    def add(self, delta, now):
+        self.set(self.value + delta, now)
+
+    def mean(self, now):
+        span = now - self.start
+        if span <= 0:
+            return float(self.value)
+        return (self.area + self.value * (now - self.last)) / span
+
+class MetricsAggregator:
+    # Controllers report operational events here; everything is kept as running aggregates,
+    # so memory stays flat no matter how many events a week-long run produces
+    def __init__(self, clock):
+        self.clock = clock  # SimulationClock; all durations are in sim seconds
+        self.counters = {
+            "boxes_unloaded": 0,
+            "boxes_picked_up": 0,
+            "couriers_queued": 0,
+            "couriers_dequeued": 0,
+            "boxes_loaded": 0,
+            "vehicle_loads": 0,
+            "boxes_delivered": 0,
+        }
+        self.queue_length = TimeWeighted(clock.elapsed)  # Couriers standing in box-pile lanes
+        self.pile_size = TimeWeighted(clock.elapsed)  # Boxes waiting in the pile
+        self.queue_wait = StreamingStats()  # Queued -> left the lane with boxes
+        self.pile_dwell = StreamingStats()  # Unloaded from the truck -> picked up
+        self._queued_at = {}  # Courier id -> when it joined a lane; bounded by lane capacity
+        self._pile_batches = deque()  # [unloaded_at, boxes_left] per truckload still in the pile (FIFO)
+        self.csv_path = None
+
+    # --- Events fed by the controllers ---
+
+    def box_unloaded(self, count):
+        now = self.clock.elapsed
+        self.counters["boxes_unloaded"] += count
+        self.pile_size.add(count, now)
+        self._pile_batches.append([now, count])
+
+    def box_picked_up(self, count):
+        now = self.clock.elapsed
+        self.counters["boxes_picked_up"] += count
+        self.pile_size.set(max(0, self.pile_size.value - count), now)
+        # Boxes leave the pile oldest-truckload first
+        while count > 0 and self._pile_batches:
+            batch = self._pile_batches[0]
+            taken = min(count, batch[1])
+            self.pile_dwell.add(now - batch[0], taken)
+            batch[1] -= taken
+            count -= taken
+            if batch[1] == 0:
+                self._pile_batches.popleft()
+
+    def courier_queued(self, courier):
+        now = self.clock.elapsed
+        self.counters["couriers_queued"] += 1
+        self.queue_length.add(1, now)
+        self._queued_at[courier.id] = now
+
+    def courier_dequeued(self, courier):
+        now = self.clock.elapsed
+        self.counters["couriers_dequeued"] += 1
+        self.queue_length.add(-1, now)
+        queued_at = self._queued_at.pop(courier.id, None)
+        if queued_at is not None:
+            self.queue_wait.add(now - queued_at)
+
+    def vehicle_loaded(self, vehicle, count):
+        self.counters["boxes_loaded"] += count
+        self.counters["vehicle_loads"] += 1
+
+    def box_delivered(self, house):
+        self.counters["boxes_delivered"] += 1
+
+    # --- Reporting ---
+
+    def snapshot(self):
+        # Flat {column: value} view of every aggregate, in a stable column order
+        now = self.clock.elapsed
+        row = {"sim_seconds": round(now, 3), "sim_time": self.clock.get_time_str()}
+        row.update(self.counters)
+        for name, series in (("queue_length", self.queue_length), ("pile_size", self.pile_size)):
+            row[f"{name}_now"] = series.value
+            row[f"{name}_avg"] = round(series.mean(now), 3)
+            row[f"{name}_max"] = series.max
+        for name, stats in (("queue_wait", self.queue_wait), ("pile_dwell", self.pile_dwell)):
+            row[f"{name}_count"] = stats.count
+            row[f"{name}_mean_s"] = round(stats.mean, 3)
+            for p in StreamingStats.QUANTILES:
+                value = stats.quantile(p)
+                row[f"{name}_p{int(p * 100)}_s"] = None if value is None else round(value, 3)
+            row[f"{name}_max_s"] = None if stats.max is None else round(stats.max, 3)
+        return row
+
+    def export_csv(self, scheduler, path, interval=15 * 60):
+        # Append a snapshot row every `interval` sim seconds; rows go straight to disk
+        self.csv_path = path
+        if os.path.exists(path):
+            os.remove(path)  # Each run starts a fresh file
+        scheduler.schedule_at(self.clock.elapsed + interval, self.write_snapshot, name="metrics_csv", repeat=interval)
+
+    def write_snapshot(self, sim_clock=None):
+        if self.csv_path is None:
+            return
+        row = self.snapshot()
+        new_file = not os.path.exists(self.csv_path)
+        with open(self.csv_path, "a", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(row))
+            if new_file:
+                writer.writeheader()
+            writer.writerow(row)
+
+    def summary_lines(self):
+        # Short human-readable KPI readout for the Statistics scene and headless runs
+        row = self.snapshot()
+        def fmt(value):
+            return "-" if value is None else f"{value:.1f}"
+        return [
+            f"boxes unloaded/picked/loaded  {row['boxes_unloaded']}/{row['boxes_picked_up']}/{row['boxes_loaded']}",
+            f"boxes delivered               {row['boxes_delivered']}",
+            f"queue length avg/max          {row['queue_length_avg']:.2f}/{row['queue_length_max']}",
+            f"pile size avg/max             {row['pile_size_avg']:.2f}/{row['pile_size_max']}",
+            f"queue wait p50/p90/p99 s      {fmt(row['queue_wait_p50_s'])}/{fmt(row['queue_wait_p90_s'])}/{fmt(row['queue_wait_p99_s'])}",
+            f"pile dwell p50/p90/p99 s      {fmt(row['pile_dwell_p50_s'])}/{fmt(row['pile_dwell_p90_s'])}/{fmt(row['pile_dwell_p99_s'])}",
+        ]
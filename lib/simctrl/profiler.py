@@ -0,0 +1,72 @@
+import cProfile
+import io
+import pstats
+import time
+from collections import deque
+
+class FrameProfiler:
+    def __init__(self, window=300):
+        self.window = window  # Frames kept per stage (5 s at 60 FPS)
+        self.samples = {}  # Stage name -> deque of wall times in ms, insertion order = display order
+        self.enabled = True
+        self.capture = None  # Active cProfile.Profile while a capture is running
+        self.last_capture_path = None
+
+    def __getstate__(self):
+        # Timings and a running cProfile capture belong to this process, not to a snapshot
+        state = self.__dict__.copy()
+        state["samples"] = {}
+        state["capture"] = None
+        return state
+
+    def measure(self, stage, fn, *args):
+        # Call fn(*args) and record how long it took under `stage`
+        if not self.enabled:
+            return fn(*args)
+        started = time.perf_counter()
+        result = fn(*args)
+        self.record(stage, (time.perf_counter() - started) * 1000.0)
+        return result
+
+    def record(self, stage, ms):
+        window = self.samples.get(stage)
+        if window is None:
+            window = self.samples[stage] = deque(maxlen=self.window)
+        window.append(ms)
+
+    def stats(self):
+        # Per-stage p50/p95/max over the rolling window; only called when someone looks
+        result = {}
+        for stage, window in self.samples.items():
+            if not window:
+                continue
+            ordered = sorted(window)
+            result[stage] = {
+                "p50": ordered[len(ordered) // 2],
+                "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+                "max": ordered[-1],
+            }
+        return result
+
+    @property
+    def capturing(self):
+        return self.capture is not None
+
+    def toggle_capture(self, path_prefix="profile"):
+        # Start a cProfile capture, or stop the running one and dump it; returns the dump path when stopping
+        if self.capture is None:
+            self.capture = cProfile.Profile()
+            self.capture.enable()
+            print("[Profiler] cProfile capture started")
+            return None
+
+        self.capture.disable()
+        path = f"{path_prefix}_{time.strftime('%Y%m%d_%H%M%S')}.prof"
+        self.capture.dump_stats(path)
+        summary = io.StringIO()
+        pstats.Stats(self.capture, stream=summary).sort_stats("cumulative").print_stats(15)
+        print(f"[Profiler] cProfile capture saved to {path}")
+        print(summary.getvalue())
+        self.capture = None
+        self.last_capture_path = path
+        return path
@@ -0,0 +1,121 @@
+from collections import deque
+
+import numpy as np
+from pygame.math import Vector2
+
+SCREEN_WIDTH, SCREEN_HEIGHT = 1280, 720
+DEPOT = Vector2(SCREEN_WIDTH // 2, SCREEN_HEIGHT)  # Vehicles enter and leave a district at the bottom middle
+# Tours planned per frame (about 4 ms at a typical 25-house tour); the rest of the queue waits for the next one.
+# A count rather than a time budget, so the tick a delivery starts on doesn't depend on how busy the machine is
+ROUTES_PER_FRAME = 3
+MAX_2OPT_PASSES = 8
+
+class Route:
+    __slots__ = ("houses", "order", "stops", "length")
+
+    def __init__(self, houses, order, stops, length):
+        self.houses = houses  # Houses in visiting order
+        self.order = order  # order[i] = index of the i-th visited house in the list passed to plan()
+        self.stops = stops  # Cumulative distance from the depot to each house (px)
+        self.length = length  # Full tour including the drive back to the depot (px)
+
+class RoutePlanner:
+    # Builds delivery tours (nearest neighbour + 2-opt) on top of a per-district distance matrix.
+    # Houses never move, so each matrix is computed once per district layout and reused by every route.
+    def __init__(self, per_frame=ROUTES_PER_FRAME):
+        self.per_frame = per_frame
+        self.matrices = {}  # District name -> (layout_version, {house: row}, positions, distance matrix)
+        self.pending = deque()  # (courier, district, houses) waiting to be planned
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["matrices"] = {}  # Cheap to rebuild, large to store; leave them out of snapshots
+        return state
+
+    def district_matrix(self, district):
+        cached = self.matrices.get(district.name)
+        if cached is not None and cached[0] == district.layout_version:
+            return cached
+        houses = [house for house in district.houses if house.position is not None]
+        positions = np.array([(house.position.x, house.position.y) for house in houses], dtype=np.float64).reshape(-1, 2)
+        delta = positions[:, None, :] - positions[None, :, :]
+        matrix = np.hypot(delta[..., 0], delta[..., 1])
+        cached = (district.layout_version, {house: row for row, house in enumerate(houses)}, positions, matrix)
+        self.matrices[district.name] = cached
+        return cached
+
+    def plan(self, district, houses, depot=DEPOT):
+        # Tour that leaves `depot`, visits every house once and returns
+        if not houses:
+            return Route([], [], [], 0.0)
+        _, rows, positions, matrix = self.district_matrix(district)
+        index = np.array([rows[house] for house in houses])
+
+        # Local matrix with the depot as node 0 and the houses as nodes 1..n
+        count = len(houses) + 1
+        local = np.empty((count, count))
+        local[1:, 1:] = matrix[np.ix_(index, index)]
+        depot_dist = np.hypot(positions[index, 0] - depot[0], positions[index, 1] - depot[1])
+        local[0, 1:] = depot_dist
+        local[1:, 0] = depot_dist
+        local[0, 0] = 0.0
+
+        tour = self._two_opt(local, self._nearest_neighbour(local))
+        legs = local[tour[:-1], tour[1:]]
+        stops = np.cumsum(legs)[:-1].tolist()  # Distance at each house (the last leg is the drive home)
+        order = (tour[1:-1] - 1).tolist()
+        return Route([houses[i] for i in order], order, stops, float(legs.sum()))
+
+    @staticmethod
+    def _nearest_neighbour(local):
+        count = len(local)
+        visited = np.zeros(count, dtype=bool)
+        visited[0] = True
+        tour = [0]
+        current = 0
+        for _ in range(count - 1):
+            distances = np.where(visited, np.inf, local[current])
+            current = int(np.argmin(distances))
+            visited[current] = True
+            tour.append(current)
+        tour.append(0)
+        return np.array(tour)
+
+    @staticmethod
+    def _two_opt(local, tour):
+        # Reverse tour[i+1..j] whenever swapping edges (a,b),(c,d) for (a,c),(b,d) shortens the tour;
+        # the gain of every j for a given i is evaluated in one vectorized step
+        count = len(tour)
+        for _ in range(MAX_2OPT_PASSES):
+            improved = False
+            for i in range(count - 3):
+                a, b = tour[i], tour[i + 1]
+                c = tour[i + 2:count - 1]
+                d = tour[i + 3:count]
+                gain = local[a, b] + local[c, d] - local[a, c] - local[b, d]
+                best = int(np.argmax(gain))
+                if gain[best] > 1e-9:
+                    j = i + 2 + best
+                    tour[i + 1:j + 1] = tour[i + 1:j + 1][::-1].copy()
+                    improved = True
+            if not improved:
+                break
+        return tour
+
+    def request(self, courier, district, houses):
+        courier.route = None  # Filled in by process() once planned
+        self.pending.append((courier, district, houses))
+
+    def process(self, limit=None):
+        # Plan up to `limit` queued routes (default self.per_frame, math.inf for all of them)
+        if limit is None:
+            limit = self.per_frame
+        planned = 0
+        while self.pending and planned < limit:
+            courier, district, houses = self.pending.popleft()
+            courier.route = self.plan(district, houses)
+            planned += 1
+        return planned
+
+    def is_idle(self):
+        return not self.pending
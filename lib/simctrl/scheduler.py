@@ -0,0 +1,81 @@
+import heapq
+import itertools
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+class ScheduledEvent:
+    __slots__ = ("time", "name", "callback", "args", "repeat", "days", "cancelled")
+
+    def __init__(self, time, name, callback, args, repeat=None, days=None):
+        self.time = time  # Absolute sim seconds (same scale as SimulationClock.elapsed)
+        self.name = name  # Label for debugging / logging
+        self.callback = callback  # Called as callback(clock, *args)
+        self.args = args
+        self.repeat = repeat  # Re-arm interval in sim seconds, or None for one-shot events
+        self.days = days  # Optional set of day names the event is allowed to fire on
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True  # Lazily dropped when it reaches the top of the heap
+
+class EventScheduler:
+    def __init__(self, clock):
+        self.clock = clock  # SimulationClock the event times refer to
+        self._heap = []  # (time, seq, event) min-heap; seq keeps same-time events in registration order
+        self._seq = itertools.count()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_seq"] = next(self._seq)  # Store the counter as a plain int
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._seq = itertools.count(state["_seq"])
+
+    def __len__(self):
+        return len(self._heap)
+
+    def schedule_at(self, at, callback, *args, name=None, repeat=None, days=None):
+        event = ScheduledEvent(float(at), name or getattr(callback, "__name__", "event"), callback, args, repeat, days)
+        heapq.heappush(self._heap, (event.time, next(self._seq), event))
+        return event
+
+    def schedule_in(self, delay, callback, *args, name=None):
+        return self.schedule_at(self.clock.elapsed + delay, callback, *args, name=name)
+
+    def schedule_daily(self, hour, minute, callback, *args, name=None, days=None):
+        # First occurrence is today's slot if it hasn't passed yet (inclusive), otherwise tomorrow's
+        offset = hour * 3600 + minute * 60
+        at = self.clock.day_index * SECONDS_PER_DAY + offset
+        if at < self.clock.elapsed:
+            at += SECONDS_PER_DAY
+        return self.schedule_at(at, callback, *args, name=name, repeat=SECONDS_PER_DAY,
+                                days=set(days) if days else None)
+
+    def next_time(self):
+        while self._heap and self._heap[0][2].cancelled:
+            heapq.heappop(self._heap)  # Drop cancelled events so they don't hold up the queue
+        return self._heap[0][0] if self._heap else None
+
+    def advance(self, seconds):
+        # Move the clock forward, landing exactly on every event boundary crossed on the way
+        next_at = self.next_time()
+        if next_at is None or next_at > self.clock.elapsed + seconds:
+            self.clock.advance(seconds)  # Common case: nothing due this frame
+            return
+        self.advance_to(self.clock.elapsed + seconds)
+
+    def advance_to(self, target):
+        while True:
+            next_at = self.next_time()
+            if next_at is None or next_at > target:
+                break
+            _, _, event = heapq.heappop(self._heap)
+            self.clock.advance_to(event.time)
+            if event.days is None or self.clock.day in event.days:
+                event.callback(self.clock, *event.args)
+            if event.repeat:
+                event.time += event.repeat  # Re-arm repeating events for their next slot
+                heapq.heappush(self._heap, (event.time, next(self._seq), event))
+        self.clock.advance_to(target)
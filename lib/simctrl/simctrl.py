@@ -4,21 +4,34 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from spawner import spawn_vans, spawn_cars, spawn_staff, spawn_subcon, spawn_truck, spawn_houses, CYCLE_TIMES
 from pygame.math import Vector2
+import eventlog
 from objects.box import BoxPile  # Import BoxPile class from box module
 
 class SceneManager:
     def __init__(self):
         self.current_scene = None  # Currently active scene name
         self.scenes = {}  # Dictionary to hold all scenes
+        self.polled = []  # Names of the "every_frame" and "fixed_hz" scenes, visited by every update_all
+        self.pending_dt = {}  # Time (ms) each throttled scene hasn't been updated for yet
+        self.elapsed = 0.0  # Total time (ms) passed to update_all
+        self.dormant_since = {}  # Dormant scene name -> self.elapsed at its last update
 
     def add_scene(self, name, scene):
+        if scene.update_policy == "fixed_hz" and not scene.update_hz > 0:
+            raise ValueError(f"Scene {name!r} uses the fixed_hz policy but its update_hz is {scene.update_hz}")
         self.scenes[name] = scene  # Add a scene to the dictionary
+        if scene.update_policy == "dormant":
+            self.dormant_since[name] = self.elapsed
+        else:
+            self.polled.append(name)
+            self.pending_dt[name] = 0
         if self.current_scene is None:
             self.current_scene = name  # Set the first added scene as default
 
     def switch_scene(self, name):
-        if name in self.scenes:
+        if name in self.scenes and name != self.current_scene:
             self.current_scene = name  # Switch the active scene
+            self.scenes[name].invalidate()  # Screen still shows the old scene; force a full redraw
 
     def handle_event(self, event):
         if self.current_scene:
@@ -28,88 +41,157 @@ class SceneManager:
         for scene in self.scenes.values():
             scene.handle_event(event)
     
+    def wake(self, name, clock):
+        if name in self.dormant_since:
+            self.catch_up(name, clock)  # Something is about to happen in a dormant scene; bring it up to date now
+
     def update_all(self, dt, clock):
-        for scene in self.scenes.values():
-            scene.update(dt, clock)  # Update all scenes, not just the current one
+        self.elapsed += dt
+        for name in self.polled:
+            scene = self.scenes[name]
+            if scene.update_policy == "every_frame":
+                scene.update(dt, clock)
+                continue
+            self.pending_dt[name] += dt  # Bank the time until the scene is due
+            if self.pending_dt[name] >= 1000.0 / scene.update_hz:
+                self.catch_up(name, clock)
+        # "dormant": only while viewed or when woken. The others aren't visited at all, so a city of
+        # hundreds of districts costs nothing per frame; their time is worked out from self.elapsed on catch-up
+        if self.current_scene in self.dormant_since:
+            self.catch_up(self.current_scene, clock)
+
+    def catch_up(self, name, clock):
+        # Deliver all banked time to the scene in a single update call
+        if name in self.dormant_since:
+            dt, self.dormant_since[name] = self.elapsed - self.dormant_since[name], self.elapsed
+        else:
+            dt, self.pending_dt[name] = self.pending_dt[name], 0
+        self.scenes[name].update(dt, clock)
 
     def render(self, screen):
         if self.current_scene:
-            self.scenes[self.current_scene].render(screen)  # Render only the current scene
+            return self.scenes[self.current_scene].render(screen)  # Render only the current scene; dirty rects or None
+        return None
+
+    def restore(self, screen, rect):
+        if self.current_scene:
+            self.scenes[self.current_scene].restore(screen, rect)  # Erase an overlay back to the scene background
 
 class SimulationClock:
-    def __init__(self):
-        self.day = "Monday"
-        self.hour = 6
-        self.minute = 0
+    SECONDS_PER_DAY = 24 * 60 * 60
+    SIM_SECONDS_PER_MS = 3.6  # At speed 1, one real second is one sim hour (one sim minute per 60 FPS frame)
+    MIN_SPEED, MAX_SPEED = 1, 10000  # Supported time-warp range
+
+    def __init__(self, day="Monday", hour=6, minute=0):
         self.days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
         self.speed_multiplier = 1  # Multiplier to speed up or slow down time
+        # Absolute simulated time in seconds since Monday 00:00; day/hour/minute are derived from it
+        self.elapsed = float(self.days.index(day) * self.SECONDS_PER_DAY + hour * 3600 + minute * 60)
+        self._carry = 0.0  # Compensation term so tiny per-frame steps don't drift over long runs
+
+    def set_speed(self, multiplier):
+        self.speed_multiplier = min(self.MAX_SPEED, max(self.MIN_SPEED, multiplier))  # Clamp to the warp range
+        return self.speed_multiplier
+
+    def sim_seconds(self, dt):
+        return (dt * self.SIM_SECONDS_PER_MS) * self.speed_multiplier  # Convert real ms to sim seconds
 
     def update(self, dt):
-        self.minute += int((dt / 1000.0) * self.speed_multiplier * 60)  # Convert real time to sim minutes
-        while self.minute >= 60:
-            self.minute -= 60
-            self.hour += 1
-        while self.hour >= 24:
-            self.hour = 0
-            current_day_index = self.days.index(self.day)
-            self.day = self.days[(current_day_index + 1) % len(self.days)]  # Loop to next day
+        self.advance(self.sim_seconds(dt))
+
+    def advance(self, seconds):
+        if seconds <= 0:
+            return  # Time never runs backwards
+        # Kahan summation: keep the fractional part that a plain float add would round away
+        y = seconds - self._carry
+        total = self.elapsed + y
+        self._carry = (total - self.elapsed) - y
+        self.elapsed = total
+
+    def advance_to(self, elapsed):
+        if elapsed > self.elapsed:
+            self.elapsed = float(elapsed)  # Jump straight to an absolute time (event boundaries, idle skips)
+            self._carry = 0.0
+
+    @property
+    def day_index(self):
+        return int(self.elapsed // self.SECONDS_PER_DAY)  # Days since the first Monday, never wraps
+
+    @property
+    def time_of_day(self):
+        return self.elapsed - self.day_index * self.SECONDS_PER_DAY  # Seconds since midnight
+
+    @property
+    def day(self):
+        return self.days[self.day_index % len(self.days)]  # Loops Monday..Friday
+
+    @property
+    def hour(self):
+        return int(self.time_of_day // 3600)
+
+    @property
+    def minute(self):
+        return int(self.time_of_day // 60) % 60
+
+    @property
+    def second(self):
+        return int(self.time_of_day) % 60
 
     def get_time_str(self):
         return f"{self.day} {self.hour:02d}:{self.minute:02d}"  # String for display
 
 class TruckController:
-    def __init__(self, sorting_area):
+    def __init__(self, sorting_area, scheduler, metrics=None, dispatcher=None, parcels=None):
         self.sorting_area = sorting_area
+        self.parcels = parcels  # ParcelStore each truckload is registered in
+        self.metrics = metrics  # MetricsAggregator fed with unload events, or None
+        self.dispatcher = dispatcher  # SlotDispatcher woken when boxes arrive, or None
         self.active_truck = None
-        self.last_day = None  # Used to detect day changes
+        self.last_day = None  # Day of the most recent reset
 
-    def update(self, dt, sim_clock):
-        hour = sim_clock.hour
-        minute = sim_clock.minute
-        day = sim_clock.day
-
-        # --- Reset truck state at 06:00 each day ---
-        if hour == 6 and minute == 0 and day != self.last_day:
-            print(f"[TruckController] Resetting state at {hour:02d}:{minute:02d} on {day}")
-            self.sorting_area.spawned_cycles.clear()
-            self.sorting_area.truck = None
-            self.active_truck = None
-            self.last_day = day
-
-        # --- Spawn truck at scheduled cycle times ---
+        # --- Timed events: daily reset at 06:00, one truck per cycle ---
+        scheduler.schedule_daily(6, 0, self.reset_day, name="truck_reset")
         for cycle_name in ["ACycle", "BCycle"]:
-            if hour == CYCLE_TIMES[cycle_name] and cycle_name not in self.sorting_area.spawned_cycles:
-                print(f"[TruckController] Spawning truck for {cycle_name} at hour {hour}")
-                self.active_truck = spawn_truck(self.sorting_area, cycle_name)  # pass sorting_area
-                self.sorting_area.truck = self.active_truck
-                self.sorting_area.spawned_cycles.add(cycle_name)
+            scheduler.schedule_daily(CYCLE_TIMES[cycle_name], 0, self.spawn_cycle, cycle_name, name=f"truck_{cycle_name}")
 
+    def reset_day(self, sim_clock):
+        eventlog.info("truck", "Resetting truck cycles on {day}", day=sim_clock.day)
+        self.sorting_area.spawned_cycles.clear()
+        self.sorting_area.truck = None
+        self.active_truck = None
+        self.last_day = sim_clock.day
 
+    def spawn_cycle(self, sim_clock, cycle_name):
+        if cycle_name in self.sorting_area.spawned_cycles:
+            return
+        eventlog.info("truck", "Spawning truck for {cycle} at hour {hour}", cycle=cycle_name, hour=sim_clock.hour)
+        self.active_truck = spawn_truck(self.sorting_area, cycle_name)  # pass sorting_area
+        self.sorting_area.truck = self.active_truck
+        self.sorting_area.spawned_cycles.add(cycle_name)
+
+    def is_idle(self):
+        return self.active_truck is None  # Nothing to animate until the next cycle event
+
+    def update(self, dt, sim_clock):
         # --- Update truck animation and delivery logic ---
         if self.active_truck:
+            was_unloaded = self.active_truck.unloaded
             self.active_truck.update(dt)
-
-            # Unload boxes into the BoxPile
-            if self.active_truck.is_ready_to_unload():
-                pile_position = Vector2(
-                    self.active_truck.target_position.x + 40,
-                    self.active_truck.target_position.y - 20
-                )
-
-                if not self.sorting_area.box_pile:
-                    self.sorting_area.box_pile = BoxPile(position=pile_position)
+            if self.active_truck.unloaded and not was_unloaded:  # Truck just dropped its load (pile is in place)
+                box_count = self.active_truck.boxes_to_deliver
+                if self.parcels is not None:
+                    start, stop = self.parcels.add(box_count, self.active_truck.cycle, sim_clock.elapsed)
                 else:
-                    self.sorting_area.box_pile.position = pile_position
-
-                box_count = len(self.active_truck.boxes)
-                self.sorting_area.box_pile.increment(count=box_count)
-                self.sorting_area.boxes.extend(self.active_truck.boxes)
-                self.active_truck.unload_all()
-                print(f"[TruckController] Unloaded {box_count} boxes")
+                    start, stop = 0, box_count  # No store: ids are only used for counting
+                self.sorting_area.box_pile.receive(start, stop)
+                if self.metrics:
+                    self.metrics.box_unloaded(box_count)
+                if self.dispatcher:
+                    self.dispatcher.notify()
 
             # Remove truck if it's fully despawned
             if self.active_truck.is_ready_to_despawn():
-                print("[TruckController] Truck has despawned.")
+                eventlog.info("truck", "Truck has despawned")
                 self.sorting_area.truck = None
                 self.active_truck = None
 
@@ -118,7 +200,12 @@ class HouseController:
         self.city_district_scene = city_district_scene
         self.initialized = False
 
-    def update(self, dt, clock):
+    def ensure_houses(self):
+        # Lay out the district on first use, whether it's first viewed or first delivered to
         if not self.initialized:
             spawn_houses(self.city_district_scene.houses)
+            self.city_district_scene.index_houses()  # Index the new layout; also rebuilds the static layer
             self.initialized = True
+
+    def update(self, dt, clock):
+        self.ensure_houses()
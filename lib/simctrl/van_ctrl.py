@@ -7,28 +7,43 @@ from pygame.math import Vector2
 from objects.box import BoxPile  # Import BoxPile class from box module
 
 class VanController:
-    def __init__(self, carpark):
+    def __init__(self, carpark, scheduler):
         self.carpark = carpark
         self.spawned = False
-        self.last_day = None  # To track reset per new day
+        self.last_day = None  # Day of the most recent reset
+        self.active = set()  # Vans driving or just loaded; parked ones sleep until retargeted or loaded again
 
-    def update(self, dt, sim_clock):
-        hour = sim_clock.hour
-        minute = sim_clock.minute
-        day = sim_clock.day
-
-        # --- Daily reset at 06:00 ---
-        if hour == 6 and minute == 0 and day != self.last_day:
-            self.spawned = False
-            self.carpark.spawned_today = False
-            self.last_day = day
-
-        # --- Spawn on Monday 06:01 ---
-        if day == "Monday" and hour == 6 and minute == 1 and not self.spawned:
+        # --- Timed events: daily reset at 06:00, fleet spawn on Monday 06:01 ---
+        scheduler.schedule_daily(6, 0, self.reset_day, name="van_reset")
+        scheduler.schedule_daily(6, 1, self.spawn_fleet, name="van_spawn", days=["Monday"])
+
+    def reset_day(self, sim_clock):
+        self.spawned = False
+        self.carpark.spawned_today = False
+        self.last_day = sim_clock.day
+
+    def spawn_fleet(self, sim_clock):
+        if not self.spawned:
             spawn_vans(self.carpark.vans)
+            self.active = set()  # The previous fleet was replaced
+            for van in self.carpark.vans:
+                van.woken = self.wake
+                self.wake(van)  # Driving in to its bay
             self.spawned = True
             self.carpark.spawned_today = True
 
-        # --- Animate van movement ---
-        for van in self.carpark.vans:
-            van.update(dt)
\ No newline at end of file
+    def wake(self, van):
+        self.active.add(van)
+
+    def update(self, dt, sim_clock):
+        # The MovementSystem moves the vans; here vans that have parked go to sleep, so the cost
+        # follows the vans in motion rather than the fleet size
+        if not self.active:
+            return
+        parked = [van for van in self.active if not van.moving]
+        if parked:
+            self.active.difference_update(parked)
+            self.carpark.invalidate()  # Parked vans are drawn in the static layer
+
+    def is_idle(self):
+        return not any(van.moving for van in self.active)
@@ -0,0 +1,75 @@
+import io
+import pickle
+import zlib
+
+import pygame
+
+import loadimage
+import motion
+from objects.courier import StaffCourier, SubconCourier
+
+SNAPSHOT_VERSION = 11  # 2: MovementSystem.touched, 3: leftover and engine motion_mode, 4: analytic segments, 5: vehicle active sets, 6: lazy districts, 7: engine RNG and idle grids, 8: no leftover, 9: dispatch wakes districts via the scene manager, 10: route planner limits tours per frame by count, 11: courier entry timer advanced once per tick
+COMPRESSION_LEVEL = 6
+
+class _SnapshotPickler(pickle.Pickler):
+    # Surfaces and fonts never go into a snapshot: images loaded through load_image are
+    # stored as their cache key and reloaded on restore; anything else comes back as None
+    def __init__(self, file, image_keys):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.image_keys = image_keys  # id(surface) -> (name, size)
+
+    def persistent_id(self, obj):
+        if isinstance(obj, pygame.Surface):
+            return ("image", self.image_keys.get(id(obj)))
+        if isinstance(obj, pygame.font.Font):
+            return ("font", None)
+        return None
+
+class _SnapshotUnpickler(pickle.Unpickler):
+    def persistent_load(self, pid):
+        kind, key = pid
+        if kind == "image" and key is not None:
+            return loadimage.load_image(*key)  # Cache hit after the first restore
+        return None
+
+def take_snapshot(engine):
+    # Full simulation state (clock, scheduler, scenes, entities, controllers, the engine's RNG) as compressed bytes
+    image_keys = {id(surface): key for key, surface in loadimage.IMAGE_CACHE.items()}
+    state = {
+        "version": SNAPSHOT_VERSION,
+        "engine": engine,
+    }
+    buffer = io.BytesIO()
+    _SnapshotPickler(buffer, image_keys).dump(state)
+    return zlib.compress(buffer.getvalue(), COMPRESSION_LEVEL)
+
+def restore_snapshot(data):
+    # Rebuild an independent engine from take_snapshot() bytes; it becomes the active movement system
+    state = _SnapshotUnpickler(io.BytesIO(zlib.decompress(data))).load()
+    if state.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version {state.get('version')}")
+    engine = state["engine"]
+    loadimage.set_headless(engine.headless)
+    motion.set_active_system(engine.movement)  # Entities spawned from here on join the restored world
+    StaffCourier.idle_grid, SubconCourier.idle_grid = engine.idle_grids  # Couriers spawned from here on take these spots
+    return engine
+
+def fork(data, count, seed=None):
+    # `count` independent engines from one checkpoint; each is a fresh restore, so they share nothing.
+    # Without a seed every fork continues the checkpoint's random sequence (identical copies); with one,
+    # fork i draws from Random(seed + i), so the forks diverge but each is reproducible.
+    engines = [restore_snapshot(data) for _ in range(count)]
+    if seed is not None:
+        for index, engine in enumerate(engines):
+            engine.random.seed(seed + index)
+    return engines
+
+def save_snapshot(engine, path):
+    data = take_snapshot(engine)
+    with open(path, "wb") as f:
+        f.write(data)
+    return len(data)
+
+def load_snapshot(path):
+    with open(path, "rb") as f:
+        return restore_snapshot(f.read())
@@ -4,6 +4,7 @@ import os
 import sys
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from pygame.math import Vector2
+import eventlog
 
 from objects.courier import Courier, StaffCourier, SubconCourier  # Import Courier class from courier module
 from objects.van import Van
@@ -41,7 +42,7 @@ def spawn_vans(vans_list):
             y = van_start_y + row * spacing
             vans_list.append(Van(position=Vector2(x, y)))
 
-    print(f"Spawned {len(vans_list)} vans")
+    eventlog.info("spawn", "Spawned {count} vans", count=len(vans_list))
 
 def spawn_cars(cars_list):
     cars_list.clear()
@@ -105,7 +106,7 @@ def spawn_cars(cars_list):
 
         car_start_x -= cols * spacing + grid_spacing
 
-    print(f"Spawned {len(cars_list)} cars")
+    eventlog.info("spawn", "Spawned {count} cars", count=len(cars_list))
 
 def spawn_staff(day, available_vans):
     result = []
@@ -167,4 +168,4 @@ def spawn_houses(houses_list):
             house.position = Vector2(x, y)
             houses_list.append(house)
 
-    print(f"Spawned {len(houses_list)} houses")
\ No newline at end of file
+    eventlog.info("spawn", "Spawned {count} houses", count=len(houses_list))
\ No newline at end of file
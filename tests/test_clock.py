@@ -0,0 +1,35 @@
+import math
+
+from simctrl.simctrl import SimulationClock
+
+
+def test_many_small_steps_do_not_drift():
+    clock = SimulationClock()
+    start = clock.elapsed
+    steps = [0.001, 0.1, 1 / 3] * 100000
+    for seconds in steps:
+        clock.advance(seconds)
+    naive = start
+    for seconds in steps:
+        naive += seconds
+    exact = math.fsum([start] + steps)
+    assert abs(clock.elapsed - exact) <= 1e-9
+    assert abs(clock.elapsed - exact) < abs(naive - exact)  # A plain float sum does drift here
+
+
+def test_time_never_runs_backwards():
+    clock = SimulationClock()
+    start = clock.elapsed
+    clock.advance(-60)
+    assert clock.elapsed == start
+    clock.advance(90)
+    assert clock.get_time_str() == "Monday 06:01" and clock.second == 30
+
+
+def test_time_warp_is_clamped_to_the_supported_range():
+    clock = SimulationClock()
+    assert clock.set_speed(0) == SimulationClock.MIN_SPEED == 1
+    assert clock.set_speed(10 ** 6) == SimulationClock.MAX_SPEED == 10000
+    assert clock.set_speed(50) == 50
+    clock.update(1000 / 60)
+    assert clock.get_time_str() == "Monday 06:50"  # One sim minute per 60 FPS frame, times the warp
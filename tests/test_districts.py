@@ -0,0 +1,58 @@
+import pygame
+import pygame_gui
+import pytest
+
+from main import DISTRICT_KEYS, DistrictPager
+from scenes.citydistrict_scene import CityDistricts
+from simctrl.simctrl import SceneManager
+
+
+def test_districts_are_created_on_first_use():
+    manager = SceneManager()
+    districts = CityDistricts(500, manager)
+    assert len(districts) == 500
+    assert list(districts) == [] and not manager.scenes  # Nothing laid out or registered yet
+    third = districts[2]
+    assert third.name == "City_District3" and manager.scenes["City_District3"] is third
+    assert districts.get(3) is third  # Ids are 1-based, indices 0-based
+    assert districts.get(42).district_id == 42
+    assert [scene.name for scene in districts] == ["City_District3", "City_District42"]
+    for index in (-1, 500):
+        with pytest.raises(IndexError):
+            districts[index]
+    assert len(CityDistricts(0)) == 0
+
+
+@pytest.fixture
+def ui_manager():
+    pygame.init()  # pygame_gui needs the font module too
+    pygame.display.set_mode((1280, 720))
+    return pygame_gui.UIManager((1280, 720))
+
+
+def test_pager_pages_through_the_districts(ui_manager):
+    opened = []
+    pager = DistrictPager(ui_manager, range(1, 8), lambda district_id: opened.append(district_id) or f"D{district_id}")
+    assert pager.pages() == 3
+    assert [pager.slot_district(slot) for slot in range(3)] == [1, 2, 3]
+    assert pager.handle_key(DISTRICT_KEYS[1]) == "D2"
+
+    pager.handle_key(pygame.K_PAGEDOWN)
+    pager.handle_button(pager.button_next)
+    assert pager.page == 2
+    assert [pager.slot_district(slot) for slot in range(3)] == [7, None, None]
+    assert [button.visible for button in pager.buttons] == [True, False, False]  # Last page isn't full
+    assert pager.handle_key(DISTRICT_KEYS[1]) is None
+    assert pager.handle_button(pager.buttons[0]) == "D7"
+
+    pager.handle_key(pygame.K_PAGEDOWN)  # Wraps around
+    assert pager.page == 0 and pager.buttons[2].visible
+    pager.handle_button(pager.button_prev)
+    assert pager.page == 2
+    assert opened == [2, 7]  # Districts are only opened when picked
+
+
+def test_pager_with_a_single_page(ui_manager):
+    pager = DistrictPager(ui_manager, [1, 2], lambda district_id: district_id)
+    assert pager.pages() == 1
+    assert not pager.button_next.is_enabled and not pager.button_prev.is_enabled
@@ -0,0 +1,12 @@
+import pytest
+
+from engine import SimulationEngine
+from simctrl.simctrl import SimulationClock
+
+
+@pytest.mark.parametrize("motion_mode", ["frame", "exact"])
+def test_run_headless_stops_at_the_end_of_the_last_day(motion_mode):
+    engine = SimulationEngine(headless=True, motion_mode=motion_mode, seed=0)
+    engine.run_headless(2, dt=20000)  # Far longer ticks than fit evenly into the run
+    assert engine.sim_clock.elapsed == pytest.approx(2 * SimulationClock.SECONDS_PER_DAY)
+    assert engine.sim_clock.get_time_str() == "Wednesday 00:00"
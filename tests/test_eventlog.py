@@ -0,0 +1,46 @@
+import json
+import time
+
+import eventlog
+from simctrl.simctrl import SimulationClock
+
+
+def _records(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_records_below_the_level_or_outside_the_categories_are_dropped(tmp_path):
+    path = tmp_path / "events.jsonl"
+    clock = SimulationClock()
+    eventlog.set_clock(clock)
+    eventlog.configure(str(path), "info", ["truck"], flush_interval=60)
+    try:
+        eventlog.debug("truck", "too chatty")
+        eventlog.info("spawn", "other category")
+        eventlog.info("truck", "Unloaded {boxes} boxes", boxes=20)
+        eventlog.warning("truck", "Late by {minutes} min", minutes=5)
+        assert eventlog.enabled(eventlog.INFO, "truck") and not eventlog.enabled(eventlog.DEBUG, "truck")
+    finally:
+        eventlog.close()  # Writes what the flush thread hasn't yet
+        eventlog.set_clock(None)
+    records = _records(path)
+    assert [(r["level"], r["message"]) for r in records] == [("INFO", "Unloaded 20 boxes"), ("WARNING", "Late by 5 min")]
+    assert records[0]["fields"] == {"boxes": 20} and records[0]["sim"] == clock.elapsed
+    eventlog.info("truck", "after close")  # Logging is off again
+    assert len(_records(path)) == 2
+
+
+def test_background_thread_flushes_without_close(tmp_path):
+    path = tmp_path / "events.jsonl"
+    eventlog.configure(str(path), "debug", flush_interval=0.01)
+    try:
+        for i in range(100):
+            eventlog.debug("queue", "record {i}", i=i)
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline and len(path.read_text().splitlines()) < 100:
+            time.sleep(0.01)
+        assert [r["message"] for r in _records(path)] == [f"record {i}" for i in range(100)]
+        assert eventlog.dropped() == 0
+    finally:
+        eventlog.close()
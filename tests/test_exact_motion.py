@@ -0,0 +1,25 @@
+import numpy as np
+
+from engine import SimulationEngine
+
+
+def _parcels(dt, warp=1):
+    engine = SimulationEngine(headless=True, motion_mode="exact", seed=0)
+    engine.sim_clock.set_speed(warp)
+    engine.run_headless(2, dt)
+    return engine.parcels.rows[:engine.parcels.size]
+
+
+def _assert_same_timeline(a, b):
+    assert len(a) == len(b)
+    for stamp in ("picked", "loaded", "delivered"):
+        assert np.array_equal(np.isnan(a[stamp]), np.isnan(b[stamp])), stamp
+        np.testing.assert_allclose(a[stamp], b[stamp], atol=1e-3, err_msg=stamp)  # Sim seconds
+
+
+def test_exact_mode_does_not_depend_on_tick_length():
+    _assert_same_timeline(_parcels(1000 / 60), _parcels(1000))
+
+
+def test_exact_mode_does_not_depend_on_time_warp():
+    _assert_same_timeline(_parcels(1000 / 60), _parcels(1000 / 60, warp=100))
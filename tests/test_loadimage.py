@@ -0,0 +1,47 @@
+import os
+import shutil
+
+import pygame
+import pytest
+
+import loadimage
+
+
+@pytest.fixture
+def images(tmp_path, monkeypatch):
+    # Private copy of the sprites, so the test can change a source image
+    copy = tmp_path / "images"
+    shutil.copytree(loadimage.IMAGES_DIR, copy)
+    monkeypatch.setattr(loadimage, "IMAGES_DIR", str(copy))
+    monkeypatch.setattr(loadimage, "IMAGE_CACHE", {})
+    monkeypatch.setattr(loadimage, "HEADLESS", False)
+    monkeypatch.setattr(loadimage, "atlas", None)
+    pygame.display.init()
+    pygame.display.set_mode((64, 64))
+    yield copy
+    pygame.display.quit()
+
+
+def _preload_counting_decodes(cache_dir, monkeypatch):
+    decoded = []
+    load_scaled = loadimage._load_scaled
+    monkeypatch.setattr(loadimage, "_load_scaled", lambda name, size: decoded.append(name) or load_scaled(name, size))
+    loadimage.preload(str(cache_dir))
+    return decoded
+
+
+def test_cached_atlas_is_reused_until_a_source_changes(images, tmp_path, monkeypatch):
+    cache = tmp_path / "cache"
+    assert len(_preload_counting_decodes(cache, monkeypatch)) == len(loadimage.SPRITES)  # Cold: everything decoded
+    first = pygame.image.tobytes(loadimage.atlas, "RGBA")
+    assert _preload_counting_decodes(cache, monkeypatch) == []  # Warm: straight from the cached atlas
+    assert pygame.image.tobytes(loadimage.atlas, "RGBA") == first
+
+    box = pygame.Surface((5, 5), pygame.SRCALPHA)
+    box.fill((255, 0, 0, 255))
+    pygame.image.save(box, str(images / "box.png"))  # Different size and mtime
+    stat = os.stat(images / "box.png")
+    os.utime(images / "box.png", (stat.st_atime, stat.st_mtime + 10))
+    assert len(_preload_counting_decodes(cache, monkeypatch)) == len(loadimage.SPRITES)  # Stale: rebuilt
+    assert loadimage.IMAGE_CACHE[("box.png", (32, 32))].get_at((16, 16)) == (255, 0, 0, 255)
+    assert _preload_counting_decodes(cache, monkeypatch) == []  # ... and cached again
@@ -0,0 +1,64 @@
+import random
+from bisect import bisect_right
+
+import pytest
+
+from simctrl.metrics import P2Quantile, StreamingStats
+
+
+@pytest.mark.parametrize("draw", [
+    lambda rng: rng.uniform(0, 100),
+    lambda rng: rng.expovariate(1 / 600),  # Long right tail, like queue waits
+    lambda rng: rng.choice([0, 0, 60, 120, 3600]),  # Few distinct values, many ties
+])
+def test_p2_estimate_lands_near_the_exact_rank(draw):
+    rng = random.Random(0)
+    samples = [draw(rng) for _ in range(20000)]
+    estimators = {p: P2Quantile(p) for p in StreamingStats.QUANTILES}
+    for x in samples:
+        for estimator in estimators.values():
+            estimator.add(x)
+    ordered = sorted(samples)
+    for p, estimator in estimators.items():
+        value = estimator.value()
+        assert ordered[0] <= value <= ordered[-1]
+        slack = 1e-3 * (ordered[-1] - ordered[0])  # P² interpolates, so ties come out a hair off the sample value
+        low = bisect_right(ordered, value - slack) / len(ordered)  # Fraction of samples clearly below the estimate
+        high = bisect_right(ordered, value + slack) / len(ordered)  # ... and at or below it
+        assert low - 0.02 <= p <= high + 0.02
+
+
+def test_p2_is_exact_before_the_markers_are_seeded():
+    for count in range(1, 5):
+        samples = [7.0, 3.0, 9.0, 1.0][:count]
+        estimator = P2Quantile(0.5)
+        for x in samples:
+            estimator.add(x)
+        ordered = sorted(samples)
+        assert estimator.value() == ordered[min(count - 1, int(count * 0.5))]
+    assert P2Quantile(0.5).value() is None
+
+
+def test_streaming_stats_match_the_samples():
+    rng = random.Random(1)
+    stats = StreamingStats()
+    samples = []
+    for _ in range(1000):
+        x, weight = rng.uniform(-50, 50), rng.randint(1, 3)
+        stats.add(x, weight)
+        samples += [x] * weight
+    assert stats.count == len(samples)
+    assert stats.mean == pytest.approx(sum(samples) / len(samples))
+    assert (stats.min, stats.max) == (min(samples), max(samples))
+
+
+def test_reported_quantiles_never_decrease():
+    rng = random.Random(2)
+    for _ in range(300):
+        stats = StreamingStats()
+        for _ in range(rng.randint(1, 60)):
+            # Two clusters far apart; with few samples the upper markers of different quantiles cross
+            stats.add(rng.choice([rng.uniform(0, 60), rng.uniform(19000, 20000)]), rng.randint(1, 4))
+        values = [stats.quantile(p) for p in StreamingStats.QUANTILES]
+        assert values == sorted(values)
+        assert stats.min <= values[0] and values[-1] <= stats.max
@@ -0,0 +1,31 @@
+import montecarlo
+
+
+def test_replications_depend_on_the_seed():
+    runs = [montecarlo.run_replication(seed, days=2) for seed in (0, 1, 2)]
+    merged = montecarlo.merge_snapshots(runs)
+    assert merged["queue_wait_mean_s"]["stdev"] > 0
+
+
+def test_replication_is_reproducible():
+    first = montecarlo.run_replication(5, days=1)
+    second = montecarlo.run_replication(5, days=1)
+    first.pop("wall_seconds"), second.pop("wall_seconds")
+    assert first == second
+
+
+def test_replication_reports_parcel_lead_times():
+    runs = [montecarlo.run_replication(seed, days=2) for seed in (0, 1, 2)]
+    assert all(run["parcels_delivered"] > 0 for run in runs)
+    merged = montecarlo.merge_snapshots(runs)
+    for stage in ("arrived_to_picked", "picked_to_loaded", "loaded_to_delivered", "arrived_to_delivered"):
+        assert merged[f"{stage}_mean_s"]["mean"] > 0 and f"{stage}_p90_s" in merged
+    assert merged["loaded_to_delivered_mean_s"]["stdev"] > 0  # Destinations depend on the seed
+
+
+def test_t_critical_rounds_untabulated_df_down():
+    assert montecarlo.t_critical(11) == 2.201
+    assert montecarlo.t_critical(35) == montecarlo.T_95[30]  # True value 2.030: wider, never narrower
+    assert montecarlo.t_critical(10 ** 6) == montecarlo.T_95[120] > 1.96
+    values = [montecarlo.t_critical(df) for df in range(1, 200)]
+    assert values == sorted(values, reverse=True)
@@ -0,0 +1,55 @@
+import random
+
+import numpy as np
+
+from parcels import ParcelRanges, ParcelStore
+
+
+def test_parcel_ranges_match_a_list_model():
+    rng = random.Random(0)
+    ranges = ParcelRanges()
+    model = []
+    next_id = 0
+    for _ in range(3000):
+        op = rng.random()
+        if op < 0.4:
+            next_id += rng.choice([0, 0, 3])  # Mostly contiguous with the last run, sometimes a gap
+            count = rng.randint(0, 6)
+            ranges.extend(next_id, next_id + count)
+            model += range(next_id, next_id + count)
+            next_id += count
+        elif op < 0.65:
+            count = rng.randint(0, 8)
+            taken = ranges.take(count)
+            assert [i for start, stop in taken for i in range(start, stop)] == model[:count]
+            del model[:count]
+        elif op < 0.9:
+            parcel_id = rng.choice(model) if model and rng.random() < 0.8 else next_id + 1
+            assert ranges.remove(parcel_id) == (parcel_id in model)
+            if parcel_id in model:
+                model.remove(parcel_id)
+        elif op < 0.95:
+            other = ParcelRanges()
+            other.extend_all(ranges.clear())
+            assert other.ids().tolist() == model
+            model = []
+        assert ranges.ids().tolist() == model
+        assert len(ranges) == len(model)
+        assert all(start < stop for start, stop in ranges)
+        assert all(a[1] <= b[0] for a, b in zip(ranges.runs, ranges.runs[1:]))  # Ordered, never overlapping
+
+
+def test_store_stamps_and_lead_times_match_the_rows():
+    store = ParcelStore(capacity=4)
+    first = store.add(3, "ACycle", 100.0)
+    second = store.add(5, "BCycle", 200.0)  # Grows past the initial capacity
+    assert (first, second, len(store)) == ((0, 3), (3, 8), 8)
+    store.stamp("picked", [(1, 3), (3, 4)], 250.0)
+    store.deliver(2, 400.0)
+    store.deliver(3, 500.0)
+    rows = store.rows[:len(store)]
+    assert rows["cycle"].tolist() == [0] * 3 + [1] * 5
+    assert np.array_equal(np.isnan(rows["picked"]), [True, False, False, False, True, True, True, True])
+    assert sorted(store.lead_times("arrived", "picked").tolist()) == [50.0, 150.0, 150.0]
+    assert sorted(store.lead_times().tolist()) == [300.0, 300.0]
+    assert store.summary()["delivered"] == 2
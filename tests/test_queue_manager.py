@@ -0,0 +1,47 @@
+import random
+
+from pygame.math import Vector2
+
+from queue_manager import LaneSlots
+
+
+class _Courier:
+    def __init__(self, name):
+        self.name = name
+        self.queue_index = None
+        self.target_position = None
+
+
+def test_lane_slots_match_a_list_model():
+    rng = random.Random(0)
+    positions = [Vector2(0, 40 * (i + 1)) for i in range(6)]
+    lane = LaneSlots(positions)
+    model = []
+    couriers = iter(_Courier(i) for i in range(10 ** 6))
+    for _ in range(5000):
+        op = rng.random()
+        if op < 0.45:
+            courier = next(couriers)
+            index = lane.enqueue(courier)
+            if len(model) == len(positions):
+                assert index is None
+            else:
+                assert index == len(model)
+                model.append(courier)
+        elif op < 0.7:
+            assert lane.pop() is (model.pop(0) if model else None)
+        elif model:
+            courier = rng.choice(model)
+            assert lane.remove(courier) is courier
+            model.remove(courier)
+        else:
+            assert lane.remove(_Courier("stranger")) is None
+        if rng.random() < 0.5:  # Shifts may be batched over several changes
+            lane.advance()
+            for index, courier in enumerate(model):
+                assert courier.queue_index == index
+                assert courier.target_position == positions[index]
+        assert list(lane) == model
+        assert len(lane) == len(model)
+        assert lane.is_full() == (len(model) == len(positions))
+        assert lane.peek() is (model[0] if model else None)
@@ -0,0 +1,77 @@
+import itertools
+import math
+import random
+
+import pytest
+from pygame.math import Vector2
+
+from simctrl.route_planner import DEPOT, RoutePlanner
+
+
+class _House:
+    def __init__(self, position):
+        self.position = position
+
+
+class _District:
+    def __init__(self, houses):
+        self.name = "City_Test"
+        self.layout_version = 1
+        self.houses = houses
+
+
+def _tour_length(houses, depot=DEPOT):
+    stops = [depot] + [house.position for house in houses] + [depot]
+    return sum(a.distance_to(b) for a, b in zip(stops, stops[1:]))
+
+
+@pytest.mark.parametrize("count", [0, 1, 2, 5, 7])
+def test_route_is_a_valid_tour_no_shorter_than_the_optimum(count):
+    rng = random.Random(count)
+    district = _District([_House(Vector2(rng.uniform(0, 1280), rng.uniform(0, 700))) for _ in range(20)])
+    houses = rng.sample(district.houses, count)
+    route = RoutePlanner().plan(district, houses)
+
+    assert sorted(route.order) == list(range(count))  # Every house exactly once
+    assert route.houses == [houses[i] for i in route.order]
+    assert route.length == pytest.approx(_tour_length(route.houses))
+    visited = [house.position for house in route.houses]
+    legs = [a.distance_to(b) for a, b in zip([DEPOT] + visited, visited)]
+    assert route.stops == pytest.approx(list(itertools.accumulate(legs)))  # Distance driven at each house
+    optimum = min((_tour_length(order) for order in itertools.permutations(houses)), default=0.0)
+    assert optimum - 1e-6 <= route.length <= optimum * 1.25 + 1e-6  # 2-opt comes close on tours this small
+
+
+def test_two_opt_never_lengthens_the_nearest_neighbour_tour():
+    rng = random.Random(1)
+    district = _District([_House(Vector2(rng.uniform(0, 1280), rng.uniform(0, 700))) for _ in range(60)])
+    planner = RoutePlanner()
+    _, rows, positions, matrix = planner.district_matrix(district)
+    for house, row in rows.items():
+        distances = [house.position.distance_to(other.position) for other in district.houses]
+        assert matrix[row] == pytest.approx(distances)
+
+    houses = rng.sample(district.houses, 30)
+    route = planner.plan(district, houses)
+    current, greedy, left = DEPOT, 0.0, list(houses)
+    while left:
+        nearest = min(left, key=lambda house: current.distance_to(house.position))
+        greedy += current.distance_to(nearest.position)
+        current = nearest.position
+        left.remove(nearest)
+    greedy += current.distance_to(DEPOT)
+    assert route.length <= greedy + 1e-6
+    assert math.isclose(route.length, _tour_length(route.houses))
+
+
+def test_process_plans_a_fixed_number_of_routes_per_call():
+    rng = random.Random(2)
+    district = _District([_House(Vector2(rng.uniform(0, 1280), rng.uniform(0, 700))) for _ in range(20)])
+    planner = RoutePlanner(per_frame=2)
+    couriers = [type("Courier", (), {})() for _ in range(5)]
+    for courier in couriers:
+        planner.request(courier, district, rng.sample(district.houses, 5))
+    assert planner.process(0) == 0  # An explicit limit of 0 is honoured
+    assert planner.process() == 2
+    assert [courier.route is not None for courier in couriers] == [True, True, False, False, False]  # In request order
+    assert planner.process(math.inf) == 3 and planner.is_idle()
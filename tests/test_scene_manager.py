@@ -0,0 +1,52 @@
+import pytest
+
+from scenes.base_scene import BaseScene
+from simctrl.simctrl import SceneManager
+
+
+class _Scene(BaseScene):
+    def __init__(self, policy, hz=0):
+        self.update_policy = policy
+        self.update_hz = hz
+        self.updates = []  # dt of every update call
+
+    def update(self, dt, clock):
+        self.updates.append(dt)
+
+
+def _manager():
+    manager = SceneManager()
+    scenes = {"Panel": _Scene("every_frame"), "Stats": _Scene("fixed_hz", 4), "District": _Scene("dormant")}
+    for name, scene in scenes.items():
+        manager.add_scene(name, scene)
+    return manager, scenes
+
+
+def test_fixed_hz_scene_steps_at_its_rate():
+    manager, scenes = _manager()
+    for _ in range(1000):  # 10 s of 10 ms frames
+        manager.update_all(10, None)
+    assert len(scenes["Panel"].updates) == 1000
+    assert scenes["Stats"].updates == [250] * 40  # 4 Hz, each call carrying the time banked since the last one
+
+
+def test_dormant_scene_only_runs_while_viewed_or_woken():
+    manager, scenes = _manager()
+    district = scenes["District"]
+    for _ in range(30):
+        manager.update_all(10, None)
+    assert district.updates == []  # Not viewed, nothing happened there
+    manager.wake("District", None)
+    assert district.updates == [300]  # Caught up at once on everything it missed, in one call
+    manager.update_all(10, None)
+    manager.update_all(10, None)
+    assert district.updates == [300]  # Back to sleep
+    manager.switch_scene("District")
+    manager.update_all(10, None)
+    manager.update_all(10, None)
+    assert district.updates == [300, 30, 10]  # Viewed: every frame, after catching up
+
+
+def test_fixed_hz_scene_needs_a_positive_rate():
+    with pytest.raises(ValueError):
+        SceneManager().add_scene("Readout", _Scene("fixed_hz"))
@@ -0,0 +1,40 @@
+import random
+
+from simctrl.scheduler import EventScheduler
+from simctrl.simctrl import SimulationClock
+
+
+def test_events_fire_in_time_order_at_their_own_time():
+    rng = random.Random(0)
+    clock = SimulationClock()
+    scheduler = EventScheduler(clock)
+    fired = []
+    model = []  # (time, registration order) of every event that should fire
+    cancelled = []
+    start = clock.elapsed
+    for seq in range(500):
+        at = start + rng.choice([rng.uniform(0, 20000), rng.randrange(0, 20000, 600)])  # Plenty of exact ties
+        event = scheduler.schedule_at(at, lambda clock, seq: fired.append((clock.elapsed, seq)), seq)
+        if rng.random() < 0.1:
+            event.cancel()
+            cancelled.append(seq)
+        else:
+            model.append((float(at), seq))
+    end = start + 15000
+    while clock.elapsed < end:
+        scheduler.advance(min(rng.uniform(0, 400), end - clock.elapsed))
+    expected = sorted(entry for entry in model if entry[0] <= end)
+    assert fired == expected  # Registration order breaks ties
+    assert not set(cancelled) & {seq for _, seq in fired}
+    assert scheduler.next_time() == min(at for at, _ in model if at > end)
+
+
+def test_daily_events_repeat_on_their_days_only():
+    clock = SimulationClock()  # Monday 06:00
+    scheduler = EventScheduler(clock)
+    fired = []
+    scheduler.schedule_daily(6, 0, lambda clock: fired.append(("every", clock.get_time_str())))
+    scheduler.schedule_daily(12, 30, lambda clock: fired.append(("wed", clock.get_time_str())), days=["Wednesday"])
+    scheduler.advance_to(clock.elapsed + 3 * SimulationClock.SECONDS_PER_DAY)  # Through Thursday 06:00
+    assert fired == [("every", "Monday 06:00"), ("every", "Tuesday 06:00"), ("every", "Wednesday 06:00"),
+                     ("wed", "Wednesday 12:30"), ("every", "Thursday 06:00")]
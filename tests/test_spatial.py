@@ -0,0 +1,65 @@
+import math
+import random
+
+from engine import SimulationEngine
+from simctrl.courier_ctrl import DELIVERY_RADIUS
+from spatial import SpatialHash
+
+
+def _distance(a, b):
+    return math.hypot(a[0] - b[0], a[1] - b[1])
+
+
+def test_queries_match_brute_force():
+    rng = random.Random(0)
+    index = SpatialHash(cell_size=50)
+    points = {}  # item -> position, the brute-force model
+    for item in range(400):
+        position = (rng.uniform(-300, 1300), rng.uniform(-200, 900))
+        index.insert(item, position)
+        points[item] = position
+    for item in rng.sample(sorted(points), 100):
+        if rng.random() < 0.5:
+            index.remove(item)
+            del points[item]
+        else:
+            points[item] = (rng.uniform(-300, 1300), rng.uniform(-200, 900))
+            index.insert(item, points[item])  # Re-inserting moves it
+    assert len(index) == len(points)
+
+    for _ in range(200):
+        point = (rng.uniform(-500, 1500), rng.uniform(-400, 1100))
+        radius = rng.uniform(0, 300)
+        expected = {item for item, position in points.items() if _distance(position, point) <= radius}
+        assert set(index.within_radius(point, radius)) == expected
+
+        left, top = point
+        width, height = rng.uniform(0, 600), rng.uniform(0, 400)
+        expected = {item for item, (x, y) in points.items() if left <= x < left + width and top <= y < top + height}
+        assert set(index.in_rect((left, top, width, height))) == expected
+
+        for predicate in (None, lambda item: item % 3 == 0):
+            candidates = [item for item in points if predicate is None or predicate(item)]
+            best = min(_distance(points[item], point) for item in candidates)
+            found = index.nearest(point, predicate)
+            assert _distance(points[found], point) == best  # Any of several equally near items will do
+
+
+def test_nearest_on_an_empty_index():
+    index = SpatialHash()
+    assert index.nearest((0, 0)) is None
+    index.insert("a", (10, 10))
+    assert index.nearest((1000, 1000), lambda item: False) is None
+
+
+def test_delivery_houses_come_from_one_neighbourhood():
+    engine = SimulationEngine(headless=True, seed=0)
+    district = engine.districts[0]
+    engine.scene_manager.wake(district.name, engine.sim_clock)  # Lays out and indexes the houses
+    controller = engine.staff_controller
+    for _ in range(50):
+        houses = controller.delivery_houses(district, 12)  # Even a corner house has 12 houses within the radius
+        assert len(set(houses)) == 12
+        assert max(_distance(a.position, b.position) for a in houses for b in houses) <= 2 * DELIVERY_RADIUS
+    houses = controller.delivery_houses(district, len(district.houses) + 200)
+    assert len(houses) == len(district.houses) + 200 and set(houses) <= set(district.houses)  # Some houses get two